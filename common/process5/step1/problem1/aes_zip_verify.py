@@ -0,0 +1,77 @@
+import hashlib
+import hmac
+
+from check_zip_crypto import ZipTarget, ZipEntry
+
+# AES strength -> 키 길이(바이트)
+AES_KEY_LENGTHS = {1: 16, 2: 24, 3: 32}
+
+# WinZip AES 스펙 고정값
+PBKDF2_ITERATIONS = 1000
+
+
+def derive_verifier(password: bytes, salt: bytes, strength: int) -> bytes:
+    '''
+    WinZip AES 키 유도 후 2바이트 비밀번호 검증값만 반환
+    - PBKDF2-HMAC-SHA1(1000회)로 [암호화 키 | HMAC 키 | 검증값(2)]을 한 번에 만든다.
+    - 검증값은 맨 뒤 2바이트
+    '''
+    key_len = AES_KEY_LENGTHS[strength]
+    dk = hashlib.pbkdf2_hmac('sha1', password, salt, PBKDF2_ITERATIONS, 2 * key_len + 2)
+    return dk[-2:]
+
+
+class AesZipVerifier:
+    '''
+    WinZip AES-ZIP 비밀번호 검증기
+    - salt, 검증값은 ZipTarget이 한 번만 읽어 둔 것을 사용 (파일 I/O, pyzipper 없음)
+    - 틀린 비밀번호는 65535/65536 확률로 여기서 걸러지고, 통과한 후보만 실제 추출을 시도하면 된다.
+    - 엔트리가 여러 개면 첫 엔트리 통과 후 나머지 엔트리도 확인 (salt가 달라 오탐이 더 줄어든다)
+    '''
+    def __init__(self, target: ZipTarget):
+        self.target = target
+        self.entries: list[ZipEntry] = target.aes_entries
+
+    def check(self, password: str | bytes) -> bool:
+        if not self.entries:
+            return False
+        pwd = password.encode() if isinstance(password, str) else password
+        for entry in self.entries:
+            verifier = derive_verifier(pwd, entry.salt, entry.aes_params[1])
+            if not hmac.compare_digest(verifier, entry.pwv):
+                return False
+        return True
+
+
+if __name__ == '__main__':
+    import os, tempfile, time
+    import pyzipper
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'aes.zip')
+        with pyzipper.AESZipFile(path, 'w', compression=pyzipper.ZIP_DEFLATED, encryption=pyzipper.WZ_AES) as zf:
+            zf.setpassword(b'mars06')
+            zf.writestr('a.txt', b'hello ' * 100)
+            zf.writestr('b.txt', b'world ' * 100)
+
+        target = ZipTarget(path)
+        verifier = AesZipVerifier(target)
+        print(target.entries)
+        assert verifier.check('mars06')
+
+        NTRIES = 2000
+        t0 = time.perf_counter()
+        hits = sum(verifier.check(f'{i:06d}') for i in range(NTRIES))
+        fast = NTRIES / (time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        for i in range(200):
+            try:
+                with pyzipper.AESZipFile(path) as zf:
+                    zf.pwd = f'{i:06d}'.encode()
+                    zf.extractall(os.path.join(tmp, 'out'))
+            except RuntimeError:
+                pass
+        slow = 200 / (time.perf_counter() - t0)
+
+        print(f'verifier: {fast:.0f} tries/s (false hits {hits}/{NTRIES}), pyzipper extractall: {slow:.0f} tries/s')
@@ -1,7 +1,10 @@
 import multiprocessing as mp
 from multiprocessing.synchronize import Event as mpEvent
 import string, time, itertools
+import argparse, json, os, platform
+from datetime import datetime
 from check_zip_crypto import *
+from candidates import MaskGenerator
 import zipfile, zlib
 
 
@@ -15,6 +18,22 @@ ZIP_PATH = 'emergency_storage_key.zip'
 
 POW = [len(CHARSET) ** p for p in range(PWD_LENGTH - 1, -1, -1)]
 
+# 검증 벤치에 사용하는 후보 생성기
+GENERATOR = MaskGenerator('?1' * PWD_LENGTH, {'1': CHARSET})
+
+# 튜닝 결과 파일 (호스트별로 하나씩 저장)
+TUNING_PATH = 'tuning.json'
+
+# 보정 실행 하나의 목표 시간(초): 짧을수록 빨리 끝나지만 측정 노이즈가 커진다.
+TRIAL_SECONDS = 1.0
+
+# chunk 하나가 걸릴 목표 시간(초) 후보: IPC(pickle, 큐 왕복) 비용을 묻을 만큼 크고,
+# 워커 간 마지막 불균형이 작을 만큼 작게
+CHUNK_SECONDS = (0.001, 0.005, 0.02, 0.1)
+
+# chunk가 워커당 최소 몇 개는 돌아가야 부하가 고르게 나뉜다.
+MIN_CHUNKS_PER_WORKER = 4
+
 
 def comp_make_password(ntries):
     j = ''.join
@@ -31,20 +50,178 @@ def comp_make_password(ntries):
             password.append(CHARSET[digit])
         password = ''.join(password)
     index_time = ntries / (time.perf_counter() - start_index)
-    return itertools_time, index_time
+
+    # 임의 위치로 seek 한 뒤 bytearray 주행거리계로 진행 (bytes 바로 생성)
+    start_odometer = time.perf_counter()
+    for password in GENERATOR.iter_range_bytes(len(GENERATOR) // 2, len(GENERATOR) // 2 + ntries):
+        pass
+    odometer_time = ntries / (time.perf_counter() - start_odometer)
+    return itertools_time, index_time, odometer_time
 
 
 def bench(ntries):
-    j = ''.join
+    # 헤더 파싱은 작업당 한 번만 (후보마다 open/seek/read 하지 않는다)
+    target = ZipTarget(ZIP_PATH)
     t0 = time.perf_counter()
-    for tup in itertools.islice(itertools.product(CHARSET, repeat=PWD_LENGTH), ntries):
-        password = j(tup)
-        zipcrypto_password_valid(ZIP_PATH, password)
+    for password in GENERATOR.iter_range_bytes(0, ntries):
+        target.check(password)
 
     
 
     return ntries / (time.perf_counter() - t0)
 
+# ------------- 자동 튜닝: (P, chunksize, start method)
+TARGET = None
+READY_BARRIER = None
+
+
+def _init_worker(zip_path, barrier):
+    global TARGET, READY_BARRIER
+    TARGET = ZipTarget(zip_path)
+    READY_BARRIER = barrier
+
+
+def _ready(_):
+    # P개 작업을 chunksize=1로 나누면 워커마다 하나씩 받아 모두 떠 있는지 확인된다.
+    READY_BARRIER.wait()
+
+
+def check_range(bounds: tuple[int, int]):
+    '''
+    Pool 워커: [start, stop) 구간 검사 -> (검사한 개수, 맞은 (idx, password) 목록)
+    (multi_process_benchmark.pool_worker와 같은 방식: 구간 하나당 작업 하나)
+    '''
+    start, stop = bounds
+    hits = [(idx, password.decode()) for idx, password in enumerate(GENERATOR.iter_range_bytes(start, stop), start)
+            if TARGET.check(password)]
+    return stop - start, hits
+
+
+def host_key() -> str:
+    '''
+    튜닝 결과를 구분하는 키: 호스트 이름, CPU 수, 파이썬 버전
+    '''
+    return f'{platform.node()}|{os.cpu_count()}|{platform.python_version()}'
+
+
+def measure_item_cost(zip_path: str, samples: int = 2000) -> float:
+    '''
+    현재 프로세스에서 후보 하나 검사 비용(초) 측정 (IPC 없는 순수 작업 시간)
+    '''
+    _init_worker(zip_path, None)
+    t0 = time.perf_counter()
+    check_range((0, samples))
+    return (time.perf_counter() - t0) / samples
+
+
+def chunk_candidates(item_cost: float, n_items: int, P: int) -> list[int]:
+    '''
+    chunk(작업 하나로 보내는 구간) 하나가 CHUNK_SECONDS가 되는 chunksize 후보
+    (워커당 chunk가 너무 적어지지 않게 상한)
+    '''
+    limit = max(1, n_items // (P * MIN_CHUNKS_PER_WORKER))
+    sizes = {max(1, min(limit, round(seconds / item_cost))) for seconds in CHUNK_SECONDS}
+    return sorted(sizes)
+
+
+def start_methods() -> list[str]:
+    return [m for m in ('spawn', 'forkserver', 'fork') if m in mp.get_all_start_methods()]
+
+
+def run_trial(zip_path: str, P: int, chunksize: int, start_method: str, n_items: int) -> dict:
+    '''
+    보정 실행 한 번: 풀 시작(모든 워커 준비까지)과 작업 구간을 따로 측정
+    '''
+    ctx = mp.get_context(start_method)
+    barrier = ctx.Barrier(P)
+    t0 = time.perf_counter()
+    with ctx.Pool(P, initializer=_init_worker, initargs=(zip_path, barrier)) as pool:
+        pool.map(_ready, range(P), chunksize=1)
+        t1 = time.perf_counter()
+        ranges = ((lo, min(lo + chunksize, n_items)) for lo in range(0, n_items, chunksize))
+        for _ in pool.imap_unordered(check_range, ranges):
+            pass
+        t2 = time.perf_counter()
+    return {'P': P, 'chunksize': chunksize, 'start_method': start_method,
+            'startup': t1 - t0, 'rate': n_items / (t2 - t1)}
+
+
+def tune(zip_path: str = ZIP_PATH, max_workers: int | None = None, trial_seconds: float = TRIAL_SECONDS,
+         verbose: bool = True) -> dict:
+    '''
+    좌표 탐색으로 처리량(tries/s)이 가장 높은 설정을 찾는다.
+    1. 후보 하나 비용을 재서 보정 실행 크기(약 trial_seconds)와 chunksize 후보를 정한다.
+    2. spawn + 기본 chunksize로 P를 1 ~ max_workers까지 훑는다.
+    3. 가장 좋은 P에서 chunksize 후보를 비교한다.
+    4. 가장 좋은 (P, chunksize)에서 start method를 비교한다.
+    - 처리량은 작업 구간만으로 비교하고, 시작 비용(startup)은 기록만 한다. (긴 탐색에서는 무시할 만함)
+    '''
+    max_workers = max_workers or os.cpu_count()
+    item_cost = measure_item_cost(zip_path)
+    if verbose:
+        print(f'item cost: {item_cost * 1e6:.2f} us ({1 / item_cost:.0f} tries/s single process)')
+
+    def n_items(P):
+        return max(1000, int(trial_seconds * P / item_cost))
+
+    def trial(P, chunksize, method):
+        result = run_trial(zip_path, P, chunksize, method, n_items(P))
+        if verbose:
+            print(f'P={P:<3d} chunksize={chunksize:<7d} {method:10s} {result["rate"]:12.0f} tries/s '
+                  f'(startup {result["startup"]:.3f}s)')
+        return result
+
+    results = []
+    # 후보 목록은 중복 제거/상한 적용으로 CHUNK_SECONDS보다 짧을 수 있으므로 가운데 값을 직접 계산
+    limit = max(1, n_items(1) // MIN_CHUNKS_PER_WORKER)
+    default_chunk = max(1, min(limit, round(CHUNK_SECONDS[len(CHUNK_SECONDS) // 2] / item_cost)))
+    for P in range(1, max_workers + 1):
+        results.append(trial(P, min(default_chunk, chunk_candidates(item_cost, n_items(P), P)[-1]), 'spawn'))
+    best = max(results, key=lambda r: r['rate'])
+
+    for chunksize in chunk_candidates(item_cost, n_items(best['P']), best['P']):
+        if chunksize != best['chunksize']:
+            results.append(trial(best['P'], chunksize, 'spawn'))
+    best = max(results, key=lambda r: r['rate'])
+
+    for method in start_methods():
+        if method != best['start_method']:
+            results.append(trial(best['P'], best['chunksize'], method))
+    best = max(results, key=lambda r: r['rate'])
+
+    return {**best, 'item_cost': item_cost, 'zip_path': zip_path,
+            'tuned_at': datetime.now().isoformat(timespec='seconds'), 'trials': len(results)}
+
+
+def load_tuning(path: str = TUNING_PATH) -> dict | None:
+    '''
+    현재 호스트의 튜닝 결과 (없으면 None)
+    '''
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f).get(host_key())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def save_tuning(config: dict, path: str = TUNING_PATH):
+    '''
+    호스트 키로 튜닝 결과 저장 (다른 호스트 결과는 유지, 임시 파일 + os.replace)
+    '''
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        data = {}
+    data[host_key()] = config
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
 if __name__ == '__main__':
     # spawn: 완전히 새 파이썬 인터프리터 프로세스를 띄운 뒤, 필요한 객체만 직렬화(pickle)해서 전달
     # 부모 상태를 거의 복제하지 않음 - 안전하지만 느리다
@@ -54,6 +231,20 @@ if __name__ == '__main__':
     # 전역 설정
     mp.set_start_method('spawn', force=True)
 
+    parser = argparse.ArgumentParser(description='멀티프로세싱 설정 튜닝')
+    parser.add_argument('mode', nargs='?', default='tune', choices=['tune', 'compare'],
+                        help='tune: (P, chunksize, start method) 자동 튜닝, compare: 비밀번호 생성 방식 비교')
+    parser.add_argument('--max-workers', type=int, help='탐색할 최대 워커 수 (기본: CPU 수)')
+    parser.add_argument('--seconds', type=float, default=TRIAL_SECONDS, help='보정 실행 하나의 목표 시간(초)')
+    args = parser.parse_args()
+
+    if args.mode == 'tune':
+        config = tune(ZIP_PATH, args.max_workers, args.seconds)
+        save_tuning(config)
+        print(f'\nBest: P={config["P"]}, chunksize={config["chunksize"]}, start method={config["start_method"]}, '
+              f'{config["rate"]:.0f} tries/s -> {TUNING_PATH} [{host_key()}]')
+        raise SystemExit
+
     # 컨텍스트(context): 멀티프로세싱에서 프로세스, 큐, 락 등 IPC(Inter Process Communication, 프로세스 간 통신) 객체를 start method 규약에 맞춰 생성, 관리할지를 캡슐화한 객체
     # multiprocessing에서 spwan으로 동작하는 컨텍스트 객체를 가져온다.
     # 지역 설정
@@ -74,18 +265,22 @@ if __name__ == '__main__':
     # print(f'Best Core Count: {max_core}, {max_total:.0f} tries/s')
 
     # 비밀번호 생성 함수 성능 비교
-    # itertools 사용 vs index 사용
-    # itertools가 압도적으로 성능이 좋다.
+    # itertools 사용 vs index 사용 vs odometer(MaskGenerator.iter_range_bytes)
+    # itertools가 index보다 압도적으로 성능이 좋다.
+    # odometer는 임의 위치에서 시작하면서도 긴 구간에서는 itertools 수준 (N이 작으면 seek 비용이 보인다)
     for P in range(1, 20):
         with ctx.Pool(P) as pool:
             result = pool.map(comp_make_password, [N]*P)
         total_itertools_time = 0
         total_index_time = 0
+        total_odometer_time = 0
         for p in range(P):
             total_itertools_time += result[p][0]
             total_index_time += result[p][1]
+            total_odometer_time += result[p][2]
         print(f'\n{P} workers itertools: {total_itertools_time:.0f} tries/s (per-core {total_itertools_time/P:.0f})')
-        print(f'{P} workers index: {total_index_time:.0f} tries/s (per-core {total_index_time/P:.0f})\n')
+        print(f'{P} workers index: {total_index_time:.0f} tries/s (per-core {total_index_time/P:.0f})')
+        print(f'{P} workers odometer: {total_odometer_time:.0f} tries/s (per-core {total_odometer_time/P:.0f})\n')
     # password = '012345'
     # password = 'mars06'
     # result = zipcrypto_password_valid(ZIP_PATH, password)
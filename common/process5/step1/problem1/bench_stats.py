@@ -0,0 +1,113 @@
+import csv
+import json
+import math
+import random
+import statistics
+
+# 부트스트랩 재표본 횟수와 신뢰수준
+BOOTSTRAP_SAMPLES = 2000
+CONFIDENCE = 0.95
+
+
+def percentile(values: list[float], q: float) -> float:
+    '''
+    선형 보간 백분위수 (q: 0 ~ 100), 표본이 하나여도 동작
+    '''
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100
+    lo = math.floor(pos)
+    hi = math.ceil(pos)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def bootstrap_ci(values: list[float], samples: int = BOOTSTRAP_SAMPLES,
+                 confidence: float = CONFIDENCE, seed: int = 0) -> tuple[float, float]:
+    '''
+    평균의 부트스트랩 백분위 신뢰구간
+    - 표본에서 복원 추출로 같은 크기 표본을 samples번 만들어 평균 분포를 구한다.
+    - trial 수가 적으면 구간이 실제보다 좁게 나오므로 trial을 늘려서 본다.
+    '''
+    if len(values) < 2:
+        return values[0], values[0]
+    rng = random.Random(seed)
+    n = len(values)
+    means = [sum(rng.choices(values, k=n)) / n for _ in range(samples)]
+    tail = (1 - confidence) / 2 * 100
+    return percentile(means, tail), percentile(means, 100 - tail)
+
+
+def summarize(times: list[float]) -> dict:
+    '''
+    trial 시간 목록 -> mean, stddev, min, median, p95, 평균의 신뢰구간
+    '''
+    ci_low, ci_high = bootstrap_ci(times)
+    return {
+        'n': len(times),
+        'mean': statistics.fmean(times),
+        'stddev': statistics.stdev(times) if len(times) > 1 else 0.0,
+        'min': min(times),
+        'median': statistics.median(times),
+        'p95': percentile(times, 95),
+        'ci_low': ci_low,
+        'ci_high': ci_high,
+    }
+
+
+def add_scaling(rows: list[dict], key: str = 'mean'):
+    '''
+    P별 요약(rows, 'P' 포함)에 speedup, efficiency, karp_flatt를 추가
+    - 기준은 P=1 (없으면 가장 작은 P를 1코어 시간으로 환산)
+    - karp_flatt: 측정 speedup으로 역산한 직렬 비율 e = (1/S - 1/P) / (1 - 1/P)
+      P가 커질수록 e가 커지면 직렬 부분이 아니라 오버헤드(spawn, IPC)가 늘어나는 것
+    '''
+    base_row = min(rows, key=lambda r: r['P'])
+    base = base_row[key] * base_row['P']
+    for row in rows:
+        P = row['P']
+        speedup = base / row[key]
+        row['speedup'] = speedup
+        row['efficiency'] = speedup / P
+        row['karp_flatt'] = (1 / speedup - 1 / P) / (1 - 1 / P) if P > 1 else None
+    return rows
+
+
+def fit_amdahl(rows: list[dict]) -> float | None:
+    '''
+    Amdahl 직렬 비율 s 최소제곱 추정
+    1/S = s + (1 - s)/P  ->  (1/S - 1/P) = s * (1 - 1/P)
+    '''
+    xs = [1 - 1 / r['P'] for r in rows if r['P'] > 1]
+    ys = [1 / r['speedup'] - 1 / r['P'] for r in rows if r['P'] > 1]
+    denom = sum(x * x for x in xs)
+    if not denom:
+        return None
+    return sum(x * y for x, y in zip(xs, ys)) / denom
+
+
+def fit_gustafson(rows: list[dict]) -> float | None:
+    '''
+    Gustafson 직렬 비율 s 최소제곱 추정
+    S = P - s * (P - 1)  ->  (P - S) = s * (P - 1)
+    (N을 고정한 측정이므로 scaled speedup이 아니라 참고용)
+    '''
+    xs = [r['P'] - 1 for r in rows if r['P'] > 1]
+    ys = [r['P'] - r['speedup'] for r in rows if r['P'] > 1]
+    denom = sum(x * x for x in xs)
+    if not denom:
+        return None
+    return sum(x * y for x, y in zip(xs, ys)) / denom
+
+
+def write_results(path: str, rows: list[dict], meta: dict | None = None):
+    '''
+    확장자가 .csv면 CSV(행 하나 = P x 방식 하나), 아니면 JSON({meta, rows})
+    '''
+    if path.endswith('.csv'):
+        fields = list(dict.fromkeys(k for row in rows for k in row if k != 'times'))
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(rows)
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta or {}, 'rows': rows}, f, indent=2)
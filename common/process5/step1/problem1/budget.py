@@ -0,0 +1,89 @@
+'''
+시간 예산 안에서의 탐색 예측
+- 측정한 처리량(개/초)과 남은 구간(todo)으로 전체 완료 예상 시간, 예산 안에 검사할 수 있는 비율 계산
+- 후보 소스별 prior(비밀번호가 그 소스에 있을 확률)로
+  예산 안에 찾을 확률과 찾는다면 걸릴 예상 시간(expected time to solution) 계산
+- 소스 안에서는 모든 후보가 같은 확률이라고 본다.
+- 아직 찾지 못한 구간(done)은 빼고 조건부 확률로 계산 (재시작해도 남은 구간 기준)
+'''
+from candidates import CandidateGenerator, ChainGenerator
+from telemetry import format_eta
+
+# 예측 전에 처리량을 측정하는 시간(초)
+PREDICT_AFTER = 3
+
+
+def source_spans(generator: CandidateGenerator) -> list[tuple[int, int, float]]:
+    '''
+    생성기 -> 소스별 (시작 index, 끝 index, prior)
+    - 소스가 하나면 전체 구간, prior 1
+    '''
+    if isinstance(generator, ChainGenerator):
+        return generator.spans()
+    return [(0, len(generator), 1.0)]
+
+
+def predict(spans: list[tuple[int, int, float]], todo: list[tuple[int, int]], rate: float,
+            budget: float | None = None) -> dict:
+    '''
+    남은 구간을 todo 순서대로 rate(개/초)로 검사한다고 보고 예측
+    - eta_seconds: 남은 구간 전체를 검사하는 시간
+    - coverage: 예산 안에 검사하는 남은 후보 비율
+    - success_probability: 비밀번호가 후보 안에 있다면, 예산 안에 찾을 확률 (이미 검사한 구간 제외)
+    - expected_seconds: 예산과 관계없이 남은 구간에서 찾는다면 걸릴 예상 시간
+    '''
+    remaining = sum(hi - lo for lo, hi in todo)
+    reachable = remaining if budget is None else min(remaining, rate * budget)
+
+    mass = 0.0        # 남은 구간의 확률 합
+    covered = 0.0     # 예산 안에 검사하는 구간의 확률 합
+    weighted = 0.0    # 확률 x 발견 위치(남은 구간 기준 순번)의 합
+    position = 0
+    for lo, hi in todo:
+        for s_lo, s_hi, prior in spans:
+            a, b = max(lo, s_lo), min(hi, s_hi)
+            if a >= b:
+                continue
+            density = prior / (s_hi - s_lo)
+            n = b - a
+            start = position + (a - lo)
+            mass += density * n
+            covered += density * max(0, min(n, reachable - start))
+            weighted += density * n * (start + n / 2)
+        position += hi - lo
+
+    return {
+        'remaining': remaining,
+        'eta_seconds': remaining / rate if rate > 0 else None,
+        'coverage': reachable / remaining if remaining else 1.0,
+        'success_probability': covered / mass if mass > 0 else 0.0,
+        'expected_seconds': weighted / mass / rate if mass > 0 and rate > 0 else None,
+    }
+
+
+def format_prediction(prediction: dict, rate: float, budget: float | None) -> str:
+    line = (f'예측 ({rate:.0f} tries/s): 전체 완료 {format_eta(prediction["eta_seconds"])}, '
+            f'찾는다면 예상 {format_eta(prediction["expected_seconds"])}')
+    if budget is not None:
+        line += (f' | 예산 {format_eta(budget)} 안에 남은 후보 {prediction["coverage"] * 100:.1f}% 검사, '
+                 f'찾을 확률 {prediction["success_probability"] * 100:.1f}%')
+    return line
+
+
+if __name__ == '__main__':
+    # 소스 하나: 확률은 검사 비율과 같고, 예상 시간은 남은 구간의 절반
+    spans = [(0, 1000, 1.0)]
+    p = predict(spans, [(0, 1000)], rate=100, budget=5)
+    assert p['coverage'] == 0.5 and p['success_probability'] == 0.5 and p['expected_seconds'] == 5
+    # 앞 절반을 이미 검사했으면 남은 절반 기준 조건부 확률
+    p = predict(spans, [(500, 1000)], rate=100, budget=2.5)
+    assert p['success_probability'] == 0.5 and p['eta_seconds'] == 5
+
+    # 작은 소스(prior 0.5, 10개)를 먼저 검사하면 0.1초 만에 확률 절반
+    spans = [(0, 10, 0.5), (10, 1010, 0.5)]
+    p = predict(spans, [(0, 1010)], rate=100, budget=0.1)
+    assert abs(p['success_probability'] - 0.5) < 1e-9
+    p = predict(spans, [(0, 1010)], rate=100, budget=None)
+    assert p['success_probability'] == 1.0 and abs(p['expected_seconds'] - (0.5 * 0.05 + 0.5 * 5.1)) < 1e-9
+    print(format_prediction(p, 100, 60))
+    print('budget: OK')
@@ -0,0 +1,549 @@
+import bisect
+import itertools
+import os
+import string
+from array import array
+
+# hashcat 내장 문자셋
+BUILTIN_CHARSETS = {
+    'l': string.ascii_lowercase,
+    'u': string.ascii_uppercase,
+    'd': string.digits,
+    'h': string.digits + 'abcdef',
+    'H': string.digits + 'ABCDEF',
+    's': ' ' + string.punctuation,
+}
+BUILTIN_CHARSETS['a'] = BUILTIN_CHARSETS['l'] + BUILTIN_CHARSETS['u'] + BUILTIN_CHARSETS['d'] + BUILTIN_CHARSETS['s']
+
+
+class CandidateGenerator:
+    '''
+    후보 비밀번호 생성기 공통 인터페이스
+    - len(gen): 전체 후보 개수
+    - gen[i]: i번째 후보 (체크포인트/재시작용 위치 접근)
+    - gen.iter_range(start, stop): [start, stop) 후보를 순서대로 반환
+    - gen.iter_range_bytes(start, stop): 같은 후보를 bytes로 (검사 함수에 encode 없이 넘길 때)
+    - gen.shard(n, i): n개로 나눈 것 중 i번째 연속 구간 (병렬 워커용)
+    '''
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __getitem__(self, index: int) -> str:
+        raise NotImplementedError
+
+    def iter_range(self, start: int = 0, stop: int | None = None):
+        stop = len(self) if stop is None else min(stop, len(self))
+        for i in range(start, stop):
+            yield self[i]
+
+    def iter_range_bytes(self, start: int = 0, stop: int | None = None, encoding: str = 'utf-8'):
+        for password in self.iter_range(start, stop):
+            yield password.encode(encoding)
+
+    def __iter__(self):
+        return self.iter_range(0, len(self))
+
+    def shard(self, n: int, i: int) -> 'SliceGenerator':
+        '''
+        전체를 n개의 서로 겹치지 않는 연속 구간으로 나눠 i번째 구간 반환
+        - 앞쪽 구간이 1개씩 더 많을 수 있다.
+        '''
+        if not 0 <= i < n:
+            raise ValueError(f'shard index out of range: {i} / {n}')
+        size, extra = divmod(len(self), n)
+        start = i * size + min(i, extra)
+        stop = start + size + (1 if i < extra else 0)
+        return SliceGenerator(self, start, stop)
+
+
+class SliceGenerator(CandidateGenerator):
+    '''
+    다른 생성기의 [start, stop) 구간만 보여주는 생성기
+    '''
+    def __init__(self, base: CandidateGenerator, start: int, stop: int):
+        self.base = base
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.base[self.start + index]
+
+    def iter_range(self, start: int = 0, stop: int | None = None):
+        stop = len(self) if stop is None else min(stop, len(self))
+        return self.base.iter_range(self.start + start, self.start + stop)
+
+    def iter_range_bytes(self, start: int = 0, stop: int | None = None, encoding: str = 'utf-8'):
+        stop = len(self) if stop is None else min(stop, len(self))
+        return self.base.iter_range_bytes(self.start + start, self.start + stop, encoding)
+
+
+def parse_mask(mask: str, custom: dict[str, str] | None = None) -> list[str]:
+    '''
+    hashcat 스타일 마스크를 자리별 문자셋 목록으로 변환
+    - ?l ?u ?d ?h ?H ?s ?a: 내장 문자셋
+    - ?1 ~ ?4: custom으로 정의한 문자셋 (정의 안에서도 ?l 등 사용 가능)
+    - ??: 물음표 문자, 그 밖의 문자: 고정 문자
+    예) parse_mask('?l?l?d?d?d?d'), parse_mask('?1?1?1?1?1?1', {'1': '?d?l'})
+    '''
+    charsets = dict(BUILTIN_CHARSETS)
+    for key, value in (custom or {}).items():
+        charsets[key] = ''.join(dict.fromkeys(''.join(parse_mask(value))))
+
+    positions = []
+    i = 0
+    while i < len(mask):
+        ch = mask[i]
+        if ch != '?':
+            positions.append(ch)
+            i += 1
+            continue
+        if i + 1 >= len(mask):
+            raise ValueError(f'마스크가 ?로 끝남: {mask}')
+        key = mask[i + 1]
+        if key == '?':
+            positions.append('?')
+        elif key in charsets:
+            positions.append(charsets[key])
+        else:
+            raise ValueError(f'정의되지 않은 문자셋: ?{key}')
+        i += 2
+    return positions
+
+
+class MaskGenerator(CandidateGenerator):
+    '''
+    마스크 기반 생성기
+    - 순서: 앞자리가 가장 큰 자릿수 (itertools.product(*자리별 문자셋)과 같은 순서)
+    '''
+    def __init__(self, mask: str, custom: dict[str, str] | None = None):
+        self.mask = mask
+        self.custom = custom or {}
+        self.positions = parse_mask(mask, custom)
+        self.size = 1
+        for chars in self.positions:
+            self.size *= len(chars)
+        # 인코딩별 자리 bytes 조각 캐시 (iter_range_bytes를 청크마다 부르므로)
+        self._tables: dict[str, list[list[bytes]] | None] = {}
+
+    def __len__(self):
+        return self.size
+
+    def _prefix(self, index: int, count: int) -> str:
+        # 앞 count자리만으로 이루어진 공간에서 index번째 문자열
+        out = [''] * count
+        for p in range(count - 1, -1, -1):
+            chars = self.positions[p]
+            index, digit = divmod(index, len(chars))
+            out[p] = chars[digit]
+        return ''.join(out)
+
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        return self._prefix(index, len(self.positions))
+
+    def iter_range(self, start: int = 0, stop: int | None = None):
+        stop = self.size if stop is None else min(stop, self.size)
+        if not self.positions:
+            if start < stop:
+                yield ''
+            return
+        # 마지막 자리만 바뀌는 동안은 접두사를 다시 만들지 않는다.
+        last = self.positions[-1]
+        n = len(last)
+        count = len(self.positions) - 1
+        i = start
+        while i < stop:
+            q, r = divmod(i, n)
+            prefix = self._prefix(q, count)
+            take = min(n - r, stop - i)
+            for ch in last[r:r + take]:
+                yield prefix + ch
+            i += take
+
+    def _byte_tables(self, encoding: str) -> list[list[bytes]] | None:
+        '''
+        자리별 문자셋을 bytes 조각 목록으로 (자리 안의 모든 문자가 같은 바이트 길이일 때만, 아니면 None)
+        '''
+        if encoding not in self._tables:
+            tables = [[ch.encode(encoding) for ch in chars] for chars in self.positions]
+            if any(len({len(piece) for piece in table}) != 1 for table in tables):
+                tables = None
+            self._tables[encoding] = tables
+        return self._tables[encoding]
+
+    def iter_range_bytes(self, start: int = 0, stop: int | None = None, encoding: str = 'utf-8'):
+        '''
+        [start, stop) 후보를 bytes로 반환 (str 생성, encode 없음)
+        - start 위치로 한 번만 seek(자리별 divmod) 한 뒤, 앞자리들은 bytearray 위의
+          주행거리계(odometer)처럼 올림이 생긴 자리만 제자리에서 바꾼다.
+        - 마지막 자리는 미리 만든 bytes 조각을 접두사에 붙이기만 한다. (itertools.product 수준 처리량)
+        - 한 자리 안에 바이트 길이가 다른 문자가 섞여 있으면 문자열을 encode 하는 방식으로 대신한다.
+        '''
+        stop = self.size if stop is None else min(stop, self.size)
+        if start >= stop:
+            return
+        tables = self._byte_tables(encoding)
+        if tables is None:
+            yield from super().iter_range_bytes(start, stop, encoding)
+            return
+        if not tables:
+            yield b''
+            return
+
+        bases = [len(table) for table in tables]
+        widths = [len(table[0]) for table in tables]
+        offsets = list(itertools.accumulate(widths, initial=0))
+
+        # seek: start의 자리별 숫자
+        digits = [0] * len(tables)
+        rem = start
+        for p in range(len(tables) - 1, -1, -1):
+            rem, digits[p] = divmod(rem, bases[p])
+
+        count = len(tables) - 1
+        buf = bytearray(b''.join(tables[p][digits[p]] for p in range(count)))
+        last = tables[-1]
+        n = bases[-1]
+        r = digits[-1]
+        i = start
+        while True:
+            prefix = bytes(buf)
+            take = min(n - r, stop - i)
+            for piece in last[r:r + take]:
+                yield prefix + piece
+            i += take
+            if i >= stop:
+                return
+            r = 0
+            # 올림: 오른쪽 자리부터 (i < size이므로 맨 앞자리를 넘지 않는다)
+            p = count - 1
+            while True:
+                d = digits[p] + 1
+                if d < bases[p]:
+                    digits[p] = d
+                    buf[offsets[p]:offsets[p + 1]] = tables[p][d]
+                    break
+                digits[p] = 0
+                buf[offsets[p]:offsets[p + 1]] = tables[p][0]
+                p -= 1
+
+
+class WordlistGenerator(CandidateGenerator):
+    '''
+    디스크의 단어 목록 파일을 한 줄씩 스트리밍하는 생성기
+    - 처음 한 번 파일을 훑어서 줄 시작 위치(offset)만 array로 기록 (단어 자체는 메모리에 올리지 않는다)
+    - gen[i], iter_range(start, stop)는 offset으로 바로 seek
+    - 빈 줄은 건너뛴다.
+    '''
+    def __init__(self, path: str, encoding: str = 'utf-8'):
+        self.path = path
+        self.encoding = encoding
+        self.offsets = array('Q')
+        with open(path, 'rb') as f:
+            pos = 0
+            for line in f:
+                if line.strip(b'\r\n'):
+                    self.offsets.append(pos)
+                pos += len(line)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def _decode(self, line: bytes) -> str:
+        return line.rstrip(b'\r\n').decode(self.encoding, errors='replace')
+
+    def __getitem__(self, index: int) -> str:
+        with open(self.path, 'rb') as f:
+            f.seek(self.offsets[index])
+            return self._decode(f.readline())
+
+    def iter_range(self, start: int = 0, stop: int | None = None):
+        stop = len(self) if stop is None else min(stop, len(self))
+        if start >= stop:
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(self.offsets[start])
+            remaining = stop - start
+            for line in f:
+                if not line.strip(b'\r\n'):
+                    continue
+                yield self._decode(line)
+                remaining -= 1
+                if remaining == 0:
+                    return
+
+
+def _rule_functions(rule: str) -> list[tuple[str, str]]:
+    '''
+    규칙 문자열을 (함수, 인자) 목록으로 분해
+    '''
+    # 함수별 인자 개수
+    nargs = {':': 0, 'l': 0, 'u': 0, 'c': 0, 'C': 0, 't': 0, 'r': 0, 'd': 0, 'f': 0, '[': 0, ']': 0,
+             '$': 1, '^': 1, 'T': 1, 'D': 1, '@': 1, 's': 2}
+    funcs = []
+    i = 0
+    while i < len(rule):
+        op = rule[i]
+        if op == ' ':
+            i += 1
+            continue
+        if op not in nargs:
+            raise ValueError(f'지원하지 않는 규칙: {op!r} in {rule!r}')
+        n = nargs[op]
+        arg = rule[i + 1:i + 1 + n]
+        if len(arg) != n:
+            raise ValueError(f'규칙 인자 부족: {rule!r}')
+        funcs.append((op, arg))
+        i += 1 + n
+    return funcs
+
+
+def _position(arg: str) -> int:
+    # hashcat 위치 인자: 0-9, A-Z(10-35)
+    return int(arg, 36)
+
+
+def apply_rule(word: str, funcs: list[tuple[str, str]]) -> str:
+    '''
+    hashcat 규칙 일부 지원
+    :  그대로         l  소문자         u  대문자          c  첫 글자만 대문자
+    C  첫 글자만 소문자 t  대소문자 반전   r  뒤집기          d  두 번 반복
+    f  뒤집어 이어붙임 [  첫 글자 삭제    ]  마지막 글자 삭제  $X 뒤에 X 추가
+    ^X 앞에 X 추가     TN N번째 대소문자 반전  DN N번째 글자 삭제
+    @X X 모두 삭제     sXY X를 Y로 치환
+    '''
+    for op, arg in funcs:
+        if op == 'l':
+            word = word.lower()
+        elif op == 'u':
+            word = word.upper()
+        elif op == 'c':
+            word = word[:1].upper() + word[1:].lower()
+        elif op == 'C':
+            word = word[:1].lower() + word[1:].upper()
+        elif op == 't':
+            word = word.swapcase()
+        elif op == 'r':
+            word = word[::-1]
+        elif op == 'd':
+            word = word + word
+        elif op == 'f':
+            word = word + word[::-1]
+        elif op == '[':
+            word = word[1:]
+        elif op == ']':
+            word = word[:-1]
+        elif op == '$':
+            word = word + arg
+        elif op == '^':
+            word = arg + word
+        elif op == 'T':
+            n = _position(arg)
+            if n < len(word):
+                word = word[:n] + word[n].swapcase() + word[n + 1:]
+        elif op == 'D':
+            n = _position(arg)
+            if n < len(word):
+                word = word[:n] + word[n + 1:]
+        elif op == '@':
+            word = word.replace(arg, '')
+        elif op == 's':
+            word = word.replace(arg[0], arg[1])
+    return word
+
+
+def load_rules(path: str) -> list[str]:
+    '''
+    규칙 파일 읽기 (빈 줄, #으로 시작하는 줄은 무시)
+    '''
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.rstrip('\r\n') for line in f if line.strip() and not line.startswith('#')]
+
+
+class RuleGenerator(CandidateGenerator):
+    '''
+    다른 생성기의 후보마다 규칙(변형)을 적용하는 생성기
+    - 순서: 단어 하나에 모든 규칙을 적용한 뒤 다음 단어 (index = 단어 index * 규칙 개수 + 규칙 index)
+    '''
+    def __init__(self, base: CandidateGenerator, rules: list[str]):
+        self.base = base
+        self.rules = list(rules) or [':']
+        self.funcs = [_rule_functions(rule) for rule in self.rules]
+
+    def __len__(self):
+        return len(self.base) * len(self.funcs)
+
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        w, r = divmod(index, len(self.funcs))
+        return apply_rule(self.base[w], self.funcs[r])
+
+    def iter_range(self, start: int = 0, stop: int | None = None):
+        stop = len(self) if stop is None else min(stop, len(self))
+        if start >= stop:
+            return
+        R = len(self.funcs)
+        w_start, r_start = divmod(start, R)
+        remaining = stop - start
+        for word in self.base.iter_range(w_start, (stop + R - 1) // R):
+            for funcs in self.funcs[r_start:]:
+                yield apply_rule(word, funcs)
+                remaining -= 1
+                if remaining == 0:
+                    return
+            r_start = 0
+
+
+class ChainGenerator(CandidateGenerator):
+    '''
+    여러 생성기를 순서대로 이어 붙인 생성기
+    - index 공간: 첫 생성기 [0, len0), 다음 생성기 [len0, len0 + len1), ...
+    - iter_range / iter_range_bytes는 구간을 생성기별로 잘라 각 생성기에 넘긴다. (마스크 주행거리계 그대로 사용)
+    - priors: 생성기마다 비밀번호가 그 안에 있을 확률 (예산 예측용, 합 1)
+    - 생성기가 없으면 후보 0개인 빈 생성기
+    '''
+    def __init__(self, generators: list[CandidateGenerator], priors: list[float] | None = None):
+        self.generators = list(generators)
+        n = len(self.generators)
+        self.priors = list(priors) if priors is not None else [1 / n for _ in range(n)]
+        if len(self.priors) != n:
+            raise ValueError(f'prior 개수({len(self.priors)})와 생성기 개수({n})가 다름')
+        self.offsets = [0]
+        for gen in self.generators:
+            self.offsets.append(self.offsets[-1] + len(gen))
+
+    def __len__(self):
+        return self.offsets[-1]
+
+    def spans(self) -> list[tuple[int, int, float]]:
+        '''
+        생성기별 (시작 index, 끝 index, prior)
+        '''
+        return [(self.offsets[k], self.offsets[k + 1], prior) for k, prior in enumerate(self.priors)]
+
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        k = bisect.bisect_right(self.offsets, index) - 1
+        return self.generators[k][index - self.offsets[k]]
+
+    def _pieces(self, start: int, stop: int | None):
+        stop = len(self) if stop is None else min(stop, len(self))
+        for k, gen in enumerate(self.generators):
+            lo, hi = max(start, self.offsets[k]), min(stop, self.offsets[k + 1])
+            if lo < hi:
+                yield gen, lo - self.offsets[k], hi - self.offsets[k]
+
+    def iter_range(self, start: int = 0, stop: int | None = None):
+        for gen, lo, hi in self._pieces(start, stop):
+            yield from gen.iter_range(lo, hi)
+
+    def iter_range_bytes(self, start: int = 0, stop: int | None = None, encoding: str = 'utf-8'):
+        for gen, lo, hi in self._pieces(start, stop):
+            yield from gen.iter_range_bytes(lo, hi, encoding)
+
+
+def order_sources(generators: list[CandidateGenerator], priors: list[float] | None = None) -> ChainGenerator:
+    '''
+    후보 소스를 초당 성공 확률이 높은 순서로 이어 붙이기
+    - priors: 소스마다 비밀번호가 그 안에 있을 확률 (없으면 모두 같게)
+    - 후보가 0개인 소스는 빼고, 남은 소스의 prior 합이 1이 되도록 정규화 (남은 소스가 없으면 빈 생성기)
+    - 같은 zip을 검증하므로 후보 하나의 검증 비용은 소스와 관계없이 같다.
+      -> 초당 성공 확률은 후보 하나당 확률(prior / len)에 비례
+    - 정렬이 안정적이므로 같은 옵션이면 항상 같은 index 공간 (체크포인트 재시작 가능)
+    '''
+    priors = list(priors) if priors else [1.0] * len(generators)
+    if len(priors) != len(generators):
+        raise ValueError(f'prior 개수({len(priors)})와 후보 소스 개수({len(generators)})가 다름')
+    if any(p < 0 for p in priors):
+        raise ValueError('prior는 0 이상이어야 함')
+    pairs = [(gen, p) for gen, p in zip(generators, priors) if len(gen)]
+    if not pairs:
+        return ChainGenerator([])
+    total = sum(p for _, p in pairs)
+    if total <= 0:
+        raise ValueError('후보가 있는 소스의 prior 합이 0보다 커야 함')
+    pairs = [(gen, p / total) for gen, p in pairs]
+    pairs.sort(key=lambda pair: pair[1] / len(pair[0]), reverse=True)
+    return ChainGenerator([gen for gen, _ in pairs], [p for _, p in pairs])
+
+
+def make_generator(mask: str | None = None, custom: dict[str, str] | None = None,
+                   wordlist: str | None = None, rules: str | None = None,
+                   masks: list[str] | None = None, priors: list[float] | None = None) -> CandidateGenerator:
+    '''
+    명령행 옵션으로 생성기 만들기
+    - wordlist가 있으면 단어 목록(+규칙 파일), 없으면 마스크
+    - masks: 추가 마스크 소스, 있으면 order_sources로 priors(기본 소스, 추가 마스크 순서)에 따라 정렬해 이어 붙인다.
+    '''
+    if wordlist:
+        gen = WordlistGenerator(wordlist)
+        if rules:
+            gen = RuleGenerator(gen, load_rules(rules))
+    elif rules:
+        raise ValueError('규칙은 단어 목록(--wordlist)과 함께 사용')
+    else:
+        gen = MaskGenerator(mask, custom)
+    if not masks:
+        if priors and len(priors) != 1:
+            raise ValueError(f'prior 개수({len(priors)})와 후보 소스 개수(1)가 다름')
+        return gen
+    return order_sources([gen] + [MaskGenerator(m, custom) for m in masks], priors)
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    # 마스크 순서가 itertools.product와 같은지 확인
+    gen = MaskGenerator('?1?1?1', {'1': '?d?l'})
+    expect = [''.join(t) for t in itertools.product(string.digits + string.ascii_lowercase, repeat=3)]
+    assert len(gen) == len(expect) and list(gen) == expect
+    assert [gen[i] for i in (0, 37, len(gen) - 1)] == [expect[0], expect[37], expect[-1]]
+    assert sum((list(gen.shard(5, i)) for i in range(5)), []) == expect
+    print('mask: OK')
+
+    # bytes 주행거리계: 임의 위치에서 시작해도 문자열 순서와 같은지 (멀티바이트 자리 포함)
+    for g in (gen, MaskGenerator('a?1?d', {'1': 'xé'}), MaskGenerator('?dé?d')):
+        encoded = [w.encode() for w in g]
+        for lo, hi in ((0, len(g)), (5, 77), (len(g) - 3, len(g) + 5), (9, 9)):
+            assert list(g.iter_range_bytes(lo, hi)) == encoded[lo:hi], (g.mask, lo, hi)
+    assert list(gen.shard(3, 1).iter_range_bytes(2, 10)) == [w.encode() for w in gen.shard(3, 1)][2:10]
+    print('mask bytes: OK')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'words.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('mars\n\nrover\r\norbit\n')
+        words = WordlistGenerator(path)
+        assert list(words) == ['mars', 'rover', 'orbit'] and words[2] == 'orbit'
+
+        rules = RuleGenerator(words, [':', 'c', '$0$6', 'sa4'])
+        out = list(rules)
+        assert out[:4] == ['mars', 'Mars', 'mars06', 'm4rs']
+        assert [rules[i] for i in range(len(rules))] == out
+        assert list(rules.iter_range(3, 9)) == out[3:9]
+        assert sum((list(rules.shard(4, i)) for i in range(4)), []) == out
+    print('wordlist + rules: OK')
+
+    # 이어 붙인 소스: 초당 성공 확률 순 정렬, 구간이 소스 경계를 넘어도 순서 유지
+    small, large = MaskGenerator('?d?d'), MaskGenerator('?l?l')
+    chain = order_sources([large, small])
+    assert chain.generators == [small, large] and chain.priors == [0.5, 0.5]
+    assert order_sources([large, small], [0.99, 0.01]).generators == [large, small]
+    expect = list(small) + list(large)
+    assert list(chain) == expect and [chain[i] for i in (0, 99, 100, len(chain) - 1)] == [expect[0], expect[99], expect[100], expect[-1]]
+    assert list(chain.iter_range_bytes(95, 130)) == [w.encode() for w in expect[95:130]]
+    assert sum((list(chain.shard(3, i)) for i in range(3)), []) == expect
+    assert len(make_generator('?d', masks=['?d?d', '?l'])) == 10 + 100 + 26
+    # 빈 소스는 빼고 남은 prior를 다시 정규화, 모두 비면 빈 생성기
+    empty = SliceGenerator(small, 0, 0)
+    assert order_sources([empty, small, large], [0.5, 0.25, 0.25]).priors == [0.5, 0.5]
+    assert len(order_sources([empty])) == 0 and list(ChainGenerator([])) == []
+    print('chain: OK')
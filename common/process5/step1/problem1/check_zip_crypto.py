@@ -1,6 +1,14 @@
+import mmap
 import struct
+import zlib
 from binascii import crc32
 
+from crc32 import crc32_slicing_by_8
+
+# ZipCrypto 키 초기값과 k1 선형합동법(LCG) 곱셈 상수 (스펙 고정)
+KEY0, KEY1, KEY2 = 0x12345678, 0x23456789, 0x34567890
+LCG_MULT = 134775813
+
 _crctable = None
 def _gen_crc(crc):
     '''
@@ -57,7 +65,7 @@ def _init_keys(pwd: bytes):
     비밀번호로 초기 키 상태 생성
     - k0, k1, k2 초기값은 ZipCrypto 스펙에 고정되어 있음
     '''
-    k0, k1, k2 = 0x12345678, 0x23456789, 0x34567890
+    k0, k1, k2 = KEY0, KEY1, KEY2
     # k0 = 305419896
     # k1 = 591751049
     # k2 = 878082192
@@ -78,10 +86,10 @@ def _init_keys(pwd: bytes):
         # - ZipCrypto는 모든 중간값을 32비트로 잘라내므로, 연산마다 사용
         k1 = (k1 + (k0 & 0xff)) & 0xffffffff
         # 선형합동법(LCG)로 k1을 의사난수적으로 확산
-        # 134775813: 곱셈 상수. ZipCrypto 스펙
+        # LCG_MULT(134775813): 곱셈 상수. ZipCrypto 스펙
         # 1: 덧셈 상수. ZipCrypto 스펙
         # 0xffffffff(2 ^ 32): module, ZipCrypto 스펙
-        k1 = (k1 * 134775813 + 1) & 0xffffffff
+        k1 = (k1 * LCG_MULT + 1) & 0xffffffff
         # k1의 상위 1바이트를 사용하여 k2 갱신
         k2 = _crc_32_update(k2, (k1 >> 24) & 0xff)
     return [k0, k1, k2]
@@ -124,7 +132,7 @@ def _update_keys(keys, ch):
     '''
     keys[0] = _crc_32_update(keys[0], ch)
     keys[1] = (keys[1] + (keys[0] & 0xff)) & 0xffffffff
-    keys[1] = (keys[1] * 134775813 + 1) & 0xffffffff
+    keys[1] = (keys[1] * LCG_MULT + 1) & 0xffffffff
     keys[2] = _crc_32_update(keys[2], (keys[1] >> 24) & 0xff)
 
 
@@ -149,6 +157,19 @@ def _decrypt_header12(enc12: bytes, pwd: bytes) -> bytes:
     return bytes(out)
 
 
+def _decrypt_stream(enc: bytes, keys: list) -> bytes:
+    '''
+    현재 키 상태(keys)로 암호문을 이어서 복호화
+    - keys는 복호화하면서 갱신되므로, 12바이트 헤더 다음 데이터도 같은 keys로 계속 복호화할 수 있다.
+    '''
+    out = bytearray(len(enc))
+    for i, c in enumerate(enc):
+        b = c ^ _decrypt_byte(keys)
+        out[i] = b
+        _update_keys(keys, b)
+    return bytes(out)
+
+
 def _has_aes_extra(extra: bytes) -> bool:
     i = 0
     n = len(extra)
@@ -162,113 +183,342 @@ def _has_aes_extra(extra: bytes) -> bool:
     return False
 
 
-def zipcrypto_password_valid(zip_path: str, password: str, entry_index: int = 0) -> bool:
+def _parse_aes_extra(extra: bytes) -> tuple[int, int, int] | None:
+    '''
+    WinZip AES 엑스트라(0x9901) 파싱 -> (vendor version, strength, 실제 압축 방식)
+    - [0x9901] version(2) vendor_id(2, 'AE') strength(1) method(2)
+    - strength: 1 = AES-128, 2 = AES-192, 3 = AES-256
+    - version: 1 = AE-1(CRC 저장), 2 = AE-2(CRC 0)
+    '''
+    i = 0
+    n = len(extra)
+    while i + 4 <= n:
+        tag, sz = struct.unpack_from('<HH', extra, i)
+        i += 4
+        if i + sz > n: break
+        if tag == 0x9901 and sz >= 7:
+            version, vendor, strength, method = struct.unpack_from('<H2sBH', extra, i)
+            return version, strength, method
+        i += sz
+    return None
+
+
+def read_zipcrypto_header(zip_file: 'str | ZipReader | ZipTarget', entry_index: int = 0) -> tuple[bytes, int] | None:
+    '''
+    ZipCrypto 암호 헤더 읽기
+    - entry_index 엔트리의 (암호화된 12바이트 헤더, 검증 바이트) 반환
+    - AES-Zip, 비암호 Zip은 None 반환
+    - zip_file: 경로면 호출마다 mmap + 중앙 디렉터리 파싱,
+      열어 둔 ZipReader/ZipTarget을 넘기면 엔트리 목록에서 바로 찾는다. (O(1))
+    '''
+    if isinstance(zip_file, str):
+        with ZipReader(zip_file) as reader:
+            return read_zipcrypto_header(reader, entry_index)
+
+    entries = zip_file.entries
+    entry = entries[entry_index] if 0 <= entry_index < len(entries) else None
+    # 엔트리 없음, 비암호, AES-Zip
+    if entry is None or not entry.zipcrypto:
+        return None
+
+    # 첫 12바이트(ZipCrypto header)와 검증 바이트
+    # 검증 바이트: bit3 = 1 - time 상위 8비트(1바이트), bit3 = 0 - CRC의 상위 8비트(1바이트)
+    return entry.enc12, entry.check_byte
+
+
+def zipcrypto_password_valid(zip_file: 'str | ZipReader | ZipTarget', password: str, entry_index: int = 0) -> bool:
     '''
     ZipCrypto 암호화된 Zip 파일 비밀번호 검증
-    - entry_index 엔트리의 로컬 헤더만 읽고 12바이트 헤더를 해제해서 검증
+    - entry_index 엔트리의 12바이트 헤더를 해제해서 검증
     - AES-Zip, 비암호 Zip은 False 반환
+    - 후보마다 부를 때는 zip_file로 열어 둔 ZipReader/ZipTarget을 넘긴다.
     '''
+    header = read_zipcrypto_header(zip_file, entry_index)
+    if header is None:
+        return False
+    enc12, check_byte = header
 
-    pwd = password.encode()
-    with open(zip_path, 'rb') as f:
-        # ZIP 파일의 각 엔트리 앞에는 고정된 형태의 로컬 파일 헤더가 있다.
-        # 괄호 숫자는 바이트 크기
-
-        # [Local File Header] signature(4) ver(2) flag(2) comp(2) time(2) date(2) crc32(4) comp_size(4) uncomp_size(4) fname_len(2) extra_len(2)
-        # 고정 바이트: 30 bytes(시그니처(4) + 나머지(26)
-        # 다음 바이트는 가변
-        # 바이트 순서: 파일명(fname_len) -> 엑스트라(extra_len) -> 실제 파일 데이터 순서
-
-        # signature(4): 항상 PK\x03\x04(리틀엔디언 0x04034b50), 로컬 헤더 시작 표지
-
-        # ver(2): 파일을 풀기 위해 필요한 최소 ZIP 버전
-
-        # flag(2): 일반 목적 비트 플래그
-        # - bit0 = 1이면 암호화됨
-        # - bit3 = 1이면 데이터 디스크립터(Data Descriptor) 사용.
-        # -- bit 3 = 1이면 로컬 헤더만 보고는 데이터 길이를 정확히 알 수 없으므로, 데이터 디스크립터를 읽거나 중앙 디렉터리(Central Directory)를 참고해야 다음 엔트리로 건너뛸 수 있다.
-        # 데이터 디스크립터: ZIP 파일에서 파일(엔트리) 데이터가 끝난 직후에 붙는 작은 요약 블록.
-        # - 파일을 쓰는 순간엔 크기/CRC를 모를 수 있기에 먼저 0으로 설정하고, 나중에 데이터가 끝난 뒤에 데이터 디스크립터에 진짜 값을 적는다.
-        # - crc32, comp_size, uncomp_size가 0일 수 있고, 정확한 값은 데이터 디스크립터에 기록된다.
-        # - 데이터 디스크립터에 4바이트 시그니처를 붙일 수도 있고, 안 붙일 수도 있다.
-        # - 데이터 디스크립터 시그니처: PK\x07\x08(0x08074b50)
-        # - 그러므로 데이터 디스크립터의 처음 4바이트의 값이 PK\x07\x08면 다음 바이트부터 crc32, comp_size, uncomp_size이고,
-        # - 처음 4바이트 값이 PK\x07\x08가 아니면, 처음 4바이트부터 crc32, comp_size, uncomp_size이다.
-
-        # comp(2): 압축 방식.
-        # - 0 = STORE(무압축)
-        # - 8 = DEFLATE(손실 없는 압축 알고리즘)
-        # - 99 = AES(Advanced Encryption Standard, 대칭키 블록 암호)
-        # time(2): MS-DOS(Microsoft Disk Operating System) 압축 시각
-        # date(2): MS-DOS 압축 날짜
-        # crc32(4): 원본 데이터의 CRC-32(비트 오류 검출용). flag bit3 = 1이면 0일 수 있다.
-        # comp_size(4): 압축(또는 암호화 포함)된 크기. flag bit3 = 1이면 0일 수 있다.
-        # uncomp_size(4): 압축 풀린 원본 크기. flag bit3 = 1이면 0일 수 있다.
-        # fname_len(2): 바로 뒤에 오는 파일명 길이
-        # extra_len(2): 그 다음에 오는 엑스트라 필드 길이(AES 정보 등 확장 메타가 여기에 들어간다)
-
-        # struct: <IHHHHHIIIHH
-        # IHHHHHIIIHH: struct 모듈의 포맷 문자열
-        # <: 리틀엔디언(작은바이트순)
-        # I: 4바이트 unsigned int(signature, crc32, comp_size, uncomp_size)
-        # H: 2바이트 unsigned short(ver, flag, comp, time, date, fname_len, extra_len)
-        # <I    H    H    H     H     H     I      I          I           H          H
-        # sig, ver, flag, comp, time, date, crc32, comp_size, uncomp_size, fname_len, extra_len
-
-        # ZIP엔 보통 여러 파일(엔트리)이 들어 있으니 원하는 엔트리까지 이동하기 위해 entry_index만큼 건너뛰기
-        # 1. 시그니처(4) == PK\x03\x04 확인
-        # 2. 고정부(26) 바이트 확인
-        # 3. 비트0(암호화) 확인
-        offset = 0
-        for _ in range(entry_index + 1):
-            f.seek(offset)
-            sig = f.read(4)
-            if sig != b'PK\x03\x04':
-                return False # 로컬 헤더 아님
-            hdr = f.read(26)
-            if len(hdr) < 26:
-                return False
-            ver, flag, comp, time, date, crc32, csize, usize, nlen, xlen = struct.unpack('<HHHHHIIIHH', hdr)
-
-            # 비트0(암호화)이 켜져 있는지 확인
-            encrypted = bool(flag & 0x0001)
-            # AES-Zip은 local extra에 0x9901이 붙지만, 여기서는 간단히 comp=99(0x63)로 거르는 편법 가능
-            # 엄밀한 판별은 extra 파싱 필요
-            if not encrypted:
-                return False    # 비암호
-            if comp == 99:      # 일반적으로 AES-Zip은 method=99
-                return False    # AES-Zip
-            
-            # 파일명/엑스트라 스킵하고 encrypted data 시작 위치로
-            # f.seek(nlen + xlen, 1)
-            fname = f.read(nlen)
-            extra = f.read(xlen)
-
-            # print(f"flag=0x{flag:04x}, comp={comp}, nlen={nlen}, xlen={xlen}")
-            # print(f"time=0x{time:04x}, crc32=0x{crc32:08x}")
-
-            if _has_aes_extra(extra):
-                return False
+    # 해제
+    dec12 = _decrypt_header12(enc12, password.encode())
+
+    # 검증 바이트 비교(1바이트만 검증, 우연히 맞을 확률 1/256 존재 -> 확실하지 않음)
+    return dec12[-1] == check_byte
+
+
+# [End of Central Directory] signature(4) disk(2) cd_disk(2) n_disk(2) n_total(2) cd_size(4) cd_offset(4) comment_len(2)
+EOCD_SIG = b'PK\x05\x06'
+EOCD_SIZE = 22
+# [Central Directory File Header] 고정 46 bytes, 뒤에 파일명/엑스트라/코멘트가 온다.
+CDFH_SIG = b'PK\x01\x02'
+CDFH_SIZE = 46
+LFH_SIG = b'PK\x03\x04'
+LFH_SIZE = 30
+
+# 검증 바이트를 통과한 후보에 대해 추가로 복호화해 보는 데이터 크기
+VERIFY_BYTES = 512
+
+# AES strength -> salt 길이
+AES_SALT_LENGTHS = {1: 8, 2: 12, 3: 16}
+
+
+def _find_eocd(data: bytes) -> int:
+    '''
+    End of Central Directory 레코드 위치 찾기
+    - EOCD는 파일 맨 끝 22바이트 + 코멘트(최대 65535) 안에 있으므로 뒤에서부터 찾는다.
+    '''
+    start = max(0, len(data) - EOCD_SIZE - 0xffff)
+    pos = data.rfind(EOCD_SIG, start)
+    if pos < 0 or pos + EOCD_SIZE > len(data):
+        raise ValueError('End of Central Directory를 찾을 수 없음')
+    return pos
 
 
-            # 첫 12바이트 읽기(ZipCrypto header)
-            enc12 = f.read(12)
-            # print(enc12)
-            if len(enc12) < 12:
+def _iter_central_directory(data: bytes):
+    '''
+    중앙 디렉터리를 순회하며 엔트리별 필드를 dict로 반환
+    - 로컬 헤더는 데이터 디스크립터(flag bit3) 사용 시 crc32/크기가 0일 수 있으므로
+      정확한 값은 중앙 디렉터리에서 읽는다.
+    '''
+    eocd = _find_eocd(data)
+    _, _, _, _, n_total, cd_size, cd_offset, _ = struct.unpack_from('<IHHHHIIH', data, eocd)
+    pos = cd_offset
+    for _ in range(n_total):
+        if data[pos:pos + 4] != CDFH_SIG:
+            raise ValueError(f'중앙 디렉터리 헤더 아님: offset={pos}')
+        (_, _, _, flag, comp, time, date, crc32, csize, usize,
+         nlen, xlen, clen, _, _, _, header_offset) = struct.unpack_from('<IHHHHHHIIIHHHHHII', data, pos)
+        name = data[pos + CDFH_SIZE:pos + CDFH_SIZE + nlen]
+        extra = data[pos + CDFH_SIZE + nlen:pos + CDFH_SIZE + nlen + xlen]
+        yield {
+            'name': name.decode('utf-8' if flag & 0x0800 else 'cp437'),
+            'flag': flag,
+            'comp': comp,
+            'time': time,
+            'crc32': crc32,
+            'csize': csize,
+            'usize': usize,
+            'header_offset': header_offset,
+            'extra': extra,
+        }
+        pos += CDFH_SIZE + nlen + xlen + clen
+
+
+class ZipEntry:
+    '''
+    미리 파싱해 둔 엔트리 하나의 메타데이터
+    - zipcrypto가 True인 엔트리만 enc12, check_byte를 가진다.
+    '''
+    def __init__(self, index: int, fields: dict, data_offset: int, local_extra: bytes):
+        self.index = index
+        self.name: str = fields['name']
+        self.flag: int = fields['flag']
+        self.comp: int = fields['comp']
+        self.time: int = fields['time']
+        self.crc32: int = fields['crc32']
+        self.csize: int = fields['csize']
+        self.usize: int = fields['usize']
+        self.header_offset: int = fields['header_offset']
+        self.data_offset = data_offset
+
+        self.encrypted = bool(self.flag & 0x0001)
+        # AES 판별: method=99 또는 중앙/로컬 엑스트라의 0x9901
+        self.aes = self.comp == 99 or _has_aes_extra(fields['extra']) or _has_aes_extra(local_extra)
+        self.zipcrypto = self.encrypted and not self.aes and self.csize >= 12
+
+        self.enc12: bytes | None = None
+        self.check_byte: int | None = None
+        # 헤더 다음 암호문 앞부분(최대 VERIFY_BYTES)과, 그것이 엔트리 전체인지 여부
+        self.enc_data: bytes = b''
+        self.complete = False
+
+        # AES 엔트리: (version, strength, method), salt, 2바이트 비밀번호 검증값
+        self.aes_params = _parse_aes_extra(fields['extra']) or _parse_aes_extra(local_extra)
+        self.salt: bytes | None = None
+        self.pwv: bytes | None = None
+
+    def __repr__(self):
+        kind = 'ZipCrypto' if self.zipcrypto else 'AES' if self.aes else 'plain'
+        return f'ZipEntry({self.index}, {self.name!r}, {kind})'
+
+
+class ZipReader:
+    '''
+    mmap으로 연 ZIP 파일 리더
+    - EOCD -> 중앙 디렉터리로 엔트리 목록을 한 번 만들어 두므로, 엔트리 접근(entries[i], find(name))은 O(1)
+      (로컬 헤더를 처음부터 차례로 건너뛰지 않는다)
+    - data(entry)는 파일 내용을 복사하지 않는 memoryview (12바이트 헤더 포함 암호문 전체)
+    - 읽기 전용 공유 매핑이므로 fork된 워커는 같은 페이지를 그대로 쓰고,
+      spawn 워커에는 경로만 pickle 되어 다시 매핑한다. (페이지 캐시는 공유)
+    - data()로 받은 memoryview를 모두 release 해야 close()할 수 있다. (with 문 사용)
+    '''
+    def __init__(self, zip_path: str):
+        self.zip_path = zip_path
+        self._open()
+
+    def _open(self):
+        with open(self.zip_path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mm)
+
+        self.entries: list[ZipEntry] = []
+        for index, fields in enumerate(_iter_central_directory(self.mm)):
+            offset = fields['header_offset']
+            if self.mm[offset:offset + 4] != LFH_SIG:
+                raise ValueError(f'로컬 헤더 아님: offset={offset}')
+            nlen, xlen = struct.unpack_from('<HH', self.mm, offset + 26)
+            local_extra = self.mm[offset + LFH_SIZE + nlen:offset + LFH_SIZE + nlen + xlen]
+            entry = ZipEntry(index, fields, offset + LFH_SIZE + nlen + xlen, local_extra)
+            if entry.zipcrypto:
+                entry.enc12 = self.mm[entry.data_offset:entry.data_offset + 12]
+                # 검증 바이트: bit3 = 1 - time 상위 8비트, bit3 = 0 - CRC의 상위 8비트
+                if entry.flag & 0x0008:
+                    entry.check_byte = (entry.time >> 8) & 0xff
+                else:
+                    entry.check_byte = (entry.crc32 >> 24) & 0xff
+            self.entries.append(entry)
+        self.by_name = {entry.name: entry for entry in self.entries}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getitem__(self, index: int) -> ZipEntry:
+        return self.entries[index]
+
+    def find(self, name: str) -> ZipEntry | None:
+        return self.by_name.get(name)
+
+    def data(self, entry: ZipEntry | int) -> memoryview:
+        '''
+        엔트리의 저장된 데이터 (암호화 엔트리는 암호 헤더 포함) zero-copy 슬라이스
+        '''
+        if isinstance(entry, int):
+            entry = self.entries[entry]
+        return self.view[entry.data_offset:entry.data_offset + entry.csize]
+
+    def close(self):
+        self.view.release()
+        self.mm.close()
+
+    def __enter__(self) -> 'ZipReader':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getstate__(self):
+        return {'zip_path': self.zip_path}
+
+    def __setstate__(self, state):
+        self.zip_path = state['zip_path']
+        self._open()
+
+
+class ZipTarget:
+    '''
+    ZIP 파일을 한 번만 열어(ZipReader) 모든 엔트리의 헤더를 파싱해 두는 검증 대상
+    - check(password)는 파일 I/O 없이 메모리에 있는 12바이트 헤더만으로 검증
+    - 브루트포스 작업 1개당 한 번 만들고, 후보마다 check를 호출한다.
+    - verify(password)는 check를 통과한 후보만 데이터 앞부분을 복호화/압축 해제해서 한 번 더 확인
+    '''
+    def __init__(self, zip_path: str, verify_bytes: int = VERIFY_BYTES):
+        self.zip_path = zip_path
+        self.verify_bytes = verify_bytes
+        with ZipReader(zip_path) as reader:
+            self.entries: list[ZipEntry] = reader.entries
+            for entry in self.entries:
+                # 검증에 쓸 앞부분만 bytes로 복사해 두고 매핑은 닫는다. (워커에 pickle 가능)
+                with reader.data(entry) as data:
+                    if entry.zipcrypto:
+                        body_size = entry.csize - 12
+                        entry.enc_data = bytes(data[12:12 + min(body_size, verify_bytes)])
+                        entry.complete = body_size <= verify_bytes
+                    elif entry.encrypted and entry.aes_params:
+                        # AES 데이터: salt(8/12/16) + 비밀번호 검증값(2) + 암호문 + 인증 코드(10)
+                        salt_len = AES_SALT_LENGTHS.get(entry.aes_params[1])
+                        if salt_len:
+                            entry.salt = bytes(data[:salt_len])
+                            entry.pwv = bytes(data[salt_len:salt_len + 2])
+
+        self.zipcrypto_entries = [e for e in self.entries if e.zipcrypto]
+        self.aes_entries = [e for e in self.entries if e.pwv is not None]
+
+    def check(self, password: str | bytes, entry_index: int | None = None) -> bool:
+        '''
+        검증 바이트로 비밀번호 검증 (파일 I/O 없음)
+        - entry_index가 None이면 모든 ZipCrypto 엔트리의 검증 바이트가 맞아야 True
+          엔트리 k개를 모두 통과할 확률은 틀린 비밀번호 기준 1/256^k
+        - AES-Zip, 비암호 엔트리만 있으면 False 반환
+        '''
+        entries = self._select(entry_index)
+        if not entries:
+            return False
+        pwd = password.encode() if isinstance(password, str) else password
+        keys = _init_keys(pwd)
+        for entry in entries:
+            if _decrypt_stream(entry.enc12, list(keys))[-1] != entry.check_byte:
+                return False
+        return True
+
+    def check_batch(self, passwords, entry_index: int | None = None):
+        '''
+        check의 배치 버전 (NumPy bool 마스크 반환)
+        '''
+        # numpy는 배치 검증에서만 필요하므로 여기서 import
+        from zip_crypto_batch import encode_passwords, init_keys_batch, decrypt_header12_batch
+        import numpy as np
+
+        entries = self._select(entry_index)
+        mask = np.full(len(passwords), bool(entries))
+        if not entries or not len(passwords):
+            return mask
+        keys = init_keys_batch(*encode_passwords(passwords))
+        for entry in entries:
+            mask &= decrypt_header12_batch(entry.enc12, *keys)[:, -1] == entry.check_byte
+        return mask
+
+    def verify(self, password: str | bytes) -> bool:
+        '''
+        check + 데이터 앞부분 검증
+        - 모든 ZipCrypto 엔트리의 검증 바이트 확인 후,
+          각 엔트리의 데이터 앞부분(verify_bytes)을 복호화해서 압축 해제해 본다.
+        - 엔트리 전체가 verify_bytes 안에 들어가면 압축 해제 결과의 CRC까지 비교
+        - 전체 추출(pyzipper) 없이 우연히 맞는 경우(1/256)를 대부분 걸러낸다.
+        '''
+        if not self.check(password):
+            return False
+        pwd = password.encode() if isinstance(password, str) else password
+        return all(self._verify_payload(entry, pwd) for entry in self.zipcrypto_entries)
+
+    def _select(self, entry_index: int | None) -> list[ZipEntry]:
+        if entry_index is None:
+            return self.zipcrypto_entries
+        entry = self.entries[entry_index]
+        return [entry] if entry.zipcrypto else []
+
+    def _verify_payload(self, entry: ZipEntry, pwd: bytes) -> bool:
+        keys = _init_keys(pwd)
+        _decrypt_stream(entry.enc12, keys)
+        plain = _decrypt_stream(entry.enc_data, keys)
+
+        if entry.comp == 8:     # DEFLATE
+            d = zlib.decompressobj(-15)
+            try:
+                # 압축 폭탄 방지: 출력 크기 제한
+                out = d.decompress(plain, entry.usize + 1)
+                if entry.complete:
+                    out += d.flush()
+            except zlib.error:
+                return False    # 잘못된 비밀번호로 복호화된 데이터는 대부분 DEFLATE 스트림 오류
+            if not entry.complete:
+                return True
+            if not d.eof:
                 return False
-            
-            # 해제
-            dec12 = _decrypt_header12(enc12, pwd)
-
-            # 검증 바이트 계산(1바이트만 검증, 우연히 맞을 확률 1/256 존재 -> 확실하지 않음)
-            # 검증 바이트: bit3 = 1 - time 상위 8비트(1바이트), bit3 = 0 - CRC의 상위 8비트(1바이트)
-            if flag & 0x0008:
-                check_byte = (time >> 8) & 0xff
-            else:
-                check_byte = (crc32 >> 24) & 0xff
-
-            # print(dec12[-1], check_byte)
-            
-            return dec12[-1] == check_byte
-        
-        return False
\ No newline at end of file
+        elif entry.comp == 0:   # STORE
+            if not entry.complete:
+                return True
+            out = plain
+        else:
+            # bzip2, lzma 등은 여기서 검증하지 않는다.
+            return True
+
+        return len(out) == entry.usize and crc32_slicing_by_8(out) == entry.crc32
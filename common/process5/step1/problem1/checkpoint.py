@@ -0,0 +1,91 @@
+import bisect
+import json
+import os
+
+
+class CheckpointMismatch(ValueError):
+    '''
+    다른 탐색(zip, 후보 옵션, 전체 개수)으로 저장된 체크포인트
+    '''
+
+
+class RangeCheckpoint:
+    '''
+    완료된 인덱스 구간 목록을 파일에 저장/복구하는 체크포인트
+    - 구간은 [lo, hi) 형태로 정렬/병합해서 보관하므로, 순서 없이 끝나는 청크가 많아도 파일이 작다.
+    - key: 탐색 대상(zip 경로, 문자셋, 길이 등) 식별자. 다른 탐색의 체크포인트로 재시작하는 것을 막는다.
+    - save()는 임시 파일에 쓰고 os.replace로 바꿔치기 하므로, 저장 중 종료돼도 이전 파일이 남는다.
+    '''
+    def __init__(self, path: str, limit: int, key: dict | None = None):
+        self.path = path
+        self.limit = limit
+        self.key = key or {}
+        self.lows: list[int] = []
+        self.highs: list[int] = []
+
+    @classmethod
+    def load(cls, path: str, limit: int, key: dict | None = None) -> 'RangeCheckpoint':
+        '''
+        체크포인트 파일 읽기, 파일이 없으면 빈 체크포인트
+        - limit이나 key가 다르면 CheckpointMismatch
+        '''
+        cp = cls(path, limit, key)
+        if not os.path.exists(path):
+            return cp
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('limit') != limit or data.get('key', {}) != cp.key:
+            raise CheckpointMismatch(f'다른 탐색의 체크포인트: {path}')
+        for lo, hi in data['done']:
+            cp.add(lo, hi)
+        return cp
+
+    def add(self, lo: int, hi: int):
+        '''
+        완료 구간 [lo, hi) 추가, 겹치거나 맞닿은 구간과 병합
+        '''
+        if lo >= hi:
+            return
+        # lo 이상에서 시작하는 첫 구간, hi를 넘지 않는 마지막 구간 사이를 하나로 합친다.
+        i = bisect.bisect_left(self.highs, lo)
+        j = bisect.bisect_right(self.lows, hi)
+        if i < j:
+            lo = min(lo, self.lows[i])
+            hi = max(hi, self.highs[j - 1])
+        self.lows[i:j] = [lo]
+        self.highs[i:j] = [hi]
+
+    def done(self) -> int:
+        return sum(hi - lo for lo, hi in zip(self.lows, self.highs))
+
+    def ranges(self) -> list[tuple[int, int]]:
+        return list(zip(self.lows, self.highs))
+
+    def missing(self, start: int = 0) -> list[tuple[int, int]]:
+        '''
+        [start, limit) 중 아직 완료되지 않은 구간 목록
+        '''
+        todo = []
+        pos = start
+        for lo, hi in zip(self.lows, self.highs):
+            if hi <= pos:
+                continue
+            if lo > pos:
+                todo.append((pos, lo))
+            pos = max(pos, hi)
+        if pos < self.limit:
+            todo.append((pos, self.limit))
+        return todo
+
+    def save(self):
+        data = {
+            'limit': self.limit,
+            'key': self.key,
+            'done': [[lo, hi] for lo, hi in zip(self.lows, self.highs)],
+        }
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
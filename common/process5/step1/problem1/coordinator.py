@@ -0,0 +1,467 @@
+'''
+여러 호스트로 나눠 탐색하는 분산 코디네이터 (TCP)
+- 코디네이터는 후보 인덱스 공간을 구간(lease) 단위로 워커에게 빌려준다.
+- 워커는 구간을 처리하는 동안 HEARTBEAT_INTERVAL마다 하트비트를 보내 lease를 연장한다.
+- 하트비트가 LEASE_SECONDS 동안 없거나 연결이 끊기면 lease를 회수해서 다른 워커에게 다시 준다.
+- 완료 구간은 door_hacking과 같은 체크포인트 파일/키로 기록하므로, 로컬 실행과 분산 실행을 오가며 --resume 할 수 있다.
+- 프로토콜: 한 줄에 JSON 하나 (요청 하나에 응답 하나), 비밀번호가 평문으로 오가므로 신뢰하는 네트워크에서만 사용
+  hello -> welcome(source, zip_crc) / lease(size) -> range | wait | stop
+  heartbeat(lease, tried) -> ok | revoked | stop / done(lease, lo, hi) -> ok | ignored
+  found(password) -> ok(처음 찾은 워커) | stop(이미 다른 워커가 찾음) | rejected
+  잘못된 요청 -> error(message)
+- 워커 노드는 zip 파일을 로컬에 갖고 있어야 한다. (내용 CRC로 코디네이터와 같은 파일인지 확인)
+'''
+import argparse
+import bisect
+import itertools
+import json
+import multiprocessing
+import socket
+import socketserver
+import threading
+import time
+import zlib
+
+from candidates import make_generator
+from check_zip_crypto import ZipTarget
+from checkpoint import CheckpointMismatch, RangeCheckpoint
+from range_scheduler import MIN_CHUNK, MAX_CHUNK
+from stop_flag import StopPoller
+from zip_extract import ExtractTooLarge, check_extract_size, read_verified, write_atomic, write_text_atomic
+import door_hacking
+
+DEFAULT_PORT = 5123
+
+# 워커 하트비트 주기와, 하트비트가 없을 때 lease를 회수하기까지의 시간(초)
+HEARTBEAT_INTERVAL = 2.0
+LEASE_SECONDS = 10.0
+
+# 워커가 lease 하나를 처리하는 목표 시간(초), 네트워크 왕복이 끼므로 로컬 청크보다 길게
+LEASE_TARGET_SECONDS = 5.0
+
+# 나눠줄 구간이 없지만 다른 워커의 lease가 남아 있을 때 워커가 다시 물어보는 간격(초)
+WAIT_RETRY = 1.0
+
+# 코디네이터 만료 검사/체크포인트 저장/진행 상황 출력 주기(초)
+TICK = 0.5
+
+# 후보 bytes 인코딩 (iter_range_bytes로 만들고 같은 인코딩으로 한 번만 decode)
+ENCODING = 'utf-8'
+
+
+def file_crc(path: str) -> int:
+    with open(path, 'rb') as f:
+        return zlib.crc32(f.read())
+
+
+class LeaseTable:
+    '''
+    빌려줄 구간(free)과 빌려준 구간(leases)을 관리 (스레드 안전)
+    - free는 시작 인덱스 순으로 정렬해 두고, 앞에서부터 요청 크기만큼 잘라 준다.
+    - 만료되거나 연결이 끊긴 lease의 구간은 free로 돌아가므로 앞쪽 구간이 먼저 다시 나간다.
+    - 완료된 구간은 RangeCheckpoint에 병합
+    '''
+    def __init__(self, checkpoint: RangeCheckpoint, todo: list[tuple[int, int]], lease_seconds: float = LEASE_SECONDS):
+        self.checkpoint = checkpoint
+        self.lease_seconds = lease_seconds
+        self.free = sorted((lo, hi) for lo, hi in todo if lo < hi)
+        # lease id -> [worker, lo, hi, 만료 시각]
+        self.leases: dict[int, list] = {}
+        # 회수된 lease id -> (lo, hi), 늦게 도착한 완료 보고 확인용
+        self.revoked: dict[int, tuple[int, int]] = {}
+        self.ids = itertools.count(1)
+        self.reassigned = 0
+        self.lock = threading.Lock()
+
+    def grant(self, worker: str, size: int) -> tuple[int, int, int] | None:
+        '''
+        -> (lease id, lo, hi), 나눠줄 구간이 없으면 None
+        '''
+        with self.lock:
+            if not self.free:
+                return None
+            lo, hi = self.free[0]
+            end = min(lo + max(size, 1), hi)
+            if end == hi:
+                self.free.pop(0)
+            else:
+                self.free[0] = (end, hi)
+            lease_id = next(self.ids)
+            self.leases[lease_id] = [worker, lo, end, time.monotonic() + self.lease_seconds]
+            return lease_id, lo, end
+
+    def renew(self, lease_id: int) -> bool:
+        '''
+        하트비트: lease 만료 시각 연장, 이미 회수된 lease면 False
+        '''
+        with self.lock:
+            lease = self.leases.get(lease_id)
+            if lease is None:
+                return False
+            lease[3] = time.monotonic() + self.lease_seconds
+            return True
+
+    def complete(self, lease_id: int, lo: int, hi: int) -> bool:
+        '''
+        구간 완료 보고, 받아들였으면 True
+        - 빌려준 구간과 경계가 같을 때만 체크포인트에 넣는다. (모르는 id나 다른 구간은 무시)
+        - 회수된 뒤에 늦게 도착한 완료도 탐색은 끝난 것이므로 체크포인트에 넣는다.
+          (다른 워커에게 다시 나간 구간은 한 번 더 탐색될 뿐이다)
+        '''
+        with self.lock:
+            lease = self.leases.get(lease_id)
+            bounds = (lease[1], lease[2]) if lease is not None else self.revoked.get(lease_id)
+            if bounds != (lo, hi):
+                return False
+            self.leases.pop(lease_id, None)
+            self.revoked.pop(lease_id, None)
+            self.checkpoint.add(lo, hi)
+            return True
+
+    def release_worker(self, worker: str) -> int:
+        '''
+        연결이 끊긴 워커의 lease를 바로 회수, 회수한 개수 반환
+        '''
+        with self.lock:
+            ids = [i for i, lease in self.leases.items() if lease[0] == worker]
+            for i in ids:
+                self._release(i)
+            return len(ids)
+
+    def expire(self) -> int:
+        '''
+        만료 시각이 지난 lease 회수, 회수한 개수 반환
+        '''
+        now = time.monotonic()
+        with self.lock:
+            ids = [i for i, lease in self.leases.items() if lease[3] < now]
+            for i in ids:
+                self._release(i)
+            return len(ids)
+
+    def _release(self, lease_id: int):
+        _, lo, hi, _ = self.leases.pop(lease_id)
+        self.revoked[lease_id] = (lo, hi)
+        bisect.insort(self.free, (lo, hi))
+        self.reassigned += 1
+
+    def finished(self) -> bool:
+        with self.lock:
+            return not self.free and not self.leases
+
+    def save(self):
+        with self.lock:
+            self.checkpoint.save()
+
+    def status(self) -> tuple[int, int, int]:
+        '''
+        -> (완료 개수, 빌려준 lease 수, 재할당 횟수)
+        '''
+        with self.lock:
+            return self.checkpoint.done(), len(self.leases), self.reassigned
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    '''
+    워커 연결 하나: 요청 한 줄을 읽어 Coordinator.handle에 넘기고 응답 한 줄을 쓴다.
+    - 잘못된 요청(JSON 오류, 필드 누락 등)이나 처리 중 예외는 연결을 끊지 않고 error로 응답
+    '''
+    def handle(self):
+        coordinator: Coordinator = self.server.coordinator
+        worker = f'{self.client_address[0]}:{self.client_address[1]}'
+        try:
+            for line in self.rfile:
+                try:
+                    reply = coordinator.handle(worker, json.loads(line))
+                except Exception as e:
+                    reply = {'type': 'error', 'message': f'{e.__class__.__name__}: {e}'}
+                self.wfile.write(json.dumps(reply).encode() + b'\n')
+        except ConnectionError:
+            pass
+        finally:
+            coordinator.disconnected(worker)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class Coordinator:
+    '''
+    lease 테이블을 TCP로 노출하는 코디네이터
+    - run()은 모든 구간이 완료되거나 비밀번호를 찾을 때까지 만료 검사/체크포인트 저장/출력을 반복
+    - 비밀번호 보고는 코디네이터가 가진 zip으로 다시 확인한 뒤에만 받아들인다.
+    '''
+    def __init__(self, zip_path: str, source: dict, host: str = '0.0.0.0', port: int = DEFAULT_PORT,
+                 resume: bool = False, checkpoint_path: str = door_hacking.CHECKPOINT_PATH,
+                 lease_seconds: float = LEASE_SECONDS):
+        self.zip_path = zip_path
+        self.source = source
+        self.zip_crc = file_crc(zip_path)
+        check_extract_size(zip_path)
+        self.limit = len(make_generator(**source))
+
+        key = {'zip': zip_path, **source}
+        if resume:
+            checkpoint = RangeCheckpoint.load(checkpoint_path, self.limit, key)
+        else:
+            checkpoint = RangeCheckpoint(checkpoint_path, self.limit, key)
+        self.table = LeaseTable(checkpoint, checkpoint.missing(), lease_seconds)
+
+        self.password: str | None = None
+        # 여러 핸들러 스레드의 found 보고 중 하나만 결과를 쓰도록
+        self.found_lock = threading.Lock()
+        self.workers: set[str] = set()
+        self.server = _Server((host, port), _Handler)
+        self.server.coordinator = self
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self.server.server_address[:2]
+
+    def handle(self, worker: str, msg: dict) -> dict:
+        kind = msg.get('type')
+        if kind == 'hello':
+            self.workers.add(worker)
+            return {'type': 'welcome', 'worker': worker, 'source': self.source, 'zip_crc': self.zip_crc,
+                    'heartbeat': HEARTBEAT_INTERVAL}
+        if kind == 'found':
+            return self._found(worker, msg['password'])
+        if self.password is not None:
+            return {'type': 'stop'}
+        if kind == 'lease':
+            granted = self.table.grant(worker, int(msg.get('size', MIN_CHUNK)))
+            if granted is not None:
+                lease_id, lo, hi = granted
+                return {'type': 'range', 'lease': lease_id, 'lo': lo, 'hi': hi}
+            if self.table.finished():
+                return {'type': 'stop'}
+            return {'type': 'wait', 'retry': WAIT_RETRY}
+        if kind == 'heartbeat':
+            return {'type': 'ok' if self.table.renew(msg['lease']) else 'revoked'}
+        if kind == 'done':
+            accepted = self.table.complete(msg['lease'], msg['lo'], msg['hi'])
+            return {'type': 'ok' if accepted else 'ignored'}
+        return {'type': 'error', 'message': f'알 수 없는 요청: {kind}'}
+
+    def _found(self, worker: str, password: str) -> dict:
+        try:
+            files = read_verified(self.zip_path, password)
+        except ExtractTooLarge as e:
+            return {'type': 'error', 'message': str(e)}
+        if files is None:
+            return {'type': 'rejected'}
+        with self.found_lock:
+            # 먼저 확정된 보고가 있으면 이 워커는 승자가 아니다.
+            if self.password is not None:
+                return {'type': 'stop'}
+            write_atomic(files, door_hacking.EXTRACT_PATH)
+            write_text_atomic(door_hacking.PASSWORD_PATH, password)
+            self.password = password
+            print(f'\n{worker}: 비밀번호 {password}')
+        return {'type': 'ok'}
+
+    def disconnected(self, worker: str):
+        self.workers.discard(worker)
+        released = self.table.release_worker(worker)
+        if released:
+            print(f'\n{worker} 연결 끊김: lease {released}개 회수')
+
+    def run(self, verbose: bool = True) -> str | None:
+        '''
+        비밀번호를 찾으면 반환, 다 탐색했는데 없으면 None
+        '''
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        started = time.time()
+        start_done = self.table.status()[0]
+        last_saved = started
+        try:
+            while self.password is None and not self.table.finished():
+                time.sleep(TICK)
+                expired = self.table.expire()
+                if expired and verbose:
+                    print(f'\nlease {expired}개 만료: 다른 워커에게 다시 할당')
+                if time.time() - last_saved >= door_hacking.CHECKPOINT_INTERVAL:
+                    self.table.save()
+                    last_saved = time.time()
+                if verbose:
+                    done, leased, reassigned = self.table.status()
+                    rate = (done - start_done) / max(time.time() - started, 1e-9)
+                    print(f'\r{done / self.limit * 100:6.2f}% | {rate:10.0f} tries/s | 워커 {len(self.workers)} | '
+                          f'lease {leased} | 재할당 {reassigned}', end='', flush=True)
+        except KeyboardInterrupt:
+            print('\n코디네이터 종료')
+        finally:
+            self.table.save()
+            # 남은 워커가 stop 응답을 받아갈 시간을 주고 닫는다.
+            deadline = time.time() + door_hacking.TIME_OUT
+            while self.workers and time.time() < deadline:
+                time.sleep(0.1)
+            self.server.shutdown()
+            self.server.server_close()
+            if verbose:
+                print()
+        return self.password
+
+
+class _Connection:
+    '''
+    워커 쪽 연결: 요청을 보내고 응답 한 줄을 받는다.
+    '''
+    def __init__(self, host: str, port: int):
+        self.sock = socket.create_connection((host, port))
+        self.file = self.sock.makefile('rwb')
+
+    def request(self, msg: dict) -> dict:
+        self.file.write(json.dumps(msg).encode() + b'\n')
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError('코디네이터 연결 끊김')
+        return json.loads(line)
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+class _Heartbeat:
+    '''
+    StopPoller에 넘기는 플래그: is_set()이 불릴 때마다 하트비트가 밀렸으면 보내고,
+    코디네이터가 revoked/stop을 돌려주면 True
+    '''
+    def __init__(self, conn: _Connection, lease_id: int, interval: float):
+        self.conn = conn
+        self.lease_id = lease_id
+        self.interval = interval
+        self.last = time.monotonic()
+        self.reply = 'ok'
+
+    def is_set(self) -> bool:
+        if time.monotonic() - self.last >= self.interval:
+            self.reply = self.conn.request({'type': 'heartbeat', 'lease': self.lease_id})['type']
+            self.last = time.monotonic()
+        return self.reply != 'ok'
+
+
+def worker_node(host: str, port: int, zip_path: str) -> str | None:
+    '''
+    워커 하나: 코디네이터에서 lease를 받아 탐색, 찾은 비밀번호 반환
+    - 구간 처리 시간을 재서 다음 lease 크기를 LEASE_TARGET_SECONDS에 맞춘다.
+    - 후보 검사는 door_hacking.unlock_zip과 같은 순서 (prefilter -> 메모리 복호화)
+    '''
+    conn = _Connection(host, port)
+    try:
+        welcome = conn.request({'type': 'hello'})
+        if welcome['zip_crc'] != file_crc(zip_path):
+            raise ValueError(f'코디네이터와 다른 zip 파일: {zip_path}')
+        check_extract_size(zip_path)
+        generator = make_generator(**welcome['source'])
+        prefilter = door_hacking.make_prefilter(ZipTarget(zip_path))
+        interval = welcome['heartbeat']
+
+        size = MIN_CHUNK
+        while True:
+            reply = conn.request({'type': 'lease', 'size': size})
+            if reply['type'] == 'stop':
+                return None
+            if reply['type'] == 'wait':
+                time.sleep(reply['retry'])
+                continue
+
+            lease_id, lo, hi = reply['lease'], reply['lo'], reply['hi']
+            # 하트비트 간격의 절반마다 시간을 확인하도록 StopPoller로 호출 횟수를 조절
+            heartbeat = _Heartbeat(conn, lease_id, interval)
+            poller = StopPoller(heartbeat, max_latency=interval)
+            t0 = time.perf_counter()
+            for password in generator.iter_range_bytes(lo, hi, ENCODING):
+                if poller.tick():
+                    break
+                if prefilter is not None and not prefilter(password):
+                    continue
+                if read_verified(zip_path, password) is not None:
+                    text = password.decode(ENCODING)
+                    verdict = conn.request({'type': 'found', 'password': text})
+                    if verdict['type'] == 'ok':
+                        return text
+                    if verdict['type'] == 'stop':
+                        return None
+                    # rejected/error: 코디네이터가 확인하지 못한 후보, 기록만 하고 계속 탐색
+                    print(f'\n{multiprocessing.current_process().name}: 코디네이터가 받지 않음 '
+                          f'({verdict["type"]}: {verdict.get("message", text)})')
+            else:
+                conn.request({'type': 'done', 'lease': lease_id, 'lo': lo, 'hi': hi})
+                # RangeScheduler와 같은 규칙: 한 번에 2배 이상 바꾸지 않는다.
+                elapsed = time.perf_counter() - t0
+                scaled = size * 2 if elapsed <= 0 else int(size * LEASE_TARGET_SECONDS / elapsed)
+                size = max(MIN_CHUNK, min(MAX_CHUNK, max(size // 2, min(size * 2, scaled))))
+                continue
+            if heartbeat.reply == 'stop':
+                return None
+            # revoked: 이 구간은 다른 워커에게 넘어갔으므로 버리고 새 lease를 받는다.
+    finally:
+        conn.close()
+
+
+def _worker_process(host: str, port: int, zip_path: str):
+    try:
+        password = worker_node(host, port, zip_path)
+    except (ConnectionError, KeyboardInterrupt):
+        return
+    except ExtractTooLarge as e:
+        print(f'\n{multiprocessing.current_process().name}: [ERROR] {e}')
+        return
+    if password is not None:
+        print(f'\n{multiprocessing.current_process().name}: 비밀번호 {password}')
+
+
+def run_workers(host: str, port: int, zip_path: str, procs: int):
+    '''
+    이 호스트에서 워커 프로세스 procs개 실행 (프로세스마다 연결 하나)
+    '''
+    ctx = multiprocessing.get_context('spawn')
+    processes = [ctx.Process(target=_worker_process, args=(host, port, zip_path)) for _ in range(procs)]
+    for p in processes:
+        p.start()
+    try:
+        for p in processes:
+            p.join()
+    except KeyboardInterrupt:
+        for p in processes:
+            p.terminate()
+        for p in processes:
+            p.join()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='분산 ZIP 비밀번호 탐색')
+    sub = parser.add_subparsers(dest='mode', required=True)
+
+    serve = sub.add_parser('serve', help='코디네이터 실행')
+    serve.add_argument('--zip', default=door_hacking.ZIP_PATH)
+    serve.add_argument('--host', default='0.0.0.0')
+    serve.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve.add_argument('--resume', action='store_true', help='체크포인트의 완료 구간을 건너뛰고 이어서 탐색')
+    door_hacking.add_source_arguments(serve)
+
+    work = sub.add_parser('work', help='워커 노드 실행')
+    work.add_argument('--zip', default=door_hacking.ZIP_PATH)
+    work.add_argument('--host', default='127.0.0.1')
+    work.add_argument('--port', type=int, default=DEFAULT_PORT)
+    work.add_argument('--procs', type=int, default=multiprocessing.cpu_count(), help='워커 프로세스 수')
+    args = parser.parse_args()
+
+    if args.mode == 'serve':
+        try:
+            coordinator = Coordinator(args.zip, door_hacking.source_from_args(args), args.host, args.port, args.resume)
+        except ExtractTooLarge as e:
+            parser.error(str(e))
+        except CheckpointMismatch as e:
+            parser.error(f'{e} (다른 옵션으로 저장됨, --resume을 빼고 새로 시작하거나 체크포인트 파일을 지우세요)')
+        print(f'코디네이터: {coordinator.address[0]}:{coordinator.address[1]}, 후보 {coordinator.limit}개')
+        found = coordinator.run()
+        print(f'비밀번호: {found}' if found else '비밀번호를 찾지 못함')
+    else:
+        run_workers(args.host, args.port, args.zip, args.procs)
@@ -1,13 +1,24 @@
 import zlib
 import random
 import os
+import multiprocessing
+from array import array
 
 # 다항식 (ZIP/PNG 표준)
 POLY = 0xEDB88320
 
 MASK_32 = 0xFFFFFFFF
 
-CRC_TABLE = None
+# 테이블 개수 (slicing-by-16까지)
+TABLE_COUNT = 16
+TABLE_SIZE = 256
+
+# 미리 만든 테이블 blob 파일 경로 (환경 변수로 지정하면 import 시 zlib 대신 blob에서 읽는다)
+TABLES_BLOB_ENV = 'CRC32_TABLES_BLOB'
+
+# 병렬 파일 체크섬: 프로세스 하나가 맡는 구간 크기, 구간 안에서 한 번에 읽는 크기
+FILE_CHUNK_SIZE = 64 * 1024 * 1024
+READ_SIZE = 1024 * 1024
 
 def crc32_bitwise(data: bytes, crc: int = 0) -> int:
     '''비트 단위 CRC32 (가장 단순한 구현, 매 바이트당 8번 루프하므로 느리다.)'''
@@ -44,29 +55,89 @@ def _make_crc_table():
             else:
                 crc = (crc >> 1) & MASK_32
         table.append(crc & MASK_32)
-    global CRC_TABLE
-    CRC_TABLE = table
     return table
 
 
-def _make_crc_table_8():
-    '''slicing-by-8용 8개 테이블 생성'''
-    if CRC_TABLE is None:
-        crc_table = _make_crc_table()
-    T = [crc_table]
-    for k in range(1, 8):
-        Tk = [0] * 256
-        for i in range(256):
-            prev = T[k - 1][i]
-            Tk[i] = (crc_table[prev & 0xFF] ^ (prev >> 8)) & MASK_32
-        T.append(Tk)
-    global CRC_TABLE_8
-    CRC_TABLE_8 = T
-    global T0, T1, T2, T3, T4, T5, T6, T7
-    T0, T1, T2, T3, T4, T5, T6, T7 = T
+def _make_crc_table_n(count: int) -> list[list[int]]:
+    '''
+    slicing-by-N용 N개 테이블 생성 (참고 구현, 파이썬 루프)
+    - T[k][i]: 바이트 i 뒤에 0 바이트가 k개 더 들어왔을 때의 CRC
+    '''
+    base = _make_crc_table()
+    T = [base]
+    for k in range(1, count):
+        prev = T[k - 1]
+        T.append([(base[p & 0xFF] ^ (p >> 8)) & MASK_32 for p in prev])
     return T
 
 
+def _make_crc_table_8():
+    '''slicing-by-8용 8개 테이블 생성 (참고 구현)'''
+    return _make_crc_table_n(8)
+
+
+def _make_crc_table_16():
+    '''slicing-by-16용 16개 테이블 생성 (참고 구현)'''
+    return _make_crc_table_n(16)
+
+
+def _build_tables_zlib(count: int = TABLE_COUNT) -> array:
+    '''
+    zlib(C 구현)으로 테이블 생성 -> 길이 count * 256의 array('I')
+    - zlib.crc32(data, 0xFFFFFFFF) ^ 0xFFFFFFFF는 처음/끝 XOR이 상쇄되어
+      0에서 시작한 "날것"의 CRC 레지스터 값이 된다.
+    - T[k][i] = 바이트 i + 0 바이트 k개의 날것 CRC
+    - 파이썬 비트 루프 없이 zlib 호출 4096번 (1ms 안팎)
+    '''
+    zeros = bytes(count)
+    return array('I', [
+        zlib.crc32(bytes((i,)) + zeros[:k], MASK_32) ^ MASK_32
+        for k in range(count) for i in range(TABLE_SIZE)
+    ])
+
+
+def tables_blob() -> bytes:
+    '''
+    현재 테이블을 packed array('I') blob으로 (파일로 저장해서 TABLES_BLOB_ENV로 재사용)
+    '''
+    return array('I', [v for table in CRC_TABLE_16 for v in table]).tobytes()
+
+
+def _tables_from_blob(blob: bytes) -> array:
+    packed = array('I')
+    packed.frombytes(blob)
+    if len(packed) != TABLE_COUNT * TABLE_SIZE:
+        raise ValueError(f'CRC 테이블 blob 크기 오류: {len(blob)} bytes')
+    # 간단한 무결성 확인: T0[1], 마지막 테이블 마지막 값만 zlib으로 계산 (전체 테이블은 만들지 않는다)
+    first = zlib.crc32(b'\x01', MASK_32) ^ MASK_32
+    last = zlib.crc32(b'\xff' + bytes(TABLE_COUNT - 1), MASK_32) ^ MASK_32
+    if packed[1] != first or packed[-1] != last:
+        raise ValueError('CRC 테이블 blob 값 오류')
+    return packed
+
+
+def _load_tables() -> tuple[tuple[int, ...], ...]:
+    '''
+    import 시 한 번만 실행되는 테이블 저장소
+    - 모듈 import는 import 락 안에서 한 번만 실행되므로, 여러 스레드가 동시에 호출해도
+      테이블이 반쯤 만들어진 상태를 볼 일이 없다.
+    - 튜플(불변)로 보관해서 이후에도 누구도 고칠 수 없다.
+    '''
+    path = os.environ.get(TABLES_BLOB_ENV)
+    if path:
+        with open(path, 'rb') as f:
+            packed = _tables_from_blob(f.read())
+    else:
+        packed = _build_tables_zlib(TABLE_COUNT)
+    return tuple(tuple(packed[k * TABLE_SIZE:(k + 1) * TABLE_SIZE]) for k in range(TABLE_COUNT))
+
+
+CRC_TABLE_16 = _load_tables()
+CRC_TABLE_8 = CRC_TABLE_16[:8]
+CRC_TABLE = CRC_TABLE_16[0]
+T0, T1, T2, T3, T4, T5, T6, T7 = CRC_TABLE_8
+
+
 def crc32_table(data: bytes, crc: int = 0, zlib: bool = True) -> int:
     '''
     테이블 기반 CRC32 (빠르다)
@@ -83,8 +154,6 @@ def crc32_table(data: bytes, crc: int = 0, zlib: bool = True) -> int:
     # CRC_TABLE[...]: 인덱스를 사용해서 CRC 보정값을 테이블에서 가져온다
     # crc >> 8: CRC를 8비트 오른쪽 시프트 - CRC가 한 바이트 처리된 것과 같은 효과
     # 마지막 ^ 연산: 시프트한 CRC 상위 24비트와 보정값을 XOR -> 새로운 CRC 생성
-    if CRC_TABLE is None:
-        _make_crc_table()
     if zlib:
         crc = (crc ^ MASK_32) & MASK_32
     for b in data:
@@ -102,9 +171,6 @@ def crc32_slicing_by_8(data: bytes, crc: int = 0, zlib: bool = True) -> int:
     zlib에서는 처음과 끝에 crc에 XOR 연산을 하는데, ZipCrypto에서 crc를 사용해서 key를 만들 때는 crc를 그대로 사용한다.
     그래서 zlib을 False로 주면 ZipCrypto에서 key를 만들 때, crc를 XOR연산 없이 그대로 사용할 수 있다.
     '''
-    if CRC_TABLE is None:
-        _make_crc_table_8()
-
     if zlib:
         crc = (crc ^ MASK_32) & MASK_32
     n = len(data)
@@ -139,9 +205,175 @@ def crc32_slicing_by_8(data: bytes, crc: int = 0, zlib: bool = True) -> int:
     return crc
 
 
+def crc32_slicing_by_16(data: bytes, crc: int = 0, zlib: bool = True) -> int:
+    '''
+    slicing-by-16 CRC-32
+    - slicing-by-8과 같은 방식으로 16바이트씩 처리 (테이블 16개, 루프 횟수 절반)
+    - zlib 인자는 crc32_slicing_by_8과 같다.
+    '''
+    (S0, S1, S2, S3, S4, S5, S6, S7,
+     S8, S9, S10, S11, S12, S13, S14, S15) = CRC_TABLE_16
+
+    if zlib:
+        crc = (crc ^ MASK_32) & MASK_32
+    n = len(data)
+    i = 0
+
+    # 16바이트 정렬
+    while n - i >= 16:
+        (b0, b1, b2, b3, b4, b5, b6, b7,
+         b8, b9, b10, b11, b12, b13, b14, b15) = data[i:i + 16]
+        crc = (S15[(crc ^ b0) & 0xFF] ^
+               S14[((crc >> 8) ^ b1) & 0xFF] ^
+               S13[((crc >> 16) ^ b2) & 0xFF] ^
+               S12[((crc >> 24) ^ b3) & 0xFF] ^
+               S11[b4] ^ S10[b5] ^ S9[b6] ^ S8[b7] ^
+               S7[b8] ^ S6[b9] ^ S5[b10] ^ S4[b11] ^
+               S3[b12] ^ S2[b13] ^ S1[b14] ^ S0[b15])
+        i += 16
+
+    # 남은 바이트 처리 (table-driven)
+    while i < n:
+        crc = S0[(crc ^ data[i]) & 0xFF] ^ (crc >> 8)
+        i += 1
+
+    if zlib:
+        return (crc ^ MASK_32) & MASK_32
+    return crc
+
+
+def crc32_numpy_batch(buffers, crc: int = 0, zlib: bool = True):
+    '''
+    길이가 같은 버퍼 여러 개의 CRC-32를 한 번에 계산 (NumPy)
+    - buffers: 같은 길이 bytes 목록 또는 (B, L) uint8 배열
+    - 바이트 위치(열)마다 B개 CRC를 배열 연산 한 번으로 갱신 -> 파이썬 루프는 L번
+    - 짧은 버퍼를 아주 많이 검사할 때 유리 (예: 후보 비밀번호로 복호화한 데이터 앞부분)
+    - 반환: 길이 B의 uint32 배열
+    '''
+    # numpy는 배치 엔진에서만 필요하므로 여기서 import
+    import numpy as np
+
+    table = np.array(CRC_TABLE, dtype=np.uint32)
+
+    if isinstance(buffers, np.ndarray):
+        mat = buffers.astype(np.uint8, copy=False)
+    else:
+        buffers = list(buffers)
+        width = len(buffers[0]) if buffers else 0
+        if any(len(b) != width for b in buffers):
+            raise ValueError('crc32_numpy_batch: 버퍼 길이가 모두 같아야 함')
+        mat = np.frombuffer(b''.join(buffers), dtype=np.uint8).reshape(len(buffers), width)
+
+    c = np.full(mat.shape[0], crc, dtype=np.uint32)
+    if zlib:
+        c ^= np.uint32(MASK_32)
+    for j in range(mat.shape[1]):
+        c = table[(c ^ mat[:, j]) & np.uint32(0xFF)] ^ (c >> np.uint32(8))
+    if zlib:
+        c ^= np.uint32(MASK_32)
+    return c
+
+
+def _gf2_matrix_times(mat: list[int], vec: int) -> int:
+    '''GF(2) 32x32 행렬(열 32개) x 벡터'''
+    s = 0
+    i = 0
+    while vec:
+        if vec & 1:
+            s ^= mat[i]
+        vec >>= 1
+        i += 1
+    return s
+
+
+def _gf2_matrix_square(mat: list[int]) -> list[int]:
+    '''GF(2) 행렬 제곱: 연산자를 두 번 적용한 것과 같은 행렬'''
+    return [_gf2_matrix_times(mat, mat[n]) for n in range(32)]
+
+
+def crc32_combine(crc1: int, crc2: int, len2: int) -> int:
+    '''
+    crc32(A)와 crc32(B), len(B)만으로 crc32(A + B) 계산 (zlib crc32_combine과 동일)
+    - CRC는 GF(2) 위의 선형 연산이므로, "0 바이트 len2개를 더 넣는 연산"을 행렬로 만들어
+      crc1에 적용한 뒤 crc2와 XOR하면 된다.
+    - 0 비트 1개 연산자 행렬을 반복 제곱해서 len2의 비트마다 적용 -> O(log len2)
+    '''
+    if len2 <= 0:
+        return crc1
+
+    # odd: 0 비트 1개를 넣는 연산자 (CRC 레지스터 1비트 시프트 + 다항식 보정)
+    odd = [POLY] + [1 << n for n in range(31)]
+    even = _gf2_matrix_square(odd)  # 0 비트 2개
+    odd = _gf2_matrix_square(even)  # 0 비트 4개
+
+    # 처음 제곱하면 0 비트 8개(= 1바이트), 이후 len2의 비트마다 2배씩
+    while True:
+        even = _gf2_matrix_square(odd)
+        if len2 & 1:
+            crc1 = _gf2_matrix_times(even, crc1)
+        len2 >>= 1
+        if not len2:
+            break
+        odd = _gf2_matrix_square(even)
+        if len2 & 1:
+            crc1 = _gf2_matrix_times(odd, crc1)
+        len2 >>= 1
+        if not len2:
+            break
+
+    return (crc1 ^ crc2) & MASK_32
+
+
+def _file_chunk_crc(args: tuple[str, int, int]) -> tuple[int, int]:
+    '''
+    (워커) 파일의 [offset, offset + length) 구간 CRC 계산 -> (crc, 실제 읽은 길이)
+    - 데이터는 워커가 직접 읽으므로 프로세스 간에는 경로와 위치만 전달된다.
+    '''
+    path, offset, length = args
+    crc = 0
+    done = 0
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while done < length:
+            block = f.read(min(READ_SIZE, length - done))
+            if not block:
+                break
+            crc = zlib.crc32(block, crc)
+            done += len(block)
+    return crc & MASK_32, done
+
+
+def crc32_file_parallel(path: str, chunk_size: int = FILE_CHUNK_SIZE, processes: int | None = None) -> int:
+    '''
+    큰 파일의 CRC-32를 여러 프로세스로 나눠 계산
+    - 파일을 chunk_size 구간으로 나누고, 구간별 CRC를 프로세스 풀에서 계산
+    - 구간 CRC들을 순서대로 crc32_combine으로 합친다.
+    - 결과는 zlib.crc32(파일 전체)와 같다.
+    '''
+    size = os.path.getsize(path)
+    tasks = [(path, offset, min(chunk_size, size - offset)) for offset in range(0, size, chunk_size)]
+    if len(tasks) <= 1 or processes == 1:
+        results = map(_file_chunk_crc, tasks)
+        return _combine_chunks(results)
+
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Pool(processes=processes or ctx.cpu_count()) as pool:
+        # imap은 순서를 유지하므로 앞 구간부터 차례로 합칠 수 있다.
+        return _combine_chunks(pool.imap(_file_chunk_crc, tasks))
+
+
+def _combine_chunks(results) -> int:
+    crc = 0
+    for chunk_crc, length in results:
+        crc = crc32_combine(crc, chunk_crc, length)
+    return crc
+
+
 if __name__ == '__main__':
-    # 테이블 생성
-    _make_crc_table_8()
+    # zlib으로 만든 테이블이 비트 단위 참고 구현과 같은지 확인
+    assert [list(t) for t in CRC_TABLE_16] == _make_crc_table_16()
+    assert _tables_from_blob(tables_blob()).tolist() == [v for t in CRC_TABLE_16 for v in t]
+    print('table tests: OK')
 
     # 고정 벡터
     for s in [b'', b'hello', b'hello world', b'\x00' * 31 + b'\xff' * 97]:
@@ -151,7 +383,8 @@ if __name__ == '__main__':
         a = crc32_table(s)
         b = crc32_slicing_by_8(s)
         c = zlib.crc32(s) & MASK_32
-        assert a == b == c, (a, b, c)
+        d = crc32_slicing_by_16(s)
+        assert a == b == c == d, (a, b, c, d)
     print('fixed tests: OK')
 
     # 랜덤
@@ -160,9 +393,15 @@ if __name__ == '__main__':
         s = os.urandom(rnd.randrange(0, 50_000))    # 랜덤 길이의 난수 바이트 열 생성
         a = crc32_slicing_by_8(s)
         b = zlib.crc32(s) & MASK_32
-        assert a == b
+        c = crc32_slicing_by_16(s)
+        assert a == b == c
     print('random tests: OK')
 
+    # NumPy 배치: 같은 길이 버퍼 여러 개
+    bufs = [os.urandom(37) for _ in range(100)]
+    assert crc32_numpy_batch(bufs).tolist() == [zlib.crc32(b) & MASK_32 for b in bufs]
+    print('numpy batch tests: OK')
+
     # 스트리밍(누적), 한 번에 계산한 값과, 2번 계산한 결과가 같은지 확인
     s = os.urandom(100_000)
     one = crc32_slicing_by_8(s)
@@ -170,4 +409,31 @@ if __name__ == '__main__':
     acc = crc32_slicing_by_8(s[:mid], 0)
     acc = crc32_slicing_by_8(s[mid:], acc)
     assert one == acc == (zlib.crc32(s) & MASK_32)
-    print('streaming tests: OK')
\ No newline at end of file
+    print('streaming tests: OK')
+
+    # combine: 두 구간 CRC를 합친 값이 전체 CRC와 같은지 확인
+    for _ in range(50):
+        a = os.urandom(rnd.randrange(0, 5_000))
+        b = os.urandom(rnd.randrange(0, 5_000))
+        assert crc32_combine(zlib.crc32(a), zlib.crc32(b), len(b)) == (zlib.crc32(a + b) & MASK_32)
+    print('combine tests: OK')
+
+    # 병렬 파일 체크섬
+    import tempfile
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+        data = os.urandom(3_000_000)
+        f.write(data)
+    try:
+        assert crc32_file_parallel(f.name, chunk_size=700_000) == (zlib.crc32(data) & MASK_32)
+    finally:
+        os.remove(f.name)
+    print('parallel file tests: OK')
+
+    # 여러 스레드가 동시에 호출해도 같은 결과
+    from concurrent.futures import ThreadPoolExecutor
+    s = os.urandom(200_000)
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        fns = [crc32_table, crc32_slicing_by_8, crc32_slicing_by_16] * 4
+        results = list(ex.map(lambda fn: fn(s), fns))
+    assert set(results) == {zlib.crc32(s) & MASK_32}
+    print('thread tests: OK')
@@ -0,0 +1,109 @@
+import argparse
+import os
+import time
+import zlib
+
+from crc32 import (MASK_32, crc32_bitwise, crc32_table, crc32_slicing_by_8, crc32_slicing_by_16,
+                   crc32_numpy_batch)
+
+# 버퍼 크기(바이트)
+SIZES = [16, 64, 1024, 16 * 1024, 256 * 1024]
+
+# 엔진 하나, 크기 하나당 최소 측정 시간(초)
+MIN_SECONDS = 0.2
+
+# 느린 엔진은 큰 버퍼에서 너무 오래 걸리므로 크기 상한
+MAX_SIZE = {
+    'bitwise': 16 * 1024,
+    'table': 256 * 1024,
+}
+
+# NumPy 배치 엔진이 한 번에 처리하는 버퍼 개수
+NUMPY_BATCH = 4096
+
+
+def _single(fn):
+    '''
+    버퍼 하나씩 처리하는 엔진 -> (측정 함수, 1회 처리 바이트)
+    '''
+    def make(size):
+        data = os.urandom(size)
+        return (lambda: fn(data)), size
+    return make
+
+
+def _numpy_batch(size):
+    # 같은 길이 버퍼 NUMPY_BATCH개를 한 번에 (총 바이트가 너무 커지지 않게 조절)
+    count = max(1, min(NUMPY_BATCH, (8 << 20) // max(size, 1)))
+    bufs = [os.urandom(size) for _ in range(count)]
+    return (lambda: crc32_numpy_batch(bufs)), size * count
+
+
+ENGINES = {
+    'bitwise': _single(crc32_bitwise),
+    'table': _single(crc32_table),
+    'slicing8': _single(crc32_slicing_by_8),
+    'slicing16': _single(crc32_slicing_by_16),
+    'numpy_batch': _numpy_batch,
+    'zlib': _single(lambda data: zlib.crc32(data) & MASK_32),
+}
+
+
+def measure(make, size: int, min_seconds: float = MIN_SECONDS) -> float:
+    '''
+    엔진 하나를 min_seconds 이상 반복 실행해서 처리량(MB/s) 반환
+    '''
+    fn, nbytes = make(size)
+    fn()    # 워밍업 (테이블 생성 등)
+    runs = 0
+    t0 = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_seconds:
+        fn()
+        runs += 1
+        elapsed = time.perf_counter() - t0
+    return nbytes * runs / elapsed / 1e6
+
+
+def benchmark(engines: list[str], sizes: list[int], min_seconds: float = MIN_SECONDS) -> dict[str, dict[int, float | None]]:
+    '''
+    엔진 x 버퍼 크기별 MB/s 표 (측정하지 않은 칸은 None)
+    '''
+    results = {}
+    for name in engines:
+        results[name] = {}
+        for size in sizes:
+            if size > MAX_SIZE.get(name, size):
+                results[name][size] = None
+                continue
+            results[name][size] = measure(ENGINES[name], size, min_seconds)
+    return results
+
+
+def print_results(results: dict[str, dict[int, float | None]], sizes: list[int]):
+    print(f'{"engine":15s}' + ''.join(f'{str(s) + "B":>14s}' for s in sizes))
+    for name, row in results.items():
+        cells = ''.join(f'{"-":>14s}' if row[s] is None else f'{row[s]:14.2f}' for s in sizes)
+        print(f'{name:15s}{cells}')
+
+    # 크기별 가장 빠른 파이썬 엔진 (zlib은 C 구현 기준선이므로 제외)
+    print('\nBest pure-Python/NumPy engine per size (MB/s, x zlib):')
+    for s in sizes:
+        candidates = [(row[s], name) for name, row in results.items() if name != 'zlib' and row[s] is not None]
+        if not candidates:
+            continue
+        best, name = max(candidates)
+        base = results.get('zlib', {}).get(s)
+        ratio = f' ({best / base:.4f}x zlib)' if base else ''
+        print(f'{str(s) + "B":>10s}: {name} {best:.2f}{ratio}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='CRC-32 엔진별 처리량(MB/s) 비교')
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument('--sizes', nargs='+', type=int, default=SIZES)
+    parser.add_argument('--seconds', type=float, default=MIN_SECONDS, help='측정 최소 시간(초)')
+    args = parser.parse_args()
+
+    results = benchmark(args.engines, args.sizes, args.seconds)
+    print_results(results, args.sizes)
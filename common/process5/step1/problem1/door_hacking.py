@@ -1,155 +1,304 @@
 from __future__ import annotations
 
 # from zipfile import ZipFile, BadZipFile
-import pyzipper
-import zlib
+import argparse
+import sys
 import time
-from datetime import datetime
 import multiprocessing
-from multiprocessing.synchronize import Event as EventClass
-from multiprocessing.sharedctypes import Synchronized
-from multiprocessing import Process, Value
+from multiprocessing import Process
+
+from range_scheduler import RangeScheduler
+from checkpoint import CheckpointMismatch, RangeCheckpoint
+from candidates import CandidateGenerator, make_generator
+from check_zip_crypto import ZipTarget
+from aes_zip_verify import AesZipVerifier
+from zip_extract import ExtractTooLarge, check_extract_size, read_verified, write_atomic, write_text_atomic
+from telemetry import WorkerMetrics, TelemetryAggregator, TelemetryPrinter
+from stop_flag import StopFlag
+from auto_tuner import load_tuning
+from budget import PREDICT_AFTER, source_spans, predict, format_prediction
 
 ZIP_PATH = 'emergency_storage_key.zip'
 # ZIP_PATH = 'test.zip'
 EXTRACT_PATH = 'extract'
 PASSWORD_PATH = 'password.txt'
-PASSWORD_LENGTH = 6
 TEST_PASSWORD = 'aaaaaa'
 
 DIGITS = '0123456789'
 LOW_ALPHA = 'abcdefghijklmnopqrstuvwxyz'
 
-CHARSET = DIGITS + LOW_ALPHA
-
-POW = [len(CHARSET) ** p for p in range(PASSWORD_LENGTH - 1, -1, -1)]
-
-LIMIT = len(CHARSET) ** PASSWORD_LENGTH
+# 기본 후보: 숫자 + 소문자 6자리 (?1 = 사용자 정의 문자셋 1)
+DEFAULT_MASK = '?1' * 6
+DEFAULT_CHARSET1 = DIGITS + LOW_ALPHA
 
 TIME_OUT = 3
 
-def make_password(count: int, length: int) -> str:
-    password = []
-    rem = count
-    for p in range(length):
-        digit, rem = divmod(rem, POW[p])
-        password.append(CHARSET[digit])
-    return ''.join(password)
-
-
-def unlock_zip(count: Synchronized[int], stop_event: EventClass):
+# 재시작 위치: 이전 실행 종료 시 출력된 재시작 위치를 넣으면 그 앞 구간은 건너뛴다.
+START_INDEX = 0
+
+# 완료 구간 체크포인트 파일과 저장 주기(초)
+CHECKPOINT_PATH = 'checkpoint.json'
+CHECKPOINT_INTERVAL = 10
+
+# 진행 상황 출력 주기(초), 출력 형식(dashboard: 한 줄 갱신, json: JSON Lines, none: 출력 안 함)
+TELEMETRY_INTERVAL = 1
+TELEMETRY_MODES = ('dashboard', 'json', 'none')
+
+
+def try_password(password: str) -> bool:
+    '''
+    후보를 메모리에서만 복호화해서 CRC까지 확인
+    - 틀린 비밀번호는 디스크에 아무것도 남기지 않는다.
+    - 맞으면 EXTRACT_PATH, PASSWORD_PATH에 한 번만 원자적으로 쓴다.
+    '''
+    files = read_verified(ZIP_PATH, password)
+    if files is None:
+        return False
+
+    write_atomic(files, EXTRACT_PATH)
+    write_text_atomic(PASSWORD_PATH, password)
+    return True
+
+
+def make_prefilter(target: ZipTarget):
+    '''
+    pyzipper로 추출하기 전에 틀린 비밀번호를 걸러내는 검사 함수
+    - ZipCrypto: 모든 엔트리 검증 바이트 + 데이터 앞부분 CRC/압축 해제 확인
+    - AES: salt로 PBKDF2 키 유도 후 2바이트 검증값 비교
+    - 둘 다 아니면 None (모든 후보를 추출로 확인)
+    '''
+    if target.zipcrypto_entries:
+        return target.verify
+    if target.aes_entries:
+        return AesZipVerifier(target).check
+    return None
+
+
+def log(message: str, telemetry: str = 'dashboard'):
+    '''
+    사람이 읽는 알림 출력
+    - json 모드에서는 표준 출력이 JSON Lines 스트림이므로 표준 에러로 보낸다.
+    '''
+    print(message, file=sys.stderr if telemetry == 'json' else sys.stdout, flush=True)
+
+
+def unlock_zip(generator: CandidateGenerator, scheduler: RangeScheduler, metrics: WorkerMetrics, worker_id: int, stop_flag: StopFlag,
+               telemetry: str = 'dashboard'):
     start_time = time.time()
-    last_report = start_time
-    started_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     repeat = 0
+    password = b''
+    found = False
 
-    try:
-        while count.value < LIMIT:
-            if stop_event.is_set():
-                raise KeyboardInterrupt()
-            
-            with count.get_lock():
-                count.value += 1
-                repeat = count.value - 1
+    # 헤더는 워커마다 한 번만 읽고, 검사를 통과한 후보만 실제 추출
+    prefilter = make_prefilter(ZipTarget(ZIP_PATH))
+    # 다른 워커가 찾으면 청크 끝까지 기다리지 않고 MAX_STOP_LATENCY 안에 멈춘다.
+    poller = stop_flag.poller()
+    stopped = False
 
-            password = make_password(repeat, PASSWORD_LENGTH)
-
-
-                
-            # test
-            # if password == TEST_PASSWORD:
-            #     break
-
-            now = time.time()
-            if now - last_report >= 1:
-                elasped = now - start_time
-                print(f'{multiprocessing.current_process().name}, 시작 시간: {started_at} | 진행 시간: {elasped:8.2f}s | 반복 횟수: {repeat:12d} | 비밀번호: {password:6s}')
-                last_report = now
+    try:
+        # 공유 카운터를 비밀번호마다 증가시키지 않고, 연속 구간(청크) 단위로 받아온다.
+        for lo, hi in scheduler.ranges(worker_id, stop_flag):
+            # 후보를 bytes로 바로 받아 검사 (마스크는 bytearray 주행거리계, str 생성/encode 없음)
+            for repeat, password in enumerate(generator.iter_range_bytes(lo, hi), lo):
+                # test
+                # if password == TEST_PASSWORD:
+                #     break
+
+                if poller.tick():
+                    stopped = True
+                    break
+                if prefilter is not None and not prefilter(password):
+                    continue
+                if try_password(password.decode()):
+                    found = True
+                    stop_flag.set()
+                    break
+
+            # 진행 상황은 출력하지 않고 공유 메모리 카운터에만 청크 단위로 기록 (출력은 부모가 모아서)
+            if found:
+                tried = repeat - lo + 1
+            elif stopped:
+                # 중단된 후보(repeat)는 검사하지 않았다.
+                tried = repeat - lo
+            else:
+                tried = hi - lo
+            metrics.report(worker_id, tried)
+            if found or stopped:
+                break
+    except KeyboardInterrupt:
+        log(f'{multiprocessing.current_process()}시스템 종료', telemetry)
+        return
+    except ExtractTooLarge as e:
+        # 어떤 후보로도 확인할 수 없으므로 다른 워커도 멈춘다.
+        log(f'\n[ERROR]: {e}', telemetry)
+        stop_flag.set()
+        return
 
+    if found:
+        total_elasped = time.time() - start_time
+        log(f'\n{multiprocessing.current_process()} 종료: 반복횟수: {repeat}, 진행 시간: {total_elasped:.2f}, 비밀번호: {password.decode()}', telemetry)
 
-            try:
-                with pyzipper.AESZipFile(ZIP_PATH) as zf:
-                    zf.pwd = password.encode('utf-8')
-                    zf.extractall(EXTRACT_PATH)
 
-                with open(PASSWORD_PATH, 'w', encoding='utf-8') as f:
-                    f.write(password)
+def print_summary(scheduler: RangeScheduler, elapsed: float, telemetry: str = 'dashboard'):
+    log(f'전체 처리량: {scheduler.throughput(elapsed):.0f} tries/s | 처리 개수: {scheduler.processed()} | 재시작 위치(START_INDEX): {scheduler.checkpoint()}', telemetry)
 
-                stop_event.set()
 
-                break
-            except (RuntimeError, pyzipper.BadZipFile, zlib.error):
-                continue
-            except KeyboardInterrupt:
-                raise KeyboardInterrupt()
-    except KeyboardInterrupt:
-        print(f'{multiprocessing.current_process()}시스템 종료')
-        return
+def load_checkpoint(resume: bool, limit: int, source: dict) -> RangeCheckpoint:
+    '''
+    --resume이면 체크포인트 파일에서 완료 구간을 읽고, 아니면 빈 체크포인트로 새로 시작
+    - source: 후보 생성 옵션, 다른 후보로 만든 체크포인트로 재시작하지 않도록 키에 포함
+    '''
+    key = {'zip': ZIP_PATH, **source}
+    if resume:
+        return RangeCheckpoint.load(CHECKPOINT_PATH, limit, key)
+    return RangeCheckpoint(CHECKPOINT_PATH, limit, key)
 
-    total_elasped = time.time() - start_time
-    print(f'\n{multiprocessing.current_process()} 종료: 반복횟수: {repeat}, 진행 시간: {total_elasped:.2f}, 비밀번호: {password}')
 
+def save_checkpoint(checkpoint: RangeCheckpoint, scheduler: RangeScheduler):
+    for lo, hi in scheduler.drain():
+        checkpoint.add(lo, hi)
+    checkpoint.save()
 
-def multi_process(stop_process_event: EventClass):
-    num_cores = multiprocessing.cpu_count()
 
+def multi_process(ctx, generator: CandidateGenerator, scheduler: RangeScheduler, metrics: WorkerMetrics,
+                  stop_flag: StopFlag, num_cores: int, telemetry: str = 'dashboard'):
     processes: list[Process] = []
-    count: Synchronized[int] = Value('i', 0)
     for i in range(num_cores):
-        p = multiprocessing.Process(target=unlock_zip, args=(count, stop_process_event,))
+        p = ctx.Process(target=unlock_zip, args=(generator, scheduler, metrics, i, stop_flag, telemetry))
         processes.append(p)
         p.start()
 
     return processes
 
 
-def main():
-    try:
-        # unlock_zip()
+def main(source: dict, resume: bool = False, telemetry: str = 'dashboard', budget: float | None = None):
+    '''
+    - budget: 탐색 시간 예산(초), 처리량을 측정해 예산 안에 찾을 확률을 예측하고,
+      예산이 끝나면 체크포인트를 저장하고 멈춘다. (--resume으로 이어서 탐색)
+    '''
+    # auto_tuner.py로 이 호스트를 튜닝해 뒀으면 그 워커 수와 start method 사용
+    tuned = load_tuning()
+    ctx = multiprocessing.get_context(tuned['start_method'] if tuned else 'spawn')
+    num_cores = tuned['P'] if tuned else ctx.cpu_count()
+    if tuned:
+        log(f'튜닝 설정 사용: 워커 {num_cores}개, {tuned["start_method"]} ({tuned["tuned_at"]})', telemetry)
+
+    # 압축 해제 크기는 후보와 관계없으므로 워커를 띄우기 전에 한 번 확인 (넘으면 ExtractTooLarge)
+    check_extract_size(ZIP_PATH)
+    generator = make_generator(**source)
+    limit = len(generator)
+
+    checkpoint = load_checkpoint(resume, limit, source)
+    todo = checkpoint.missing(START_INDEX)
+    if resume:
+        log(f'체크포인트에서 재시작: 완료 {checkpoint.done()} / {limit}', telemetry)
+
+    stop_flag = StopFlag()
+    scheduler = RangeScheduler(ctx, limit, num_cores, todo=todo, track=True)
+    metrics = WorkerMetrics(ctx, num_cores)
+    aggregator = TelemetryAggregator(metrics, limit, already_done=limit - scheduler.total)
+    printer = TelemetryPrinter(telemetry)
+    processes: list[Process] = []
 
-        stop_process_event = multiprocessing.Event()
-        processes = multi_process(stop_process_event)
+    started = time.time()
+    last_saved = started
+    last_report = started
+    predicted = False
+    out_of_budget = False
+    try:
+        processes = multi_process(ctx, generator, scheduler, metrics, stop_flag, num_cores, telemetry)
 
         while True:
-            time.sleep(0.2)
+            if stop_flag.wait(0.2):
+                break
+            if not any(p.is_alive() for p in processes):
+                break
+            # 완료 구간을 주기적으로 파일에 기록 (중간에 종료돼도 --resume으로 이어서 탐색)
+            if time.time() - last_saved >= CHECKPOINT_INTERVAL:
+                save_checkpoint(checkpoint, scheduler)
+                last_saved = time.time()
+            if time.time() - last_report >= TELEMETRY_INTERVAL:
+                stats = aggregator.sample()
+                printer.emit(stats)
+                last_report = time.time()
+                # 처리량이 안정되면 한 번만 예측 (소스 순서대로 todo를 검사한다고 보고)
+                if not predicted and stats['elapsed'] >= PREDICT_AFTER and stats['avg_tries_per_sec'] > 0:
+                    rate = stats['avg_tries_per_sec']
+                    prediction = predict(source_spans(generator), todo, rate, budget)
+                    printer.note('prediction', {'time': stats['time'], 'tries_per_sec': rate, 'budget': budget, **prediction},
+                                 format_prediction(prediction, rate, budget))
+                    predicted = True
+            if budget is not None and time.time() - started >= budget:
+                out_of_budget = True
+                break
 
     except KeyboardInterrupt:
-        print('\n시스템 종료\n')
+        log('\n메인 프로세스 종료\n', telemetry)
     except Exception as e:
-        print(f'[ERROR]: {e}')
-        print(f'{e.__class__}')
+        log(f'[ERROR]: {e}', telemetry)
+        log(f'{e.__class__}', telemetry)
     finally:
-        stop_process_event.set()
-        for p in processes:
-            p.join(timeout=TIME_OUT)
+        stop_flag.set()
+        # 워커는 완료 큐가 비워져야 종료할 수 있으므로, join 전에 계속 비워준다.
+        deadline = time.time() + TIME_OUT
+        while any(p.is_alive() for p in processes) and time.time() < deadline:
+            save_checkpoint(checkpoint, scheduler)
+            time.sleep(0.1)
         for p in processes:
             if p.is_alive():
                 p.terminate()
         for p in processes:
             p.join()
+        save_checkpoint(checkpoint, scheduler)
+        stop_flag.unlink()
+        if out_of_budget:
+            printer.note('budget_exhausted', {'time': round(time.time(), 3), 'budget': budget, 'done': checkpoint.done(), 'total': limit},
+                         f'시간 예산({budget:g}초) 소진: 체크포인트 저장 (완료 {checkpoint.done()} / {limit}), --resume으로 이어서 탐색')
+        printer.close()
+        print_summary(scheduler, time.time() - started, telemetry)
+
+
+def add_source_arguments(parser: argparse.ArgumentParser):
+    '''
+    후보 생성 옵션(마스크, 사용자 문자셋, 단어 목록, 규칙)을 parser에 추가
+    '''
+    parser.add_argument('--mask', default=DEFAULT_MASK, help='hashcat 스타일 마스크 (예: ?l?l?d?d?d?d)')
+    for n in range(1, 5):
+        parser.add_argument(f'-{n}', f'--custom-charset{n}', dest=f'charset{n}',
+                            default=DEFAULT_CHARSET1 if n == 1 else None, help=f'마스크의 ?{n} 문자셋')
+    parser.add_argument('--wordlist', help='단어 목록 파일 (지정하면 마스크 대신 사용)')
+    parser.add_argument('--rules', help='단어 목록에 적용할 규칙 파일')
+    parser.add_argument('--extra-mask', dest='masks', action='append',
+                        help='추가 마스크 소스 (여러 번 지정 가능, 초당 성공 확률 순으로 정렬해 이어서 탐색)')
+    parser.add_argument('--prior', dest='priors', type=float, action='append',
+                        help='소스별 사전 확률 (기본 소스, --extra-mask 순서, 생략하면 모두 같게)')
+
+
+def source_from_args(args: argparse.Namespace) -> dict:
+    '''
+    add_source_arguments로 받은 옵션 -> make_generator 인자 (체크포인트 키로도 쓴다)
+    '''
+    custom = {str(n): getattr(args, f'charset{n}') for n in range(1, 5) if getattr(args, f'charset{n}')}
+    source = {'mask': args.mask, 'custom': custom, 'wordlist': args.wordlist, 'rules': args.rules}
+    # 소스가 하나면 키를 넣지 않는다. (이전 체크포인트와 같은 키)
+    if args.masks:
+        source['masks'] = args.masks
+    if args.priors:
+        source['priors'] = args.priors
+    return source
 
 
 if __name__ == '__main__':
-    try:
-        ctx = multiprocessing.get_context('spawn')
-
-        count: Synchronized[int] = ctx.Value('i', 0)
-        stop_event: EventClass = ctx.Event()
-
-        procs: list[Process] = [
-            ctx.Process(target=unlock_zip, args=(count, stop_event))
-            for _ in range(ctx.cpu_count())
-        ]
-
-        for p in procs: p.start()
-
-        while True:
-            if stop_event.wait(0.2):
-                break
-
-    except KeyboardInterrupt:
-        print('\n메인 프로세스 종료\n')
-    finally:
-        stop_event.set()
-        for p in procs: p.join()
+    parser = argparse.ArgumentParser(description='ZIP 비밀번호 탐색')
+    parser.add_argument('--resume', action='store_true', help=f'{CHECKPOINT_PATH}의 완료 구간을 건너뛰고 이어서 탐색')
+    add_source_arguments(parser)
+    parser.add_argument('--telemetry', default='dashboard', choices=TELEMETRY_MODES, help='진행 상황 출력 형식')
+    parser.add_argument('--budget', type=float, help='탐색 시간 예산(초), 끝나면 체크포인트를 저장하고 멈춘다.')
+    args = parser.parse_args()
 
+    try:
+        main(source_from_args(args), resume=args.resume, telemetry=args.telemetry, budget=args.budget)
+    except ExtractTooLarge as e:
+        parser.error(str(e))
+    except CheckpointMismatch as e:
+        parser.error(f'{e} (다른 옵션으로 저장됨, --resume을 빼고 새로 시작하거나 체크포인트 파일({CHECKPOINT_PATH})을 지우세요)')
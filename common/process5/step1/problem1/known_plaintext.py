@@ -0,0 +1,591 @@
+'''
+ZipCrypto 알려진 평문 공격 (Biham-Kocher)
+- 엔트리 하나에서 연속된 평문을 12바이트 이상 알면 비밀번호 없이 내부 키(k0, k1, k2)를 복구한다.
+- 복구한 키는 비밀번호로 초기화한 직후의 키이므로, 같은 비밀번호로 암호화된 모든 엔트리를 복호화할 수 있다.
+- 단계
+  1. Z 축소: 키스트림 바이트는 k2의 2~15비트로만 정해지므로, 마지막 키스트림 바이트와 맞는
+     k2[2,32) 후보 2^22개에서 시작해 CRC32 역연산으로 한 바이트씩 뒤로 가며 후보를 줄인다. (NumPy)
+  2. 공격: 남은 k2 후보마다 k2 8개 -> k1 상위 바이트 -> k1 전체 -> k0 하위 바이트 -> k0 전체 순서로
+     탐색하고, 나머지 평문으로 확인한다. (k1 하위 3바이트 2^16가지 추측은 NumPy 배열로 한꺼번에)
+- 평문이 길수록 1단계에서 후보가 많이 줄어 2단계가 빨라진다.
+'''
+import multiprocessing
+import zlib
+
+import numpy as np
+
+from check_zip_crypto import LCG_MULT as MULT, ZipReader, _decrypt_byte, _update_keys, _decrypt_stream
+from crc32 import CRC_TABLE, MASK_32
+
+# ZipCrypto 암호화 헤더 크기 (평문 위치는 헤더 다음 데이터 기준)
+HEADER_SIZE = 12
+
+# 공격에 필요한 연속 평문 길이, 전체 최소 평문 길이
+CONTIGUOUS_SIZE = 8
+MIN_PLAINTEXT = 12
+
+# k1 선형합동법 곱셈 상수(check_zip_crypto.LCG_MULT)의 역원 (MULT * MULT_INV == 1 mod 2^32)
+MULT_INV = pow(MULT, -1, 1 << 32)
+
+MASK_2_32 = 0xfffffffc
+MASK_8_32 = 0xffffff00
+MASK_10_32 = 0xfffffc00
+MASK_24_32 = 0xff000000
+MASK_26_32 = 0xfc000000
+# A = B[x,32) + (바이트 하나)일 때 A - B[x,32)의 최댓값
+MAXDIFF_0_24 = 0x00ffffff + 0xff
+MAXDIFF_0_26 = 0x03ffffff + 0xff
+
+# 2단계에서 워커에 한 번에 넘기는 k2 후보 수
+ATTACK_CHUNK = 64
+
+# Z 축소: 후보 수가 이보다 작아진 위치부터 최솟값을 추적하고, 충분히 작으면 조금 더 본 뒤 멈춘다.
+TRACK_SIZE = 1 << 16
+WAIT_SIZE = 1 << 8
+
+
+def _build_tables():
+    # CRC32 역연산 테이블: CRC_TABLE의 최상위 바이트는 0~255가 한 번씩 나온다.
+    crc_inv = [0] * 256
+    for b in range(256):
+        crc_inv[CRC_TABLE[b] >> 24] = ((CRC_TABLE[b] << 8) & MASK_32) ^ b
+
+    # 키스트림 바이트 -> 그 바이트를 만드는 k2[2,16) 값들, k2[10,16)(6비트)별로 나눠 둔다.
+    keystream_inv = [[[] for _ in range(64)] for _ in range(256)]
+    for z in range(0, 1 << 16, 4):
+        k = (((z | 2) * (z | 3)) >> 8) & 0xff
+        keystream_inv[k][z >> 10].append(z)
+
+    # x * MULT_INV의 최상위 바이트 -> x 목록 (캐리 오차를 감안해 이웃 칸에도 넣는다)
+    fiber2 = [[] for _ in range(256)]
+    fiber3 = [[] for _ in range(256)]
+    for x in range(256):
+        m = ((x * MULT_INV) & MASK_32) >> 24
+        fiber2[m].append(x)
+        fiber2[(m + 1) & 0xff].append(x)
+        fiber3[(m - 1) & 0xff].append(x)
+        fiber3[m].append(x)
+        fiber3[(m + 1) & 0xff].append(x)
+    return crc_inv, keystream_inv, fiber2, fiber3
+
+
+CRC_INV, KEYSTREAM_INV, FIBER2, FIBER3 = _build_tables()
+MULT_INV_TABLE = [(x * MULT_INV) & MASK_32 for x in range(256)]
+
+# Z 축소용 NumPy 테이블
+CRC_INV_NP = np.array(CRC_INV, dtype=np.uint32)
+KEYSTREAM_COUNT_NP = np.array([[len(bucket) for bucket in row] for row in KEYSTREAM_INV], dtype=np.int64)
+KEYSTREAM_FLAT_NP = [np.array([z for bucket in row for z in bucket], dtype=np.uint32) for row in KEYSTREAM_INV]
+# 바이트 k의 버킷 b가 KEYSTREAM_FLAT_NP[k]에서 시작하는 위치
+KEYSTREAM_OFFSET_NP = np.cumsum(KEYSTREAM_COUNT_NP, axis=1) - KEYSTREAM_COUNT_NP
+
+
+def _pad(fibers: list[list[int]]) -> tuple[np.ndarray, np.ndarray]:
+    # 길이가 다른 fiber 목록 -> (256 x 최대 길이 값, 유효 여부)
+    width = max(len(f) for f in fibers)
+    values = np.zeros((256, width), dtype=np.uint64)
+    valid = np.zeros((256, width), dtype=bool)
+    for m, f in enumerate(fibers):
+        values[m, :len(f)] = f
+        valid[m, :len(f)] = True
+    return values, valid
+
+
+# Y 탐색용 NumPy 테이블 (모두 uint64: 32비트 곱셈 결과를 & MASK_32로 자른다)
+MULT_INV_NP = np.array(MULT_INV_TABLE, dtype=np.uint64)
+FIBER2_NP, FIBER2_VALID = _pad(FIBER2)
+FIBER3_NP, FIBER3_VALID = _pad(FIBER3)
+Y7_8_24_NP = np.arange(1 << 16, dtype=np.uint64) << np.uint64(8)
+CRC_TABLE_NP = np.array(CRC_TABLE, dtype=np.uint64)
+CRC_INV_U64 = CRC_INV_NP.astype(np.uint64)
+
+# X 목록 후보를 배열로 확인할 키스트림 바이트 수 (이후는 남은 후보만 파이썬으로 확인)
+ARRAY_CHECK_BYTES = 4
+
+
+def crc32_step(x: int, b: int) -> int:
+    return (x >> 8) ^ CRC_TABLE[(x ^ b) & 0xff]
+
+
+def crc32_inv(x: int, b: int) -> int:
+    '''
+    crc32_step의 역연산: crc32_step(crc32_inv(x, b), b) == x
+    '''
+    return ((x << 8) & MASK_32) ^ CRC_INV[x >> 24] ^ b
+
+
+def _crc32_step_np(x: np.ndarray, b: int | np.ndarray) -> np.ndarray:
+    return (x >> np.uint64(8)) ^ CRC_TABLE_NP[((x ^ b) & np.uint64(0xff)).astype(np.int64)]
+
+
+def _crc32_inv_np(x: np.ndarray, b: int) -> np.ndarray:
+    return (((x << np.uint64(8)) & np.uint64(MASK_32)) ^ CRC_INV_U64[(x >> np.uint64(24)).astype(np.int64)]
+            ^ b)
+
+
+def _msb_y(z_i: int, z_im1: int) -> int:
+    # Z{i} = crc32_step(Z{i-1}, msb(Y{i}))에서 Y{i}[24,32) 복원
+    return ((crc32_inv(z_i, 0) ^ z_im1) << 24) & MASK_32
+
+
+def keystream_of(ciphertext: bytes, plaintext: bytes, offset: int) -> bytes:
+    '''
+    암호문(헤더 포함)과 offset 위치의 평문으로 키스트림 계산
+    '''
+    return bytes(c ^ p for c, p in zip(ciphertext[offset:offset + len(plaintext)], plaintext))
+
+
+def _expand(z_10_32: np.ndarray, k: int) -> np.ndarray:
+    '''
+    k2[10,32) 후보마다 키스트림 바이트 k와 맞는 k2[2,16) 값을 붙여 k2[2,32) 후보로 펼친다.
+    '''
+    buckets = ((z_10_32 >> np.uint32(10)) & np.uint32(63)).astype(np.int64)
+    counts = KEYSTREAM_COUNT_NP[k][buckets]
+    # 후보마다 버킷 안에서 몇 번째 값인지
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    pos = np.arange(int(counts.sum()), dtype=np.int64) - starts
+    low = KEYSTREAM_FLAT_NP[k][np.repeat(KEYSTREAM_OFFSET_NP[k][buckets], counts) + pos]
+    return np.repeat(z_10_32, counts) | low
+
+
+def _count(z_10_32: np.ndarray, k: int) -> np.ndarray:
+    return KEYSTREAM_COUNT_NP[k][((z_10_32 >> np.uint32(10)) & np.uint32(63)).astype(np.int64)]
+
+
+def z_reduction(keystream: bytes) -> tuple[int, np.ndarray]:
+    '''
+    1단계: 연속 키스트림으로 k2 후보 축소 -> (키스트림 위치, 그 위치의 k2[2,32) 후보)
+    - 마지막 키스트림 바이트 위치의 k2[10,32) 2^22개에서 시작해 앞쪽 바이트로 가면서
+      CRC32 역연산으로 이전 k2[10,32)를 구하고, 중복 제거 + 키스트림 필터
+      (k2[0,10)과 msb(k1)은 역연산 결과의 하위 비트에만 영향을 준다)
+    - 후보 수가 TRACK_SIZE 아래로 내려오면 가장 작았던 위치를 기억하고,
+      WAIT_SIZE 아래면 조금 더 가 보고 멈춘다. (위치는 CONTIGUOUS_SIZE - 1 이상)
+    '''
+    zi = np.arange(1 << 22, dtype=np.uint32) << np.uint32(10)
+    seen = np.zeros(1 << 22, dtype=bool)
+    index = len(keystream) - 1
+
+    tracking = waiting = False
+    wait = 0
+    best_index, best_size, best = index, TRACK_SIZE, zi
+    for i in range(index, CONTIGUOUS_SIZE - 1, -1):
+        z = _expand(zi, keystream[i])
+        # 중복 제거: 정렬(np.unique) 대신 2^22 비트맵에 표시했다가 켜진 칸만 읽는다.
+        seen[((z << np.uint32(8)) ^ CRC_INV_NP[z >> np.uint32(24)]) >> np.uint32(10)] = True
+        zim1 = np.flatnonzero(seen).astype(np.uint32)
+        seen[zim1] = False
+        zim1 <<= np.uint32(10)
+        counts = _count(zim1, keystream[i - 1])
+        zim1 = zim1[counts > 0]
+        size = int(counts.sum())
+
+        if size <= best_size:
+            tracking, waiting = True, False
+            best_index, best_size = i - 1, size
+        elif tracking:
+            if best_index == i:
+                # 최솟값 위치를 막 지났다: 그 위치의 후보 보관
+                best = zi
+                if best_size <= WAIT_SIZE:
+                    waiting, wait = True, best_size * 4
+            if waiting:
+                wait -= 1
+                if wait == 0:
+                    break
+        zi = zim1
+
+    if not tracking:
+        return CONTIGUOUS_SIZE - 1, _expand(zi, keystream[CONTIGUOUS_SIZE - 1])
+    if best_index == CONTIGUOUS_SIZE - 1:
+        best = zi
+    return best_index, _expand(best, keystream[best_index])
+
+
+class KnownPlaintextAttack:
+    '''
+    2단계: Z 축소로 남은 k2 후보마다 키 전체를 탐색
+    - ciphertext: 엔트리 암호문 (12바이트 헤더 포함)
+    - plaintext: 알려진 평문, offset: 헤더 다음 데이터 기준 평문 위치
+    - solutions: 평문 위치(index + 7)에서의 [k0, k1, k2] 목록
+    '''
+    def __init__(self, ciphertext: bytes, plaintext: bytes, offset: int = 0):
+        if len(plaintext) < MIN_PLAINTEXT:
+            raise ValueError(f'알려진 평문이 {MIN_PLAINTEXT}바이트 이상 필요: {len(plaintext)}')
+        self.ciphertext = ciphertext
+        self.plaintext = plaintext
+        # 헤더를 포함한 암호문 기준 위치
+        self.offset = HEADER_SIZE + offset
+        if self.offset + len(plaintext) > len(ciphertext):
+            raise ValueError('평문이 암호문 범위를 넘음')
+        self.keystream = keystream_of(ciphertext, plaintext, self.offset)
+        self.index = 0
+        self.zlist = [0] * 8
+        self.ylist = [0] * 8
+        self.xlist = [0] * 8
+        self.solutions: list[tuple[int, list[int]]] = []
+
+    def run(self, first_only: bool = True, progress=None, workers: int = 1) -> list[tuple[int, list[int]]]:
+        '''
+        -> [(암호문 위치, [k0, k1, k2])], 위치는 그 키로 다음에 복호화할 암호문 바이트
+        - progress(done, total): 후보 청크마다 호출되는 진행 상황 콜백
+        - workers > 1이면 k2 후보를 청크로 나눠 프로세스 풀에서 탐색 (후보끼리 독립)
+        '''
+        z_index, candidates = z_reduction(self.keystream)
+        self.index = z_index + 1 - CONTIGUOUS_SIZE
+        total = len(candidates)
+        chunks = [candidates[i:i + ATTACK_CHUNK].tolist() for i in range(0, total, ATTACK_CHUNK)]
+        solutions = []
+        done = 0
+
+        if workers <= 1:
+            for chunk in chunks:
+                solutions += self.attack(chunk, first_only)
+                done += len(chunk)
+                if progress is not None:
+                    progress(done, total)
+                if solutions and first_only:
+                    break
+            self.solutions = solutions
+            return solutions
+
+        ctx = multiprocessing.get_context('spawn')
+        initargs = (self.ciphertext, self.plaintext, self.offset - HEADER_SIZE, self.index)
+        with ctx.Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+            for count, found in pool.imap_unordered(_attack_chunk, [(chunk, first_only) for chunk in chunks]):
+                solutions += found
+                done += count
+                if progress is not None:
+                    progress(done, total)
+                if solutions and first_only:
+                    # 남은 청크는 버린다. (with 블록을 나가면 terminate)
+                    break
+        self.solutions = solutions
+        return solutions
+
+    def attack(self, candidates: list[int], first_only: bool = True) -> list[tuple[int, list[int]]]:
+        '''
+        Z 축소 위치(index + 7)의 k2 후보 목록 탐색 -> 찾은 해
+        '''
+        self.solutions = []
+        for z7 in candidates:
+            self.zlist[7] = z7
+            self._explore_z(7)
+            if self.solutions and first_only:
+                break
+        return self.solutions
+
+    def _explore_z(self, i: int):
+        zlist, ylist = self.zlist, self.ylist
+        if i != 0:
+            zim1_10_32 = crc32_inv(zlist[i], 0) & MASK_10_32
+            for zim1_2_16 in KEYSTREAM_INV[self.keystream[self.index + i - 1]][(zim1_10_32 >> 10) & 63]:
+                zlist[i - 1] = zim1_10_32 | zim1_2_16
+                # Z{i}[0,2)는 Z{i-1}을 정하고 나서야 CRC32 역연산으로 알 수 있다.
+                zlist[i] &= MASK_2_32
+                zlist[i] |= (crc32_inv(zlist[i], 0) ^ zlist[i - 1]) >> 8
+                if i < 7:
+                    ylist[i + 1] = _msb_y(zlist[i + 1], zlist[i])
+                self._explore_z(i - 1)
+            return
+
+        # Z 목록 완성: Y7[0,24)를 추측해서 Y 목록을 거꾸로 좁힌다.
+        # Y7[8,24) 2^16가지를 파이썬 루프 대신 배열 하나로 한꺼번에 처리
+        y7_msb = ylist[7] & MASK_24_32
+        y6_msb = ylist[6] & MASK_24_32
+        # prod == (Y7[8,32) - 1) * MULT_INV
+        base = ((MULT_INV_TABLE[y7_msb >> 24] << 24) - MULT_INV) & MASK_32
+        prod = (np.uint64(base) + Y7_8_24_NP * np.uint64(MULT_INV)) & np.uint64(MASK_32)
+        slot = (np.uint64(y6_msb >> 24) - (prod >> np.uint64(24))) & np.uint64(0xff)
+        y7_0_8 = FIBER3_NP[slot]
+        # Y6 + lsb(X7) == (Y7 - 1) * MULT_INV
+        ok = FIBER3_VALID[slot] & (
+            ((prod[:, None] + MULT_INV_NP[y7_0_8] - np.uint64(y6_msb)) & np.uint64(MASK_32)) <= MAXDIFF_0_24)
+        rows, cols = np.nonzero(ok)
+        ys = {7: y7_0_8[rows, cols] | Y7_8_24_NP[rows] | np.uint64(y7_msb)}
+        xs = {}
+        for i in range(7, 3, -1):
+            ys, xs = self._explore_y(i, ys, xs)
+            if not len(ys[i - 1]):
+                return
+        self._test_x(ys, xs)
+
+    def _explore_y(self, i: int, ys: dict, xs: dict) -> tuple[dict, dict]:
+        '''
+        Y{i} 후보 배열로 lsb(X{i})와 Y{i-1}을 구하고 Y{i-2}[24,32)로 거른다.
+        - ys, xs: 위치별 후보 배열 (같은 행이 같은 후보), 살아남은 행만 남겨 반환
+        '''
+        mask = np.uint64(MASK_32)
+        y_im2 = np.uint64(self.ylist[i - 2] & MASK_24_32)
+        y_im1_msb = np.uint64(self.ylist[i - 1] >> 24)
+        fy = ((ys[i] - np.uint64(1)) * np.uint64(MULT_INV)) & mask
+        ffy = ((fy - np.uint64(1)) * np.uint64(MULT_INV)) & mask
+        slot = ((ffy - y_im2) & mask) >> np.uint64(24)
+        xi_0_8 = FIBER2_NP[slot]
+        yim1 = (fy[:, None] - xi_0_8) & mask
+        ok = (FIBER2_VALID[slot]
+              & (((ffy[:, None] - MULT_INV_NP[xi_0_8] - y_im2) & mask) <= MAXDIFF_0_24)
+              & ((yim1 >> np.uint64(24)) == y_im1_msb))
+        rows, cols = np.nonzero(ok)
+        ys = {k: v[rows] for k, v in ys.items()}
+        xs = {k: v[rows] for k, v in xs.items()}
+        ys[i - 1] = yim1[rows, cols]
+        xs[i] = xi_0_8[rows, cols]
+        return ys, xs
+
+    def _test_x(self, ys: dict, xs: dict):
+        '''
+        완성된 Y 목록 후보 배열로 X7 전체를 구하고 X3, 이어지는 키스트림으로 거른 뒤
+        남은 후보만 _verify로 평문 전체를 확인
+        '''
+        mask = np.uint64(MASK_32)
+        p = self.plaintext
+        index = self.index
+        # X4는 하위 바이트만 알지만, CRC32를 세 번 거치면 모르는 비트가 X7 하위 바이트로 밀려난다.
+        x = xs[4]
+        for i in range(5, 8):
+            x = (_crc32_step_np(x, p[index + i - 1]) & np.uint64(MASK_8_32)) | xs[i]
+
+        # X3 하위 바이트가 Y1[26,32)과 맞는지
+        x3 = x
+        for i in range(6, 2, -1):
+            x3 = _crc32_inv_np(x3, p[index + i])
+        y1_26_32 = np.uint64(_msb_y(self.zlist[1], self.zlist[0]) & MASK_26_32)
+        ok = ((((((ys[3] - np.uint64(1)) * np.uint64(MULT_INV) - (x3 & np.uint64(0xff)) - np.uint64(1))
+                 * np.uint64(MULT_INV)) - y1_26_32) & mask) <= MAXDIFF_0_26)
+
+        # 키스트림 몇 바이트만 배열로 먼저 확인 (한 바이트마다 후보가 1/256로 줄어든다)
+        rows = np.flatnonzero(ok)
+        kx, ky, kz = x[rows], ys[7][rows], np.full(len(rows), self.zlist[7], dtype=np.uint64)
+        for j in range(index + 7, min(index + 7 + ARRAY_CHECK_BYTES, len(p))):
+            t = (kz & np.uint64(0xffff)) | np.uint64(2)
+            keep = (((t * (t ^ np.uint64(1))) >> np.uint64(8)) & np.uint64(0xff)) == self.keystream[j]
+            rows, kx, ky, kz = rows[keep], kx[keep], ky[keep], kz[keep]
+            if not len(rows):
+                return
+            kx = _crc32_step_np(kx, p[j])
+            ky = ((ky + (kx & np.uint64(0xff))) * np.uint64(MULT) + np.uint64(1)) & mask
+            kz = _crc32_step_np(kz, ky >> np.uint64(24))
+
+        for n in rows.tolist():
+            keys = [int(x[n]), int(ys[7][n]), self.zlist[7]]
+            if self._verify(keys):
+                self.solutions.append((self.offset + index + 7, keys))
+
+    def _verify(self, keys: list) -> bool:
+        '''
+        평문 위치 index + 7의 키 후보를 알려진 평문 전체로 확인 (뒤쪽은 정방향, 앞쪽은 역방향)
+        '''
+        p = self.plaintext
+        start = self.index + 7
+        forward = list(keys)
+        for j in range(start, len(p)):
+            if self.keystream[j] != _decrypt_byte(forward):
+                return False
+            _update_keys(forward, p[j])
+        backward = list(keys)
+        for j in range(start - 1, -1, -1):
+            _update_keys_backward(backward, p[j])
+            if self.keystream[j] != _decrypt_byte(backward):
+                return False
+        return True
+
+
+# 워커 프로세스마다 한 번 만드는 공격 객체 (테이블은 import할 때 만들어진다)
+_ATTACK: KnownPlaintextAttack | None = None
+
+
+def _init_worker(ciphertext: bytes, plaintext: bytes, offset: int, index: int):
+    global _ATTACK
+    _ATTACK = KnownPlaintextAttack(ciphertext, plaintext, offset)
+    _ATTACK.index = index
+
+
+def _attack_chunk(task: tuple[list[int], bool]) -> tuple[int, list]:
+    candidates, first_only = task
+    return len(candidates), _ATTACK.attack(candidates, first_only)
+
+
+def _update_keys_backward(keys: list, ch: int):
+    '''
+    _update_keys의 역연산: ch를 넣기 전 키로 되돌린다.
+    '''
+    x, y, z = keys
+    z = crc32_inv(z, y >> 24)
+    y = (((y - 1) * MULT_INV) - (x & 0xff)) & MASK_32
+    x = crc32_inv(x, ch)
+    keys[0], keys[1], keys[2] = x, y, z
+
+
+def rewind_keys(keys: list, ciphertext: bytes, position: int) -> list:
+    '''
+    ciphertext[position]을 복호화할 차례인 키를 맨 앞(헤더 첫 바이트 전, 비밀번호로 초기화한 직후) 키로 되돌린다.
+    - 평문을 몰라도 된다: 이전 k2와 k1만으로 이전 키스트림 바이트를 구해 이전 평문을 복호화한다.
+    '''
+    keys = list(keys)
+    for j in range(position - 1, -1, -1):
+        x, y, z = keys
+        z = crc32_inv(z, y >> 24)
+        y = (((y - 1) * MULT_INV) - (x & 0xff)) & MASK_32
+        plain = ciphertext[j] ^ _decrypt_byte([x, y, z])
+        keys = [crc32_inv(x, plain), y, z]
+    return keys
+
+
+def recover_keys(zip_path: str, plaintext: bytes, offset: int = 0, entry_index: int | None = None,
+                 progress=None, workers: int = 1) -> list[int] | None:
+    '''
+    ZIP 파일에서 평문을 아는 엔트리로 초기 키(비밀번호로 초기화한 직후 k0, k1, k2) 복구, 실패하면 None
+    - entry_index가 None이면 첫 ZipCrypto 엔트리
+    - 복구한 키는 모든 엔트리의 검증 바이트로 한 번 더 확인
+    '''
+    with ZipReader(zip_path) as reader:
+        zipcrypto_entries = [e for e in reader.entries if e.zipcrypto]
+        entries = zipcrypto_entries if entry_index is None else [reader[entry_index]]
+        if not entries or not entries[0].zipcrypto:
+            raise ValueError('ZipCrypto 엔트리가 없음')
+        # 워커에 pickle 해서 넘기므로 이 엔트리만 bytes로 복사
+        with reader.data(entries[0]) as data:
+            ciphertext = bytes(data)
+
+    attack = KnownPlaintextAttack(ciphertext, plaintext, offset)
+    for position, keys in attack.run(progress=progress, workers=workers):
+        initial = rewind_keys(keys, ciphertext, position)
+        if all(_decrypt_stream(e.enc12, list(initial))[-1] == e.check_byte for e in zipcrypto_entries):
+            return initial
+    return None
+
+
+def decrypt_archive(zip_path: str, keys: list[int]) -> dict[str, bytes]:
+    '''
+    복구한 초기 키로 모든 ZipCrypto 엔트리 복호화 + 압축 해제 -> {이름: 데이터}
+    - CRC가 맞지 않으면 ValueError
+    '''
+    files = {}
+    with ZipReader(zip_path) as reader:
+        for entry in reader.entries:
+            if not entry.zipcrypto:
+                continue
+            with reader.data(entry) as data:
+                plain = _decrypt_stream(data, list(keys))[HEADER_SIZE:]
+            if entry.comp == 8:
+                d = zlib.decompressobj(-15)
+                out = d.decompress(plain, entry.usize + 1) + d.flush()
+            elif entry.comp == 0:
+                out = plain
+            else:
+                raise ValueError(f'지원하지 않는 압축 방식: {entry.comp} ({entry.name})')
+            if zlib.crc32(out) & MASK_32 != entry.crc32:
+                raise ValueError(f'CRC 불일치: {entry.name}')
+            files[entry.name] = out
+    return files
+
+
+def _encrypt(keys: list, data: bytes) -> bytes:
+    '''
+    ZipCrypto 암호화 (자체 확인용): 키스트림 XOR 후 평문 바이트로 키 갱신
+    '''
+    out = bytearray()
+    for b in data:
+        out.append(b ^ _decrypt_byte(keys))
+        _update_keys(keys, b)
+    return bytes(out)
+
+
+def _write_store_zip(path: str, keys: list, name: str, data: bytes):
+    '''
+    초기 키로 암호화한 STORE 엔트리 하나짜리 ZIP 쓰기 (자체 확인용)
+    '''
+    import os
+    import struct
+    crc = zlib.crc32(data)
+    enc = _encrypt(list(keys), os.urandom(11) + bytes([crc >> 24]) + data)
+    nb = name.encode()
+    local = struct.pack('<IHHHHHIIIHH', 0x04034b50, 20, 1, 0, 0, 0, crc, len(enc), len(data), len(nb), 0) + nb
+    central = struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, 20, 20, 1, 0, 0, 0, crc, len(enc), len(data),
+                          len(nb), 0, 0, 0, 0, 0, 0) + nb
+    eocd = struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, 1, 1, len(central), len(local) + len(enc), 0)
+    with open(path, 'wb') as f:
+        f.write(local + enc + central + eocd)
+
+
+def self_test(full: bool = False, workers: int = 1):
+    '''
+    알려진 버퍼를 _update_keys로 암호화해서 초기 키로 되돌아오는지 확인
+    - 기본: Z 축소 후보에 실제 k2가 있는지, 실제 k2 주변 후보만 2단계 탐색 -> rewind_keys가 초기 키를 주는지
+    - full: 임시 ZIP에 대해 recover_keys 전체 실행 (코어 수에 따라 수 분)
+    '''
+    import random
+    import tempfile
+    from check_zip_crypto import _init_keys
+
+    rng = random.Random(21)
+    initial = _init_keys(b'known-plaintext self test')
+    data = bytes(rng.randrange(256) for _ in range(400))
+    header = bytes(rng.randrange(256) for _ in range(HEADER_SIZE))
+    ciphertext = _encrypt(list(initial), header + data)
+
+    attack = KnownPlaintextAttack(ciphertext, data[100:300], 100)
+    z_index, candidates = z_reduction(attack.keystream)
+    attack.index = z_index + 1 - CONTIGUOUS_SIZE
+    # Z 축소 위치(암호문 기준 position)의 실제 키
+    position = attack.offset + attack.index + 7
+    keys = list(initial)
+    for b in (header + data)[:position]:
+        _update_keys(keys, b)
+    true_z = keys[2] & MASK_2_32
+    assert true_z in set(candidates.tolist()), 'Z 축소에서 실제 k2가 빠짐'
+    nearby = [int(z) for z in candidates[:ATTACK_CHUNK] if z != true_z] + [true_z]
+    found = attack.attack(nearby)
+    assert found and found[0] == (position, keys), found
+    assert rewind_keys(found[0][1], ciphertext, position) == initial
+    print(f'z_reduction + attack + rewind_keys: OK (후보 {len(candidates)}개)')
+
+    if full:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f'{tmp}/self_test.zip'
+            _write_store_zip(path, initial, 'data.bin', data)
+            assert recover_keys(path, data[100:300], 100, workers=workers) == initial
+            assert decrypt_archive(path, initial) == {'data.bin': data}
+        print('recover_keys + decrypt_archive: OK')
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+    from zip_extract import write_atomic
+
+    parser = argparse.ArgumentParser(description='ZipCrypto 알려진 평문 공격')
+    parser.add_argument('zip_path', nargs='?')
+    parser.add_argument('plain', nargs='?', help='알려진 평문 파일 (엔트리의 압축된 데이터 기준)')
+    parser.add_argument('--offset', type=int, default=0, help='엔트리 데이터 안에서 평문 위치')
+    parser.add_argument('--entry', type=int, help='평문을 아는 엔트리 번호 (기본: 첫 ZipCrypto 엔트리)')
+    parser.add_argument('--extract', help='복호화한 파일을 쓸 디렉터리')
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(), help='탐색 프로세스 수')
+    parser.add_argument('--self-test', nargs='?', const='quick', choices=('quick', 'full'),
+                        help='암호화 -> 키 복구 왕복 확인 (full: 임시 ZIP으로 recover_keys 전체 실행)')
+    args = parser.parse_args()
+
+    if args.self_test:
+        self_test(args.self_test == 'full', args.workers)
+        raise SystemExit(0)
+    if not args.zip_path or not args.plain:
+        parser.error('zip_path와 plain이 필요 (또는 --self-test)')
+
+    with open(args.plain, 'rb') as f:
+        known = f.read()
+
+    t0 = time.perf_counter()
+
+    def show(done, total):
+        print(f'\r후보 {done}/{total} ({time.perf_counter() - t0:.1f}s)', end='', flush=True)
+
+    found = recover_keys(args.zip_path, known, args.offset, args.entry, progress=show, workers=args.workers)
+    print()
+    if found is None:
+        print('키를 찾지 못함')
+        raise SystemExit(1)
+    print(f'키: {found[0]:08x} {found[1]:08x} {found[2]:08x} ({time.perf_counter() - t0:.1f}s)')
+    if args.extract:
+        files = decrypt_archive(args.zip_path, found)
+        write_atomic(files, args.extract)
+        print(f'{len(files)}개 파일 -> {args.extract}')
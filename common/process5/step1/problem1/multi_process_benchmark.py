@@ -1,14 +1,21 @@
-import os, time, random, statistics, hashlib, itertools, sys
+import os, time, random, statistics, hashlib, itertools, sys, platform, sysconfig
 import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing.synchronize import Event as mpEvent
 import string
 import queue
 
+from candidates import MaskGenerator
+from stop_flag import StopFlag, StopPoller
+from bench_stats import summarize, add_scaling, fit_amdahl, fit_gustafson, write_results
+
 # ------------- 설정
 CHARSET = string.ascii_lowercase + string.digits
 BASE = len(CHARSET)
 PWD_LEN = 6
-TOTAL_CANDIDATES = BASE ** PWD_LEN  # 전체 공간 (36^6 ~= 2.18e9, 실제 벤치는 N으로 제한)
+# 후보 생성기: ?1 = CHARSET, PWD_LEN 자리 (마스크만 바꾸면 다른 후보 공간으로 벤치 가능)
+GENERATOR = MaskGenerator('?1' * PWD_LEN, {'1': CHARSET})
+TOTAL_CANDIDATES = len(GENERATOR)  # 전체 공간 (36^6 ~= 2.18e9, 실제 벤치는 N으로 제한)
 # 벤치마크에서는 N만큼만 검사
 N = 30_000
 
@@ -19,66 +26,87 @@ SALT = b'codyssey-demo-salt'
 # 코어 수 스윕
 P_VALUES = list(range(1, 20)) # 1 ~ 19 코어
 
+# True면 P마다 워커를 한 번만 띄워 warmup/trial에 재사용하고 작업 시간만 측정
+# (spawn/import 비용은 따로 출력)
+WARM = True
+
+# 결과 파일 (.csv면 CSV, 아니면 JSON), None이면 저장 안 함
+RESULTS_PATH = 'benchmark_results.json'
+
 
 TEST_INDEX = 20000
 
 # -------------- 유틸: 인덱스 -> 비밀번호
-POW = [BASE ** p for p in range(PWD_LEN)]
-
 def index_to_password(idx: int) -> str:
     '''
-    idx (0 .. N-1)을 진법 전개로 PWD_LEN 길이 비번으로 변환
+    idx (0 .. N-1)번째 후보 비밀번호 (GENERATOR 순서, 큰 자릿수부터)
     '''
-    out = [None] * PWD_LEN
-    rem = idx
-    # 큰 자릿수부터 채움
-    for i, p in enumerate(range(PWD_LEN - 1, -1, -1)):
-        digit, rem = divmod(rem, POW[p])
-        out[i] = CHARSET[digit]
-    return ''.join(out)
+    return GENERATOR[idx]
 
 
 # --------------- 유틸: 검증
-def pbkdf2_check(password: str, salt: bytes, target_dk: bytes, iterations: int) -> bool:
-    dk = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations)
+def pbkdf2_check(password: str | bytes, salt: bytes, target_dk: bytes, iterations: int) -> bool:
+    pwd = password if isinstance(password, bytes) else password.encode()
+    dk = hashlib.pbkdf2_hmac('sha256', pwd, salt, iterations)
     return dk == target_dk
 
 
 # -------------- Pool 쪽 전역
 # 워커에서 사용할 전역
-STOP_EVENT: mpEvent = None
+STOP_FLAG: StopFlag = None
+STOP_POLLER: StopPoller = None
 G_SALT = None
 G_TARGET_DK = None
 G_ITERS = None
 
-def pool_init(event, salt, target_dk, iters):
-    global STOP_EVENT, G_SALT, G_TARGET_DK, G_ITERS
-    STOP_EVENT = event
+def pool_init(stop_flag, salt, target_dk, iters):
+    global STOP_FLAG, STOP_POLLER, G_SALT, G_TARGET_DK, G_ITERS
+    STOP_FLAG = stop_flag
+    STOP_POLLER = stop_flag.poller()
     G_SALT = salt
     G_TARGET_DK = target_dk
     G_ITERS = iters
 
 
-def pool_worker(idx: int):
-    # 조기 종료 신호 확인
-    if STOP_EVENT.is_set():
-        return None
-    pw = index_to_password(idx)
-    if pbkdf2_check(pw, G_SALT, G_TARGET_DK, G_ITERS):
-        # 찾으면 이벤트 Set (다른 워커들 중단)
-        STOP_EVENT.set()
-        return (idx, pw)
-    return None
+def split_ranges(N: int, size: int):
+    '''
+    [0, N)를 size 크기 구간 (start, stop)으로 나눈다. (Pool 작업 하나 = 구간 하나)
+    '''
+    for start in range(0, N, size):
+        yield start, min(start + size, N)
 
 
-def pool_worker_idx_only(idx: int):
+def pool_worker(bounds: tuple[int, int]):
     '''
-    조기 종료 없이 끝까지 수행
+    [start, stop) 구간을 검사 -> (검사한 개수, 찾은 (idx, pw) 목록)
+    - 인덱스와 결과(None)를 후보마다 pickle 하지 않고, 구간 하나당 작업 하나, 결과 하나만 오간다.
+    '''
+    start, stop = bounds
+    hits = []
+    count = 0
+    # 후보를 bytes로 바로 생성 (str 생성 + encode 없음)
+    for idx, pw in enumerate(GENERATOR.iter_range_bytes(start, stop), start):
+        # 조기 종료 신호 확인 (공유 메모리 플래그를 몇 개 후보마다 한 번만 읽는다)
+        if STOP_POLLER.tick():
+            break
+        count += 1
+        if pbkdf2_check(pw, G_SALT, G_TARGET_DK, G_ITERS):
+            # 찾으면 플래그 Set (다른 워커들 중단)
+            STOP_FLAG.set()
+            hits.append((idx, pw.decode()))
+            break
+    return count, hits
+
+
+def pool_worker_range_full(bounds: tuple[int, int]):
+    '''
+    조기 종료 없이 구간 끝까지 수행 -> 검사한 개수
     '''
-    pw = index_to_password(idx)
-    # 해시만 수행 (결과는 버림)
-    hashlib.pbkdf2_hmac('sha256', pw.encode(), SALT, PBKDF2_ITER)
-    return None
+    start, stop = bounds
+    for pw in GENERATOR.iter_range_bytes(start, stop):
+        # 해시만 수행 (결과는 버림)
+        hashlib.pbkdf2_hmac('sha256', pw, SALT, PBKDF2_ITER)
+    return stop - start
 
 
 # --------------- Process 쪽 워커
@@ -107,16 +135,17 @@ def proc_worker(stop_event: mpEvent, task_q: mp.Queue, found_q: mp.Queue, salt:
 
 
 # ------------ 라운드로빈 워커: 중앙 큐 없이 각자 i=start, i+=P로 탐색
-def rr_worker(stop_event: mpEvent, start: int, step: int, N: int, salt: bytes, target_dk: bytes, iters: int, found_q: mp.Queue):
+def rr_worker(stop_flag: StopFlag, start: int, step: int, N: int, salt: bytes, target_dk: bytes, iters: int, found_q: mp.Queue):
+    poller = stop_flag.poller()
     i = start
-    while not stop_event.is_set() and i < N:
+    while i < N and not poller.tick():
         pw = index_to_password(i)
         if pbkdf2_check(pw, salt, target_dk, iters):
             try:
                 found_q.put_nowait((i, pw))
             except Exception:
                 pass
-            stop_event.set()
+            stop_flag.set()
             break
         i += step
 
@@ -130,9 +159,17 @@ def rr_worker_full(start: int, step: int, N: int):
         hashlib.pbkdf2_hmac('sha256', pw.encode(), SALT, PBKDF2_ITER)
 
 # ------------- 실행기: Pool
-def run_with_pool(P: int, N: int, target_idx: int, salt: bytes, target_dk: bytes, iters: int):
-    ctx = mp.get_context('spawn')
-    stop = ctx.Event()
+def default_chunksize(N: int, P: int) -> int:
+    '''
+    튜닝 결과(auto_tuner)가 없을 때 쓰는 chunksize
+    '''
+    return min(1024, max(32, N // (P * 64)))
+
+
+def run_with_pool(P: int, N: int, target_idx: int, salt: bytes, target_dk: bytes, iters: int,
+                  chunksize: int | None = None, start_method: str = 'spawn'):
+    ctx = mp.get_context(start_method)
+    stop = StopFlag()
     t0 = time.perf_counter()
     found = None
     try:
@@ -141,12 +178,13 @@ def run_with_pool(P: int, N: int, target_idx: int, salt: bytes, target_dk: bytes
             initializer=pool_init,
             initargs=(stop, salt, target_dk, iters)
         ) as pool:
-            # 순서 무시, 끝나는 대로 받음 + chunksize 튜닝
+            # 순서 무시, 끝나는 대로 받음 + chunksize 튜닝 (auto_tuner로 구한 값을 넘길 수 있다)
             # chunksize = max(1, N // (P * 16))
-            chunksize = min(1024, max(32, N // (P * 64)))
-            for res in pool.imap_unordered(pool_worker, range(N), chunksize=chunksize):
-                if res is not None:
-                    found = res
+            # 작업 하나 = chunksize개 후보 구간 (imap 쪽 chunksize는 1, 구간 자체가 묶음)
+            chunksize = chunksize or default_chunksize(N, P)
+            for count, hits in pool.imap_unordered(pool_worker, split_ranges(N, chunksize)):
+                if hits:
+                    found = hits[0]
                     # 풀을 즉시 정리
                     pool.terminate()
                     pool.join()
@@ -160,26 +198,28 @@ def run_with_pool(P: int, N: int, target_idx: int, salt: bytes, target_dk: bytes
         except Exception:
             pass
         raise
+    finally:
+        stop.unlink()
     t1 = time.perf_counter()
     return found, (t1 - t0)
 
 
-def run_with_pool_full(P: int, N: int):
+def run_with_pool_full(P: int, N: int, chunksize: int | None = None, start_method: str = 'spawn'):
     '''
     조기 종료 없이 끝까지 수행
     '''
-    ctx = mp.get_context('spawn')
+    ctx = mp.get_context(start_method)
     t0 = time.perf_counter()
     with ctx.Pool(processes=P) as pool:
-        chunksize = min(1024, max(32, N // (P * 64)))
-        for _ in pool.imap_unordered(pool_worker_idx_only, range(N), chunksize):
+        chunksize = chunksize or default_chunksize(N, P)
+        for _ in pool.imap_unordered(pool_worker_range_full, split_ranges(N, chunksize)):
             pass
     return time.perf_counter() - t0
 
 # ---------------- 실행기
 def run_with_process(P: int, N: int, target_idx: int, salt: bytes, target_dk: bytes, iters: int):
     ctx = mp.get_context('spawn')
-    stop: mpEvent = ctx.Event()
+    stop = StopFlag()
 
     # # 작업 버퍼 크기 10_000으로 제한
     # # CPU-bound 작업 버퍼는 10_000이면 충분
@@ -244,6 +284,8 @@ def run_with_process(P: int, N: int, target_idx: int, salt: bytes, target_dk: by
             try: p.join()
             except Exception: pass
         raise
+    finally:
+        stop.unlink()
 
     t1 = time.perf_counter()
     return found, (t1 - t0)
@@ -261,6 +303,177 @@ def run_with_process_full(P: int, N: int):
     return time.perf_counter() - t0
 
 
+# ---------------- 스레드 백엔드: spawn/pickle 없이 같은 프로세스에서 rr_worker 실행
+def free_threaded_build() -> bool:
+    '''
+    free-threaded(3.13t+) 빌드인지
+    '''
+    return bool(sysconfig.get_config_var('Py_GIL_DISABLED'))
+
+
+def gil_enabled() -> bool:
+    '''
+    지금 GIL이 켜져 있는지 (free-threaded 빌드여도 PYTHON_GIL=1이나 GIL 필요한 확장 모듈 import로 켜질 수 있다)
+    '''
+    is_enabled = getattr(sys, '_is_gil_enabled', None)
+    return True if is_enabled is None else is_enabled()
+
+
+def choose_backend(releases_gil: bool) -> str:
+    '''
+    - GIL이 꺼져 있으면 순수 파이썬 작업도 스레드끼리 병렬 -> 'Thread'
+    - GIL이 켜져 있어도 작업이 GIL을 놓으면(hashlib.pbkdf2_hmac) 해시 계산은 병렬 -> 'Thread'
+    - 그 외(순수 파이썬 ZipCrypto 검사 등)는 프로세스 -> 'Process'
+    '''
+    return 'Thread' if releases_gil or not gil_enabled() else 'Process'
+
+
+def run_with_threads(P: int, N: int, target_idx: int, salt: bytes, target_dk: bytes, iters: int,
+                     executor: ThreadPoolExecutor | None = None):
+    '''
+    run_with_process와 같은 라운드로빈 탐색을 스레드 P개로 수행 (executor를 넘기면 재사용)
+    '''
+    stop = StopFlag()
+    found_q = queue.Queue()
+    own = executor is None
+    executor = executor or ThreadPoolExecutor(max_workers=P)
+    t0 = time.perf_counter()
+    try:
+        futures = [executor.submit(rr_worker, stop, start, P, N, salt, target_dk, iters, found_q) for start in range(P)]
+        for f in futures:
+            f.result()
+    except KeyboardInterrupt:
+        print('\n[Thread] Ctrl+C detected - stopping...')
+        stop.set()
+        raise
+    finally:
+        if own:
+            executor.shutdown()
+        stop.unlink()
+    t1 = time.perf_counter()
+    found = None if found_q.empty() else found_q.get_nowait()
+    return found, (t1 - t0)
+
+
+def run_with_threads_full(P: int, N: int, executor: ThreadPoolExecutor | None = None):
+    '''
+    조기 종료 없이 끝까지 수행
+    '''
+    own = executor is None
+    executor = executor or ThreadPoolExecutor(max_workers=P)
+    t0 = time.perf_counter()
+    try:
+        for f in [executor.submit(rr_worker_full, start, P, N) for start in range(P)]:
+            f.result()
+    finally:
+        if own:
+            executor.shutdown()
+    return time.perf_counter() - t0
+
+
+def run_with_auto(P: int, N: int, target_idx: int, salt: bytes, target_dk: bytes, iters: int, releases_gil: bool = True):
+    '''
+    choose_backend로 스레드/프로세스 중 하나를 골라 탐색 -> (found, 시간, backend)
+    '''
+    backend = choose_backend(releases_gil)
+    runner = run_with_threads if backend == 'Thread' else run_with_process
+    found, elapsed = runner(P, N, target_idx, salt, target_dk, iters)
+    return found, elapsed, backend
+
+
+def run_with_auto_full(P: int, N: int, releases_gil: bool = True):
+    backend = choose_backend(releases_gil)
+    runner = run_with_threads_full if backend == 'Thread' else run_with_process_full
+    return runner(P, N), backend
+
+
+# ---------------- 웜 워커: P마다 한 번만 spawn 하고 warmup/trial마다 재사용
+WARM_BARRIER = None
+
+def warm_pool_init(barrier):
+    global WARM_BARRIER
+    WARM_BARRIER = barrier
+
+
+def warm_ready(_):
+    '''
+    P개 작업을 chunksize=1로 나누면 워커마다 하나씩 받아 barrier에서 만난다.
+    -> 모두 통과하면 P개 워커가 전부 떠서 import까지 끝난 상태
+    '''
+    WARM_BARRIER.wait()
+    return os.getpid()
+
+
+def start_warm_pool(P: int):
+    '''
+    Pool을 띄우고 모든 워커가 준비될 때까지 기다린다. -> (pool, spawn 시간)
+    '''
+    ctx = mp.get_context('spawn')
+    barrier = ctx.Barrier(P)
+    t0 = time.perf_counter()
+    pool = ctx.Pool(processes=P, initializer=warm_pool_init, initargs=(barrier,))
+    pool.map(warm_ready, range(P), chunksize=1)
+    return pool, time.perf_counter() - t0
+
+
+def run_with_warm_pool(pool, P: int, N: int, chunksize: int | None = None):
+    '''
+    이미 떠 있는 pool로 작업 구간만 측정 (run_with_pool_full과 같은 작업)
+    '''
+    t0 = time.perf_counter()
+    chunksize = chunksize or default_chunksize(N, P)
+    for _ in pool.imap_unordered(pool_worker_range_full, split_ranges(N, chunksize)):
+        pass
+    return time.perf_counter() - t0
+
+
+def warm_rr_worker(job_q, done_q):
+    '''
+    준비 완료를 알린 뒤 (start, step, N) 작업을 받을 때마다 rr_worker_full 수행, None이면 종료
+    '''
+    done_q.put(os.getpid())
+    while True:
+        job = job_q.get()
+        if job is None:
+            break
+        rr_worker_full(*job)
+        done_q.put(job[0])
+
+
+class WarmProcesses:
+    '''
+    라운드로빈 Process P개를 한 번만 띄워 두고 run(N)마다 재사용
+    - 워커마다 작업 큐를 따로 둬서 start 값이 정확히 하나씩 가도록 한다.
+    - spawn_time: 프로세스 시작부터 모든 워커가 준비될 때까지
+    '''
+    def __init__(self, P: int):
+        ctx = mp.get_context('spawn')
+        self.P = P
+        self.job_qs = [ctx.SimpleQueue() for _ in range(P)]
+        self.done_q = ctx.SimpleQueue()
+        self.procs = [ctx.Process(target=warm_rr_worker, args=(q, self.done_q)) for q in self.job_qs]
+        t0 = time.perf_counter()
+        for p in self.procs:
+            p.start()
+        for _ in range(P):
+            self.done_q.get()
+        self.spawn_time = time.perf_counter() - t0
+
+    def run(self, N: int):
+        t0 = time.perf_counter()
+        for start, q in enumerate(self.job_qs):
+            q.put((start, self.P, N))
+        for _ in range(self.P):
+            self.done_q.get()
+        return time.perf_counter() - t0
+
+    def close(self):
+        for q in self.job_qs:
+            q.put(None)
+        for p in self.procs:
+            p.join()
+
+
 def s15(value: str):
     return f'{value:15s}'
 
@@ -274,10 +487,13 @@ def b15(value: bool):
 
 
 # -------------- 벤치마크
-def benchmark(P_values, N, trials=3, warmups=1):
+def benchmark(P_values, N, trials=3, warmups=1, warm=False, results_path=None):
     '''
     P_values(코어 수)마다 결과를 구한다.
     warmup만큼 먼저 실행하고, trials만큼 실행한 결과의 중앙값을 구한다.
+    warm=True면 P마다 Pool/Process/스레드를 한 번만 띄워 재사용하고, spawn 시간은 따로 출력한다.
+    끝나면 방식별 통계(평균, 표준편차, p95, 신뢰구간, speedup, 효율, 직렬 비율 추정)를 출력하고
+    results_path에 저장한 뒤 행 목록을 반환한다.
     '''
 
     # 타겟 비밀번호
@@ -288,21 +504,30 @@ def benchmark(P_values, N, trials=3, warmups=1):
     target_dk = hashlib.pbkdf2_hmac('sha256', target_pw.encode(), SALT, PBKDF2_ITER)
 
     print(f'Target index: {target_idx}, password: {target_pw}')
-    print(f'N={N}, PBKDF2_ITER={PBKDF2_ITER}\n')
-    print(f'{s15('P')}{s15('Pool(s)')}{s15('Process(s)')}{s15('Winner')}(found_idx==target?)')
+    print(f'N={N}, PBKDF2_ITER={PBKDF2_ITER}, warm={warm}')
+    print(f'free-threaded build: {free_threaded_build()}, GIL enabled: {gil_enabled()}, '
+          f'auto backend (pbkdf2): {choose_backend(releases_gil=True)}\n')
+    spawn_header = f'{s15('Pool spawn(s)')}{s15('Proc spawn(s)')}' if warm else ''
+    print(f'{s15('P')}{s15('Pool(s)')}{s15('Process(s)')}{s15('Thread(s)')}{s15('Winner')}{spawn_header}(found_idx==target?)')
 
     best_core = 0
     best_method = None
     best_time = sys.maxsize
+    rows = []
     for P in P_values:
-        pool_times, proc_times = [], []
+        pool_times, proc_times, thread_times = [], [], []
         pool_found, proc_found = None, None
+        warm_pool, warm_procs, warm_threads = None, None, None
+        if warm:
+            warm_pool, pool_spawn = start_warm_pool(P)
+            warm_procs = WarmProcesses(P)
+            warm_threads = ThreadPoolExecutor(max_workers=P)
 
         for r in range(warmups + trials):
             # Pool
             try:
                 # f, t = run_with_pool(P, N, target_idx, SALT, target_dk, PBKDF2_ITER)
-                t = run_with_pool_full(P, N)
+                t = run_with_warm_pool(warm_pool, P, N) if warm else run_with_pool_full(P, N)
             except KeyboardInterrupt:
                 print('Interruped during Pool run.')
                 sys.exit(1)
@@ -316,7 +541,7 @@ def benchmark(P_values, N, trials=3, warmups=1):
             # Process
             try:
                 # f2, t2 = run_with_process(P, N, target_idx, SALT, target_dk, PBKDF2_ITER)
-                t2 = run_with_process_full(P, N)
+                t2 = warm_procs.run(N) if warm else run_with_process_full(P, N)
             except KeyboardInterrupt:
                 print('Interrupted during Process run.')
                 sys.exit(1)
@@ -324,31 +549,80 @@ def benchmark(P_values, N, trials=3, warmups=1):
                 proc_times.append(t2)
                 # proc_found = f2 or proc_found
 
+            # Thread
+            try:
+                t3 = run_with_threads_full(P, N, warm_threads)
+            except KeyboardInterrupt:
+                print('Interrupted during Thread run.')
+                sys.exit(1)
+            if r >= warmups:
+                thread_times.append(t3)
+
         # proc_med = statistics.median(proc_times)
         # print(proc_med)
 
-        pool_med = statistics.median(pool_times)
-        proc_med = statistics.median(proc_times)
-
-        if best_time > pool_med:
-            best_core = P
-            best_method = 'Pool'
-            best_time = pool_med
-        if best_time > proc_med:
-            best_core = P
-            best_method = 'Process'
-            best_time = proc_med
-        
-        winner = 'Pool' if pool_med < proc_med else 'Process'
+        spawn_cols = ''
+        if warm:
+            warm_pool.close()
+            warm_pool.join()
+            warm_procs.close()
+            warm_threads.shutdown()
+            spawn_cols = f'{f3s15(pool_spawn)}{f3s15(warm_procs.spawn_time)}'
+
+        medians = {}
+        for method, times in (('Pool', pool_times), ('Process', proc_times), ('Thread', thread_times)):
+            medians[method] = statistics.median(times)
+            row = {'method': method, 'P': P, **summarize(times), 'times': times}
+            if warm and method != 'Thread':
+                row['spawn'] = pool_spawn if method == 'Pool' else warm_procs.spawn_time
+            rows.append(row)
+
+        for method, med in medians.items():
+            if best_time > med:
+                best_core = P
+                best_method = method
+                best_time = med
+
+        winner = min(medians, key=medians.get)
         ok = (pool_found and pool_found[0] == target_idx) and (proc_found and proc_found[0] == target_idx)
-        print(f'{s15(str(P))}{f3s15(pool_med)}{f3s15(proc_med)}{s15(winner)}{b15(ok)}')
+        print(f'{s15(str(P))}{f3s15(medians['Pool'])}{f3s15(medians['Process'])}{f3s15(medians['Thread'])}'
+              f'{s15(winner)}{spawn_cols}{b15(ok)}')
 
     print(f'\nBest Core: {best_core}, Best Method: {best_method}, Best Time: {f3s15(best_time)}')
+
+    print_stats(rows)
+    if results_path:
+        meta = {'host': platform.node(), 'cpu_count': os.cpu_count(), 'python': platform.python_version(),
+                'N': N, 'pbkdf2_iter': PBKDF2_ITER, 'trials': trials, 'warmups': warmups, 'warm': warm,
+                'free_threaded': free_threaded_build(), 'gil_enabled': gil_enabled()}
+        write_results(results_path, rows, meta)
+        print(f'\nResults: {results_path}')
     print('\nDone.')
+    return rows
+
+
+def print_stats(rows):
+    '''
+    방식별 P 통계표 + Amdahl/Gustafson 직렬 비율 추정
+    - CI: 평균의 부트스트랩 95% 신뢰구간
+    - Speedup/Eff: P=1 평균 대비
+    '''
+    for method in dict.fromkeys(row['method'] for row in rows):
+        method_rows = add_scaling([row for row in rows if row['method'] == method])
+        print(f'\n[{method}]')
+        print(f'{s15('P')}{s15('mean(s)')}{s15('stddev')}{s15('min')}{s15('p95')}{s15('CI95')}{s15('Speedup')}{s15('Eff')}')
+        for row in method_rows:
+            ci = f'{row['ci_low']:.3f}-{row['ci_high']:.3f}'
+            print(f'{s15(str(row['P']))}{f3s15(row['mean'])}{f3s15(row['stddev'])}{f3s15(row['min'])}'
+                  f'{f3s15(row['p95'])}{s15(ci)}{f3s15(row['speedup'])}{f3s15(row['efficiency'])}')
+        amdahl = fit_amdahl(method_rows)
+        gustafson = fit_gustafson(method_rows)
+        if amdahl is not None:
+            print(f'serial fraction: Amdahl {amdahl:.3f}, Gustafson {gustafson:.3f}')
 
 
 if __name__ == '__main__':
     try:
-        benchmark(P_VALUES, N, trials=3, warmups=1)
+        benchmark(P_VALUES, N, trials=3, warmups=1, warm=WARM, results_path=RESULTS_PATH)
     except KeyboardInterrupt:
         print('\n[Main] Ctrl+C - exit.')
\ No newline at end of file
@@ -0,0 +1,140 @@
+from check_zip_crypto import KEY0, KEY1, KEY2, LCG_MULT, ZipTarget
+from crc32 import CRC_TABLE
+
+
+def key_step(k0: int, k1: int, k2: int, ch: int) -> tuple[int, int, int]:
+    '''
+    _update_keys와 같은 규칙으로 (k0, k1, k2)를 1바이트 갱신한 새 튜플 반환
+    - CRC 갱신은 테이블 1번 룩업: (c >> 8) ^ T[(c ^ b) & 0xff]
+    - 튜플을 반환하므로 접두사별 상태를 그대로 캐시해 둘 수 있다.
+    '''
+    k0 = (k0 >> 8) ^ CRC_TABLE[(k0 ^ ch) & 0xff]
+    k1 = ((k1 + (k0 & 0xff)) * LCG_MULT + 1) & 0xffffffff
+    k2 = (k2 >> 8) ^ CRC_TABLE[(k2 ^ (k1 >> 24)) & 0xff]
+    return k0, k1, k2
+
+
+def check_header_keys(k0: int, k1: int, k2: int, enc12: bytes, check_byte: int) -> bool:
+    '''
+    비밀번호로 초기화된 키 상태로 12바이트 헤더를 복호화하고 검증 바이트 비교
+    '''
+    T = CRC_TABLE
+    for c in enc12[:11]:
+        t = (k2 & 0xffff) | 2
+        b = c ^ (((t * (t ^ 1)) >> 8) & 0xff)
+        k0 = (k0 >> 8) ^ T[(k0 ^ b) & 0xff]
+        k1 = ((k1 + (k0 & 0xff)) * LCG_MULT + 1) & 0xffffffff
+        k2 = (k2 >> 8) ^ T[(k2 ^ (k1 >> 24)) & 0xff]
+    t = (k2 & 0xffff) | 2
+    return enc12[11] ^ (((t * (t ^ 1)) >> 8) & 0xff) == check_byte
+
+
+def _index_to_digits(index: int, base: int, length: int) -> list[int]:
+    digits = [0] * length
+    for p in range(length - 1, -1, -1):
+        index, digits[p] = divmod(index, base)
+    return digits
+
+
+def iter_prefix_keys(charset: str | bytes, length: int, start: int = 0, stop: int | None = None):
+    '''
+    키 공간을 트리로 순회하며 (index, password, (k0, k1, k2)) 반환
+    - 순서와 index는 door_hacking.make_password, itertools.product(CHARSET, repeat=length)와 같다.
+    - 깊이 d까지의 접두사 키 상태를 states[d]에 캐시해 두고,
+      자릿수가 바뀐 위치부터만 다시 계산한다.
+      -> 마지막 글자는 매번 1번, 그 앞 글자는 len(charset)번에 1번 ... 키 갱신
+    - start, stop으로 [start, stop) 구간만 순회 (샤딩/재시작용)
+    '''
+    cs = charset.encode() if isinstance(charset, str) else bytes(charset)
+    base = len(cs)
+    total = base ** length
+    stop = total if stop is None else min(stop, total)
+    if length == 0 or start >= stop:
+        return
+
+    digits = _index_to_digits(start, base, length)
+    pwd = bytearray(cs[d] for d in digits)
+    last = length - 1
+
+    # states[d]: 앞 d글자를 넣은 뒤의 키 상태
+    states = [(KEY0, KEY1, KEY2)] * length
+    for d in range(last):
+        states[d + 1] = key_step(*states[d], pwd[d])
+
+    index = start
+    while True:
+        k0, k1, k2 = states[last]
+        for j in range(digits[last], base):
+            ch = cs[j]
+            pwd[last] = ch
+            yield index, bytes(pwd), key_step(k0, k1, k2, ch)
+            index += 1
+            if index >= stop:
+                return
+
+        # 자리올림: 마지막 자리는 0으로, 그 앞에서 base-1이 아닌 첫 자리를 1 증가
+        digits[last] = 0
+        p = last - 1
+        while p >= 0 and digits[p] == base - 1:
+            digits[p] = 0
+            p -= 1
+        if p < 0:
+            return
+        digits[p] += 1
+        # 바뀐 자리(p)부터 마지막 앞자리까지만 키 상태 재계산
+        for q in range(p, last):
+            pwd[q] = cs[digits[q]]
+            states[q + 1] = key_step(*states[q], pwd[q])
+
+
+def search_prefix(target: ZipTarget, charset: str | bytes, length: int, start: int = 0, stop: int | None = None) -> list[tuple[int, str]]:
+    '''
+    iter_prefix_keys로 [start, stop) 구간을 순회하며 target의 모든 ZipCrypto 엔트리 검증 바이트를 통과한 후보를 찾는다.
+    - 검증 바이트를 통과한 후보는 target.verify로 한 번 더 확인
+    - (index, password) 목록 반환
+    '''
+    headers = [(e.enc12, e.check_byte) for e in target.zipcrypto_entries]
+    if not headers:
+        return []
+    enc12, check_byte = headers[0]
+    rest = headers[1:]
+
+    found = []
+    for index, pwd, keys in iter_prefix_keys(charset, length, start, stop):
+        if not check_header_keys(*keys, enc12, check_byte):
+            continue
+        if not all(check_header_keys(*keys, e, c) for e, c in rest):
+            continue
+        if target.verify(pwd):
+            found.append((index, pwd.decode()))
+    return found
+
+
+if __name__ == '__main__':
+    import itertools, string, time
+    from check_zip_crypto import _init_keys
+
+    ZIP_PATH = 'emergency_storage_key.zip'
+    CHARSET = string.digits + string.ascii_lowercase
+    NTRIES = 200_000
+
+    # 키 상태가 _init_keys와 같은지 확인
+    for (index, pwd, keys), tup in zip(iter_prefix_keys(CHARSET, 6, 36 ** 5 - 100, 36 ** 5 + 100),
+                                       itertools.islice(itertools.product(CHARSET, repeat=6), 36 ** 5 - 100, 36 ** 5 + 100)):
+        assert pwd.decode() == ''.join(tup)
+        assert list(keys) == _init_keys(pwd)
+    print('prefix keys vs _init_keys: OK')
+
+    target = ZipTarget(ZIP_PATH)
+
+    t0 = time.perf_counter()
+    for tup in itertools.islice(itertools.product(CHARSET, repeat=6), NTRIES):
+        target.check(''.join(tup))
+    base_rate = NTRIES / (time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    search_prefix(target, CHARSET, 6, 0, NTRIES)
+    prefix_rate = NTRIES / (time.perf_counter() - t0)
+
+    print(f'ZipTarget.check: {base_rate:.0f} tries/s')
+    print(f'search_prefix:   {prefix_rate:.0f} tries/s')
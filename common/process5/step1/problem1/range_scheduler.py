@@ -0,0 +1,165 @@
+import bisect
+import queue
+import time
+import multiprocessing
+
+# 청크 크기 범위와 청크 하나를 처리하는 목표 시간(초)
+MIN_CHUNK = 16
+MAX_CHUNK = 1 << 20
+TARGET_SECONDS = 0.5
+
+# 진행 중인 청크가 없는 워커 슬롯 표시
+IDLE = -1
+
+
+class RangeScheduler:
+    '''
+    [start, limit) 인덱스 공간을 연속 구간(청크)으로 나눠 워커에게 나눠주는 스케줄러
+    - 비밀번호 하나마다 공유 카운터 락을 잡는 대신, 청크 하나마다 한 번만 락을 잡는다.
+    - 워커는 청크 처리 시간을 재서 TARGET_SECONDS에 맞게 청크 크기를 스스로 조절한다.
+    - checkpoint()는 "이 인덱스 앞은 모두 처리 완료"인 위치를 반환, start로 넘기면 이어서 탐색
+    - todo로 처리할 구간 목록을 주면 그 구간들만 나눠준다. (체크포인트 재시작용)
+    - track=True면 완료된 청크를 큐로 보내고, 부모는 drain()으로 받아 체크포인트에 기록한다.
+    - spawn 컨텍스트로 만든 객체는 Process 인자로 그대로 넘길 수 있다.
+    '''
+    def __init__(self, ctx, limit: int, workers: int, start: int = 0,
+                 min_chunk: int = MIN_CHUNK, max_chunk: int = MAX_CHUNK, target_seconds: float = TARGET_SECONDS,
+                 todo: list[tuple[int, int]] | None = None, track: bool = False):
+        self.limit = limit
+        self.min_chunk = min_chunk
+        self.max_chunk = max_chunk
+        self.target_seconds = target_seconds
+
+        # 처리할 구간들을 이어 붙인 가상 공간 [0, total)을 나눠주고, 실제 인덱스로 변환한다.
+        self.todo = [(lo, hi) for lo, hi in (todo if todo is not None else [(start, limit)]) if lo < hi]
+        self.offsets = []
+        total = 0
+        for lo, hi in self.todo:
+            self.offsets.append(total)
+            total += hi - lo
+        self.total = total
+
+        # 'i'(32비트)는 36^6(약 2.18e9)을 넘지 못하므로 'q'(64비트) 사용
+        self.next = ctx.Value('q', 0)
+        self.done = ctx.Value('q', 0)
+        # 워커별 처리 중인 청크 시작 인덱스 (락 없이 자기 슬롯만 쓴다)
+        self.in_flight = ctx.RawArray('q', [IDLE] * workers)
+        self.completed = ctx.Queue() if track else None
+
+    def _to_index(self, pos: int) -> tuple[int, int]:
+        '''
+        가상 위치 pos -> (실제 인덱스, 그 구간의 끝)
+        '''
+        k = bisect.bisect_right(self.offsets, pos) - 1
+        lo, hi = self.todo[k]
+        return lo + pos - self.offsets[k], hi
+
+    def claim(self, worker_id: int, size: int) -> tuple[int, int] | None:
+        '''
+        다음 청크 [lo, hi) 하나를 가져온다. 더 없으면 None
+        - 청크는 todo 구간 경계를 넘지 않는다.
+        '''
+        with self.next.get_lock():
+            pos = self.next.value
+            if pos >= self.total:
+                return None
+            lo, end = self._to_index(pos)
+            hi = min(lo + size, end)
+            self.next.value = pos + hi - lo
+            # 락 안에서 기록해야 checkpoint가 빈틈을 보지 않는다.
+            self.in_flight[worker_id] = lo
+        return lo, hi
+
+    def complete(self, worker_id: int, lo: int, hi: int):
+        '''
+        청크 하나 처리 완료 보고
+        '''
+        self.in_flight[worker_id] = IDLE
+        with self.done.get_lock():
+            self.done.value += hi - lo
+        if self.completed is not None:
+            self.completed.put((lo, hi))
+
+    def drain(self) -> list[tuple[int, int]]:
+        '''
+        (부모 프로세스) 지금까지 완료 보고된 청크 목록을 꺼낸다.
+        '''
+        chunks = []
+        if self.completed is None:
+            return chunks
+        while True:
+            try:
+                chunks.append(self.completed.get_nowait())
+            except queue.Empty:
+                return chunks
+
+    def ranges(self, worker_id: int, stop_event=None):
+        '''
+        워커 루프용 제너레이터: (lo, hi) 청크를 하나씩 반환
+        - 다음 청크를 요청할 때 직전 청크를 완료 처리하고, 걸린 시간으로 청크 크기 조절
+        - stop_event가 set되면 종료 (직전 청크는 완료로 보고하지 않는다)
+        '''
+        size = self.min_chunk
+        while stop_event is None or not stop_event.is_set():
+            chunk = self.claim(worker_id, size)
+            if chunk is None:
+                return
+            t0 = time.perf_counter()
+            yield chunk
+            if stop_event is not None and stop_event.is_set():
+                return
+            self.complete(worker_id, *chunk)
+            size = self._next_size(size, time.perf_counter() - t0)
+
+    def _next_size(self, size: int, elapsed: float) -> int:
+        # 한 번에 2배 이상 바뀌지 않도록 제한해서 측정 노이즈에 덜 흔들리게 한다.
+        if elapsed <= 0:
+            scaled = size * 2
+        else:
+            scaled = int(size * self.target_seconds / elapsed)
+        scaled = max(size // 2, min(size * 2, scaled))
+        return max(self.min_chunk, min(self.max_chunk, scaled))
+
+    def checkpoint(self) -> int:
+        '''
+        재시작 위치: 처리 중인 청크 중 가장 앞 시작 인덱스, 없으면 다음에 나눠줄 인덱스
+        - todo 구간 사이의 빈틈(이미 완료된 구간)은 건너뛴 위치 기준
+        '''
+        with self.next.get_lock():
+            pending = [lo for lo in self.in_flight if lo != IDLE]
+            if pending:
+                return min(pending)
+            if self.next.value >= self.total:
+                return self.limit
+            return self._to_index(self.next.value)[0]
+
+    def processed(self) -> int:
+        return self.done.value
+
+    def throughput(self, elapsed: float) -> float:
+        '''
+        전체 워커 합산 처리량(개/초)
+        '''
+        return self.done.value / elapsed if elapsed > 0 else 0.0
+
+
+def _demo_worker(scheduler: RangeScheduler, worker_id: int):
+    for lo, hi in scheduler.ranges(worker_id):
+        for i in range(lo, hi):
+            pass
+
+
+if __name__ == '__main__':
+    ctx = multiprocessing.get_context('spawn')
+    P = ctx.cpu_count()
+    LIMIT = 50_000_000
+    scheduler = RangeScheduler(ctx, LIMIT, P, target_seconds=0.1)
+
+    t0 = time.perf_counter()
+    procs = [ctx.Process(target=_demo_worker, args=(scheduler, w)) for w in range(P)]
+    for p in procs: p.start()
+    for p in procs: p.join()
+    elapsed = time.perf_counter() - t0
+
+    assert scheduler.processed() == LIMIT
+    print(f'{P} workers: {scheduler.throughput(elapsed):.0f} items/s, checkpoint={scheduler.checkpoint()}')
@@ -0,0 +1,118 @@
+import time
+from multiprocessing import shared_memory
+
+# 워커가 플래그를 확인하는 최대 간격(초), 중단 요청 후 이 시간 안에 멈춘다.
+MAX_STOP_LATENCY = 0.05
+
+# 처음에는 후보마다 확인하고, 이후 측정한 후보당 시간으로 간격을 늘린다.
+INITIAL_INTERVAL = 1
+MAX_INTERVAL = 1 << 16
+
+# wait()에서 플래그를 다시 읽는 간격(초)
+WAIT_POLL = 0.01
+
+
+class StopFlag:
+    '''
+    multiprocessing.Event 대신 쓰는 조기 종료 플래그
+    - 1바이트 공유 메모리(multiprocessing.shared_memory)를 읽고 쓰기만 하므로
+      is_set()에 세마포어/락 왕복이나 시스템 호출이 없다.
+    - set/is_set/wait가 Event와 같아서 RangeScheduler.ranges 등에 그대로 넘길 수 있다.
+    - spawn 자식에게는 이름만 pickle 되고, 자식은 같은 블록에 붙는다.
+      (자식의 resource_tracker 등록은 부모와 같은 tracker로 가므로 중복 등록돼도 한 번만 관리된다)
+    - 만든 프로세스(owner)가 끝날 때 unlink() 해야 한다.
+    '''
+    def __init__(self, name: str | None = None):
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=1)
+        if self.owner:
+            self.shm.buf[0] = 0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def set(self):
+        self.shm.buf[0] = 1
+
+    def clear(self):
+        self.shm.buf[0] = 0
+
+    def is_set(self) -> bool:
+        return self.shm.buf[0] != 0
+
+    def wait(self, timeout: float | None = None) -> bool:
+        '''
+        Event.wait처럼 set될 때까지(또는 timeout까지) 대기, 플래그 상태 반환
+        '''
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.is_set():
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                time.sleep(min(WAIT_POLL, remaining))
+            else:
+                time.sleep(WAIT_POLL)
+        return True
+
+    def poller(self, max_latency: float = MAX_STOP_LATENCY) -> 'StopPoller':
+        return StopPoller(self, max_latency)
+
+    def close(self):
+        self.shm.close()
+
+    def unlink(self):
+        '''
+        (owner) 공유 메모리 해제, 모든 프로세스가 끝난 뒤 한 번만 호출
+        '''
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __getstate__(self):
+        return {'name': self.shm.name}
+
+    def __setstate__(self, state):
+        self.owner = False
+        self.shm = shared_memory.SharedMemory(name=state['name'])
+
+
+class StopPoller:
+    '''
+    워커 핫 루프용: 후보 N개마다 한 번만 플래그를 읽는다.
+    - N은 실제로 걸린 시간을 보고 조절해서 확인 간격이 max_latency를 넘지 않게 한다.
+      (후보 하나가 max_latency보다 오래 걸리면 매 후보마다 확인)
+    - tick()은 카운터 감소와 비교만 하므로 후보마다 호출해도 비용이 거의 없다.
+    - 한 번 중단을 확인하면 이후 tick()은 계속 True
+    '''
+    def __init__(self, flag: StopFlag, max_latency: float = MAX_STOP_LATENCY):
+        self.flag = flag
+        self.max_latency = max_latency
+        self.interval = INITIAL_INTERVAL
+        self.countdown = INITIAL_INTERVAL
+        self.last = time.perf_counter()
+        self.stopped = False
+
+    def tick(self) -> bool:
+        '''
+        후보 하나 처리할 때마다 호출, 중단해야 하면 True
+        '''
+        self.countdown -= 1
+        if self.countdown > 0:
+            return self.stopped
+        return self._poll()
+
+    def _poll(self) -> bool:
+        now = time.perf_counter()
+        elapsed = now - self.last
+        self.last = now
+        # 확인 간격이 목표의 절반 정도가 되도록 (늘릴 때는 한 번에 2배까지, 줄일 때는 바로)
+        if elapsed <= 0:
+            scaled = self.interval * 2
+        else:
+            scaled = int(self.interval * self.max_latency / 2 / elapsed)
+        self.interval = max(1, min(self.interval * 2, scaled, MAX_INTERVAL))
+        self.countdown = self.interval
+        self.stopped = self.stopped or self.flag.is_set()
+        return self.stopped
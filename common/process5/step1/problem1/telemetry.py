@@ -0,0 +1,157 @@
+import json
+import sys
+import time
+
+# 워커 슬롯 하나의 필드: 누적 시도 횟수, 누적 CPU 시간(초), 마지막 보고 시각
+TRIES = 0
+CPU = 1
+UPDATED = 2
+FIELDS = 3
+
+# 처리량 지수 이동 평균 가중치 (최근 구간 비중)
+EWMA_ALPHA = 0.3
+
+
+class WorkerMetrics:
+    '''
+    워커별 카운터를 공유 메모리(RawArray)에 두는 지표 채널
+    - 워커는 자기 슬롯만 쓰므로 락이 필요 없다.
+    - 후보마다가 아니라 청크를 끝낼 때마다 report()를 한 번 호출한다.
+      (time.process_time 등 시스템 호출도 청크당 한 번)
+    - 부모는 snapshot()으로 모든 슬롯을 읽어 집계한다.
+    '''
+    def __init__(self, ctx, workers: int):
+        self.workers = workers
+        self.slots = ctx.RawArray('d', workers * FIELDS)
+
+    def report(self, worker_id: int, tries: int):
+        '''
+        (워커) 이번 청크에서 시도한 개수를 누적하고 CPU 시간 갱신
+        '''
+        base = worker_id * FIELDS
+        self.slots[base + TRIES] += tries
+        self.slots[base + CPU] = time.process_time()
+        self.slots[base + UPDATED] = time.time()
+
+    def snapshot(self) -> list[tuple[float, float, float]]:
+        '''
+        (부모) 워커별 (누적 시도 횟수, 누적 CPU 시간, 마지막 보고 시각)
+        '''
+        values = self.slots[:]
+        return [tuple(values[w * FIELDS:(w + 1) * FIELDS]) for w in range(self.workers)]
+
+
+class TelemetryAggregator:
+    '''
+    WorkerMetrics를 주기적으로 읽어 전체 지표를 계산
+    - tries_per_sec: 직전 샘플 이후 처리량, avg_tries_per_sec: 지수 이동 평균
+    - eta_seconds: 남은 후보 / 평균 처리량
+    - skew: 워커별 처리량의 (최대 - 최소) / 평균 (0이면 고르게 분배)
+    - cpu_util: 워커 CPU 시간 증가량 / 같은 워커의 보고 시각 증가량의 평균
+      (워커는 청크 끝에서만 보고하므로 부모의 샘플 간격이 아니라 워커 자신의 보고 간격으로 나눈다)
+    '''
+    def __init__(self, metrics: WorkerMetrics, total: int, already_done: int = 0):
+        self.metrics = metrics
+        self.total = total
+        self.already_done = already_done
+        self.started = time.time()
+        self.last_time = self.started
+        self.last = metrics.snapshot()
+        self.avg_rate = 0.0
+
+    def sample(self) -> dict:
+        now = time.time()
+        current = self.metrics.snapshot()
+        dt = max(now - self.last_time, 1e-9)
+
+        rates = [(c[TRIES] - p[TRIES]) / dt for c, p in zip(current, self.last)]
+        # 첫 보고 이전(p[UPDATED] == 0)은 프로세스 시작 비용이 섞이므로 제외
+        utils = [(c[CPU] - p[CPU]) / (c[UPDATED] - p[UPDATED])
+                 for c, p in zip(current, self.last) if p[UPDATED] > 0 and c[UPDATED] > p[UPDATED]]
+        rate = sum(rates)
+        self.avg_rate = rate if self.avg_rate == 0 else EWMA_ALPHA * rate + (1 - EWMA_ALPHA) * self.avg_rate
+
+        tried = sum(c[TRIES] for c in current)
+        done = self.already_done + tried
+        remaining = max(self.total - done, 0)
+        mean = rate / len(rates) if rates else 0.0
+
+        self.last = current
+        self.last_time = now
+        return {
+            'time': round(now, 3),
+            'elapsed': round(now - self.started, 3),
+            'tried': int(tried),
+            'done': int(done),
+            'total': self.total,
+            'progress': done / self.total if self.total else 1.0,
+            'tries_per_sec': round(rate, 1),
+            'avg_tries_per_sec': round(self.avg_rate, 1),
+            'eta_seconds': round(remaining / self.avg_rate, 1) if self.avg_rate > 0 else None,
+            'skew': round((max(rates) - min(rates)) / mean, 3) if mean > 0 else 0.0,
+            'cpu_util': round(sum(utils) / len(utils), 3) if utils else None,
+            'per_worker': [round(r, 1) for r in rates],
+        }
+
+
+def format_eta(seconds: float | None) -> str:
+    if seconds is None:
+        return '--:--:--'
+    seconds = int(seconds)
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    prefix = f'{days}d ' if days else ''
+    return f'{prefix}{hours:02d}:{minutes:02d}:{seconds:02d}'
+
+
+def format_dashboard(stats: dict) -> str:
+    cpu = '  -  ' if stats['cpu_util'] is None else f'{stats["cpu_util"] * 100:5.1f}%'
+    return (f'{stats["progress"] * 100:6.2f}% | {stats["tries_per_sec"]:10.0f} tries/s '
+            f'(avg {stats["avg_tries_per_sec"]:.0f}) | ETA {format_eta(stats["eta_seconds"])} | '
+            f'skew {stats["skew"]:.2f} | CPU {cpu}')
+
+
+class TelemetryPrinter:
+    '''
+    집계 결과 출력
+    - mode='dashboard': 한 줄을 \\r로 덮어쓰는 실시간 표시
+    - mode='json': JSON Lines (한 줄에 샘플 하나)
+    - mode='none': 출력 안 함
+    '''
+    def __init__(self, mode: str = 'dashboard', stream=None):
+        self.mode = mode
+        self.stream = stream or sys.stdout
+        # 마지막 대시보드 줄 길이 (note가 덮어쓸 때 남은 글자 지우기)
+        self.width = 0
+
+    def emit(self, stats: dict):
+        if self.mode == 'json':
+            self.stream.write(json.dumps(stats) + '\n')
+        elif self.mode == 'dashboard':
+            line = format_dashboard(stats)
+            self.width = len(line)
+            self.stream.write('\r' + line)
+        else:
+            return
+        self.stream.flush()
+
+    def note(self, event: str, record: dict, text: str):
+        '''
+        샘플 사이의 알림 한 건 (예: 예산 예측)
+        - json: {'event': event, **record} 한 줄, dashboard: 현재 줄을 text로 덮어쓰고 줄바꿈
+        '''
+        if self.mode == 'json':
+            self.stream.write(json.dumps({'event': event, **record}) + '\n')
+        elif self.mode == 'dashboard':
+            self.stream.write('\r' + text.ljust(self.width) + '\n')
+            self.width = 0
+        else:
+            return
+        self.stream.flush()
+
+    def close(self):
+        # 덮어쓰던 대시보드 줄이 남아 있을 때만 줄바꿈 (note가 이미 줄을 끝냈으면 생략)
+        if self.mode == 'dashboard' and self.width:
+            self.stream.write('\n')
+            self.stream.flush()
@@ -0,0 +1,145 @@
+import numpy as np
+
+from check_zip_crypto import KEY0, KEY1, KEY2, LCG_MULT, ZipReader, ZipTarget, read_zipcrypto_header
+import crc32
+
+# k1 선형합동법(LCG) 곱셈 상수 (uint32 배열 연산용)
+LCG_MUL = np.uint32(LCG_MULT)
+
+# 0~255 바이트의 CRC 보정값 테이블 (crc32.CRC_TABLE을 uint32 배열로 만들어 두고 배치 인덱싱에 사용)
+CRC_TABLE = np.array(crc32.CRC_TABLE, dtype=np.uint32)
+
+
+def encode_passwords(passwords) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    후보 비밀번호 목록을 (B, L) uint8 행렬과 길이 배열로 변환
+    - str, bytes 모두 허용
+    - L은 가장 긴 비밀번호 길이, 짧은 비밀번호 뒤쪽은 0으로 채운다(lengths로 구분)
+    '''
+    pwds = [p.encode() if isinstance(p, str) else bytes(p) for p in passwords]
+    lengths = np.fromiter((len(p) for p in pwds), dtype=np.int64, count=len(pwds))
+    width = int(lengths.max()) if len(pwds) else 0
+
+    # 길이가 모두 같으면 join 한 번으로 행렬 생성 (가장 흔한 브루트포스 경우)
+    if len(pwds) and (lengths == width).all():
+        mat = np.frombuffer(b''.join(pwds), dtype=np.uint8).reshape(len(pwds), width)
+        return mat, lengths
+
+    mat = np.zeros((len(pwds), width), dtype=np.uint8)
+    for row, p in enumerate(pwds):
+        mat[row, :len(p)] = np.frombuffer(p, dtype=np.uint8)
+    return mat, lengths
+
+
+def _crc_32_update_batch(c: np.ndarray, b: np.ndarray) -> np.ndarray:
+    '''
+    _crc_32_update의 배치 버전
+    - ZipCrypto 상태 그대로 테이블 1번 룩업: (c >> 8) ^ T[(c ^ b) & 0xff]
+    '''
+    return (c >> np.uint32(8)) ^ CRC_TABLE[(c ^ b) & np.uint32(0xff)]
+
+
+def update_keys_batch(k0: np.ndarray, k1: np.ndarray, k2: np.ndarray, ch: np.ndarray):
+    '''
+    _update_keys의 배치 버전
+    - k0, k1, k2, ch 모두 길이 B의 uint32 배열
+    - uint32 배열 연산은 2^32에서 자동으로 잘리므로 & 0xffffffff가 필요 없다.
+    '''
+    k0 = _crc_32_update_batch(k0, ch)
+    k1 = (k1 + (k0 & np.uint32(0xff))) * LCG_MUL + np.uint32(1)
+    k2 = _crc_32_update_batch(k2, k1 >> np.uint32(24))
+    return k0, k1, k2
+
+
+def init_keys_batch(mat: np.ndarray, lengths: np.ndarray):
+    '''
+    _init_keys의 배치 버전
+    - mat: (B, L) uint8 비밀번호 행렬, lengths: 각 행의 실제 길이
+    - 길이가 다른 비밀번호가 섞여 있으면 i번째 글자가 있는 행만 갱신
+    '''
+    n = mat.shape[0]
+    k0 = np.full(n, KEY0, dtype=np.uint32)
+    k1 = np.full(n, KEY1, dtype=np.uint32)
+    k2 = np.full(n, KEY2, dtype=np.uint32)
+    uniform = n == 0 or (lengths == mat.shape[1]).all()
+
+    for i in range(mat.shape[1]):
+        n0, n1, n2 = update_keys_batch(k0, k1, k2, mat[:, i].astype(np.uint32))
+        if uniform:
+            k0, k1, k2 = n0, n1, n2
+        else:
+            alive = lengths > i
+            k0 = np.where(alive, n0, k0)
+            k1 = np.where(alive, n1, k1)
+            k2 = np.where(alive, n2, k2)
+    return k0, k1, k2
+
+
+def decrypt_byte_batch(k2: np.ndarray) -> np.ndarray:
+    '''
+    _decrypt_byte의 배치 버전
+    - t < 2^16이므로 t * (t ^ 1) < 2^32, uint32 범위 안에서 계산된다.
+    '''
+    t = (k2 & np.uint32(0xffff)) | np.uint32(2)
+    return ((t * (t ^ np.uint32(1))) >> np.uint32(8)) & np.uint32(0xff)
+
+
+def decrypt_header12_batch(enc12: bytes, k0: np.ndarray, k1: np.ndarray, k2: np.ndarray) -> np.ndarray:
+    '''
+    _decrypt_header12의 배치 버전
+    - 초기화된 키 배열로 12바이트 암호 헤더를 복호화해서 (B, 12) uint8 행렬 반환
+    '''
+    out = np.empty((k0.shape[0], len(enc12)), dtype=np.uint8)
+    for i, c in enumerate(enc12):
+        b = decrypt_byte_batch(k2) ^ np.uint32(c)
+        out[:, i] = b
+        k0, k1, k2 = update_keys_batch(k0, k1, k2, b)
+    return out
+
+
+def check_header_batch(enc12: bytes, check_byte: int, passwords) -> np.ndarray:
+    '''
+    후보 비밀번호 배치를 한 번에 검증해서 bool 마스크 반환
+    - mask[i]가 True면 passwords[i]의 복호화된 헤더 마지막 바이트가 검증 바이트와 일치
+    - 1바이트 검증이므로 우연히 맞을 확률 1/256은 그대로 남는다.
+    '''
+    mat, lengths = encode_passwords(passwords)
+    dec12 = decrypt_header12_batch(enc12, *init_keys_batch(mat, lengths))
+    return dec12[:, -1] == check_byte
+
+
+def zipcrypto_password_valid_batch(zip_file: str | ZipReader | ZipTarget, passwords, entry_index: int = 0) -> np.ndarray:
+    '''
+    zipcrypto_password_valid의 배치 버전
+    - 헤더는 한 번만 읽고, 후보 전체를 NumPy 배열 연산으로 검증
+    - AES-Zip, 비암호 Zip은 모두 False인 마스크 반환
+    '''
+    header = read_zipcrypto_header(zip_file, entry_index)
+    if header is None:
+        return np.zeros(len(passwords), dtype=bool)
+    enc12, check_byte = header
+    return check_header_batch(enc12, check_byte, passwords)
+
+
+if __name__ == '__main__':
+    import itertools, string, time
+    from check_zip_crypto import zipcrypto_password_valid
+
+    ZIP_PATH = 'emergency_storage_key.zip'
+    CHARSET = string.digits + string.ascii_lowercase
+    BATCH = 36 ** 4
+
+    passwords = [''.join(t) for t in itertools.islice(itertools.product(CHARSET, repeat=6), BATCH)]
+
+    # 스칼라 구현과 결과 비교
+    mask = zipcrypto_password_valid_batch(ZIP_PATH, passwords[:2000])
+    # 후보마다 zip을 다시 파싱하지 않도록 한 번 연 ZipReader를 넘긴다.
+    with ZipReader(ZIP_PATH) as reader:
+        expect = [zipcrypto_password_valid(reader, p) for p in passwords[:2000]]
+    assert mask.tolist() == expect
+    print('scalar vs batch: OK')
+
+    t0 = time.perf_counter()
+    mask = zipcrypto_password_valid_batch(ZIP_PATH, passwords)
+    elapsed = time.perf_counter() - t0
+    print(f'{BATCH} candidates: {BATCH / elapsed:.0f} tries/s, hits: {int(mask.sum())}')
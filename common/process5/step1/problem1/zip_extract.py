@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import zlib
+
+import pyzipper
+
+# 메모리로 복호화할 최대 크기(바이트), 넘으면 후보 검증에 쓰지 않는다.
+MAX_EXTRACT_BYTES = 64 * 1024 * 1024
+
+
+class ExtractTooLarge(ValueError):
+    '''
+    압축 해제 크기 합이 한도를 넘는 zip (후보와 관계없는 설정 오류)
+    '''
+
+
+def check_extract_size(zip_path: str, max_bytes: int = MAX_EXTRACT_BYTES) -> int:
+    '''
+    비밀번호 없이 중앙 디렉터리만 보고 압축 해제 크기 합 반환
+    - max_bytes를 넘으면 ExtractTooLarge, 탐색을 시작하기 전에 한 번 호출
+    '''
+    with pyzipper.AESZipFile(zip_path) as zf:
+        total = sum(info.file_size for info in zf.infolist() if not info.is_dir())
+    if total > max_bytes:
+        raise ExtractTooLarge(f'압축 해제 크기 {total} bytes가 한도 {max_bytes} bytes 초과: {zip_path}')
+    return total
+
+
+def read_verified(zip_path: str, password: str | bytes, max_bytes: int = MAX_EXTRACT_BYTES) -> dict[str, bytes] | None:
+    '''
+    모든 엔트리를 메모리로 복호화/압축 해제해서 {이름: 데이터} 반환
+    - 디스크에는 아무것도 쓰지 않는다.
+    - zipfile/pyzipper는 엔트리를 끝까지 읽을 때 CRC(AES는 HMAC)를 확인하므로,
+      반환값이 있으면 비밀번호가 맞고 데이터도 온전하다.
+    - 비밀번호가 틀리면 None
+    - 압축 해제 크기 합이 max_bytes를 넘으면 ExtractTooLarge (압축 폭탄, 메모리 초과 방지)
+      비밀번호와 관계없으므로 호출하는 쪽은 check_extract_size로 미리 확인해 둔다.
+    '''
+    pwd = password.encode('utf-8') if isinstance(password, str) else password
+    files = {}
+    try:
+        with pyzipper.AESZipFile(zip_path) as zf:
+            zf.pwd = pwd
+            infos = [info for info in zf.infolist() if not info.is_dir()]
+            if sum(info.file_size for info in infos) > max_bytes:
+                raise ExtractTooLarge(f'압축 해제 크기가 {max_bytes} bytes 초과: {zip_path}')
+            for info in infos:
+                with zf.open(info) as f:
+                    # 헤더의 file_size를 믿지 않고 읽는 양도 제한
+                    data = f.read(info.file_size + 1)
+                if len(data) != info.file_size:
+                    return None
+                files[info.filename] = data
+    except (RuntimeError, pyzipper.BadZipFile, zlib.error):
+        return None
+    return files
+
+
+def _safe_path(dest: str, name: str) -> str:
+    '''
+    엔트리 이름을 dest 아래 경로로 변환 (절대 경로, .. 제거)
+    '''
+    parts = [p for p in name.replace('\\', '/').split('/') if p not in ('', '.', '..')]
+    if not parts:
+        raise ValueError(f'잘못된 엔트리 이름: {name!r}')
+    return os.path.join(dest, *parts)
+
+
+def write_atomic(files: dict[str, bytes], dest: str):
+    '''
+    메모리의 파일들을 dest 아래에 쓴다.
+    - 같은 파일 시스템의 임시 디렉터리에 먼저 다 쓰고 fsync 한 뒤, 파일마다 os.replace로 옮긴다.
+    - 중간에 종료돼도 dest에는 내용이 반쯤 쓰인 파일이 남지 않는다.
+    '''
+    os.makedirs(dest, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix='.extract-', dir=os.path.dirname(os.path.abspath(dest)))
+    try:
+        staged = []
+        for i, (name, data) in enumerate(files.items()):
+            tmp_path = os.path.join(tmp_dir, str(i))
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            staged.append((tmp_path, _safe_path(dest, name)))
+
+        for tmp_path, final_path in staged:
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            os.replace(tmp_path, final_path)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def write_text_atomic(path: str, text: str):
+    '''
+    텍스트 파일 하나를 원자적으로 쓰기 (임시 파일 + os.replace)
+    '''
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
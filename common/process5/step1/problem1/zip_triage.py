@@ -0,0 +1,197 @@
+'''
+ZIP 여러 개를 한 번에 분류하는 트리아지 스캐너
+- 디렉터리를 돌며 zip마다 mmap으로 중앙 디렉터리만 파싱 (파일 전체를 읽지 않는다)
+- 엔트리별 압축 방식, 암호 방식(ZipCrypto / AES-128/192/256), 데이터 디스크립터 여부 분류
+- 가장 싸게 검증할 수 있는 엔트리 기준으로 브루트포스 예상 시간을 계산하고,
+  예상 시간이 짧은 순서로 작업 목록(JSON Lines)을 흘려 보낸다.
+- 출력은 window 크기의 힙으로 순서를 맞추므로, 전체를 다 읽기 전에 첫 작업이 나온다.
+  (window=0이면 끝까지 읽고 전체 정렬)
+'''
+import argparse
+import heapq
+import itertools
+import json
+import os
+import struct
+import sys
+import time
+
+from candidates import make_generator
+from check_zip_crypto import ZipEntry, ZipReader, _init_keys, _decrypt_stream
+from aes_zip_verify import derive_verifier
+import door_hacking
+
+METHOD_NAMES = {0: 'stored', 8: 'deflate', 9: 'deflate64', 12: 'bzip2', 14: 'lzma', 93: 'zstd', 95: 'xz', 99: 'aes'}
+AES_NAMES = {1: 'aes-128', 2: 'aes-192', 3: 'aes-256'}
+
+# 작업 목록 정렬 창 크기 (이만큼 모이면 가장 싼 작업부터 내보낸다)
+DEFAULT_WINDOW = 256
+
+# 검증 속도 측정 시간(초, 방식마다)
+CALIBRATE_SECONDS = 0.2
+
+# 알려진 평문 공격을 제안할 최소 암호문 크기 (12바이트 헤더 + 평문 12바이트)
+KNOWN_PLAINTEXT_MIN = 24
+
+
+def classify_entry(entry: ZipEntry) -> dict:
+    '''
+    엔트리 하나 -> {name, method, encryption, data_descriptor, csize, usize}
+    - AES 엔트리의 method는 헤더의 99가 아니라 AES 엑스트라에 적힌 실제 압축 방식
+    '''
+    comp = entry.aes_params[2] if entry.aes and entry.aes_params else entry.comp
+    if not entry.encrypted:
+        encryption = 'none'
+    elif entry.zipcrypto:
+        encryption = 'zipcrypto'
+    elif entry.aes and entry.aes_params:
+        encryption = AES_NAMES.get(entry.aes_params[1], 'aes-?')
+    else:
+        encryption = 'unknown'
+    return {
+        'name': entry.name,
+        'method': METHOD_NAMES.get(comp, str(comp)),
+        'encryption': encryption,
+        'data_descriptor': bool(entry.flag & 0x0008),
+        'csize': entry.csize,
+        'usize': entry.usize,
+    }
+
+
+def read_entries(path: str) -> list[ZipEntry]:
+    '''
+    ZipReader(mmap)로 중앙 디렉터리와 로컬 헤더만 읽어 ZipEntry 목록 생성
+    - 페이지 캐시에서 필요한 부분만 읽으므로 큰 zip도 헤더 크기만큼만 I/O
+    '''
+    with ZipReader(path) as reader:
+        return reader.entries
+
+
+def _rate(check, seconds: float) -> float:
+    count = 0
+    t0 = time.perf_counter()
+    while True:
+        for _ in range(16):
+            check(b'calibrate%d' % count)
+            count += 1
+        elapsed = time.perf_counter() - t0
+        if elapsed >= seconds:
+            return count / elapsed
+
+
+def calibrate(seconds: float = CALIBRATE_SECONDS) -> dict[str, float]:
+    '''
+    이 호스트의 코어 하나 기준 방식별 검증 속도(개/초)
+    - ZipCrypto: 키 초기화 + 12바이트 헤더 복호화 (ZipTarget.check와 같은 작업)
+    - AES: PBKDF2 키 유도 (AesZipVerifier.check와 같은 작업)
+    '''
+    enc12 = bytes(12)
+    rates = {'zipcrypto': _rate(lambda pwd: _decrypt_stream(enc12, _init_keys(pwd)), seconds)}
+    for strength, name in AES_NAMES.items():
+        rates[name] = _rate(lambda pwd: derive_verifier(pwd, bytes(16), strength), seconds)
+    return rates
+
+
+def triage(path: str, keyspace: int, rates: dict[str, float], workers: int) -> dict:
+    '''
+    zip 하나 -> 작업 레코드
+    - attack: none(암호 없음) / bruteforce / known-plaintext(ZipCrypto + STORE 엔트리, 평문을 알면 키 복구 가능)
+      / unsupported(판별 불가 암호 방식)
+    - seconds: keyspace 전체를 workers개 코어로 검증하는 예상 시간
+    '''
+    record = {'path': path}
+    try:
+        entries = read_entries(path)
+    except (ValueError, struct.error, OSError) as e:
+        record.update({'attack': 'error', 'error': str(e), 'seconds': None})
+        return record
+
+    classified = [classify_entry(entry) for entry in entries]
+    schemes = {c['encryption'] for c in classified} - {'none'}
+    record['entries'] = classified
+    record['encryption'] = sorted(schemes)
+    if not schemes:
+        record.update({'attack': 'none', 'seconds': 0.0})
+        return record
+
+    # 비밀번호 하나가 모든 엔트리에 쓰였다고 보고, 가장 빨리 검증되는 방식으로 탐색
+    known = [r for s, r in rates.items() if s in schemes]
+    if not known:
+        record.update({'attack': 'unsupported', 'seconds': None})
+        return record
+    rate = max(known) * workers
+    record['tries_per_sec'] = round(rate, 1)
+    record['seconds'] = round(keyspace / rate, 3)
+    stored = any(e.zipcrypto and e.comp == 0 and e.csize >= KNOWN_PLAINTEXT_MIN for e in entries)
+    record['attack'] = 'known-plaintext' if stored else 'bruteforce'
+    return record
+
+
+def iter_zips(root: str):
+    '''
+    root 아래 .zip 파일 경로 (root가 파일이면 그 파일 하나)
+    '''
+    if os.path.isfile(root):
+        yield root
+        return
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith('.zip'):
+                yield os.path.join(dirpath, name)
+
+
+def _priority(record: dict) -> tuple[int, float]:
+    # 예상 시간이 없는 작업(오류, 판별 불가)은 맨 뒤
+    seconds = record['seconds']
+    return (1, 0.0) if seconds is None else (0, seconds)
+
+
+def prioritize(records, window: int = DEFAULT_WINDOW):
+    '''
+    예상 시간 순으로 레코드를 내보내는 제너레이터
+    - window개까지 힙에 모았다가, 넘치면 가장 싼 것부터 하나씩 내보낸다. (창 안에서만 정확한 순서)
+    - window=0이면 전부 모은 뒤 정렬
+    '''
+    heap = []
+    counter = itertools.count()
+    for record in records:
+        heapq.heappush(heap, (_priority(record), next(counter), record))
+        if window and len(heap) > window:
+            yield heapq.heappop(heap)[2]
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+def scan(roots: list[str], source: dict, workers: int, window: int = DEFAULT_WINDOW, rates: dict | None = None):
+    '''
+    여러 경로를 스캔해서 작업 레코드를 우선순위 순으로 반환하는 제너레이터
+    '''
+    keyspace = len(make_generator(**source))
+    rates = rates or calibrate()
+    records = (triage(path, keyspace, rates, workers) for root in roots for path in iter_zips(root))
+    return prioritize(records, window)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='ZIP 암호 방식 분류 + 크랙 비용 추정')
+    parser.add_argument('paths', nargs='+', help='zip 파일 또는 디렉터리')
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW, help='정렬 창 크기 (0: 전체 정렬)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='예상 시간 계산에 쓸 코어 수')
+    parser.add_argument('--output', help='작업 목록 JSON Lines 파일 (기본: 표준 출력)')
+    door_hacking.add_source_arguments(parser)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    rates = calibrate()
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    count = 0
+    try:
+        for job in scan(args.paths, door_hacking.source_from_args(args), args.workers, args.window, rates):
+            out.write(json.dumps(job, ensure_ascii=False) + '\n')
+            count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    speeds = ', '.join(f'{name} {rate:.0f}/s' for name, rate in rates.items())
+    print(f'{count}개 zip 분류: {time.perf_counter() - t0:.2f}s (코어당 검증 속도: {speeds})', file=sys.stderr)